@@ -1,7 +1,8 @@
 from flask import Flask
-from flask_cors import CORS
 
-from . import database
+from . import compression, cors, database, instrumentation, response_cache
+from .config import Config
+from .json_provider import OrjsonProvider
 
 def create_app(config_object=None):
     app = Flask(__name__)
@@ -13,27 +14,34 @@ def create_app(config_object=None):
     if config_object:
         app.config.from_object(config_object)
 
-    # Configure CORS based on environment settings
-    if app.config.get('CORS_ENABLED', False):
-        cors_resources = {
-            r"/api/*": {
-                "origins": app.config.get('CORS_ORIGINS', []),
-                "supports_credentials": app.config.get('CORS_SUPPORTS_CREDENTIALS', True),
-                "allow_headers": app.config.get('CORS_ALLOW_HEADERS', ["Content-Type", "Authorization", "X-Requested-With"]),
-                "methods": app.config.get('CORS_METHODS', ["GET", "POST", "PUT", "DELETE", "OPTIONS"]),
-                "expose_headers": app.config.get('CORS_EXPOSE_HEADERS', ["Content-Type", "Authorization"]),
-                "max_age": app.config.get('CORS_MAX_AGE', 86400)
-            }
-        }
-        CORS(app, resources=cors_resources)
+    # orjson-backed JSON with ISO dates and configurable Decimal output
+    app.json = OrjsonProvider(app)
+
+    # Configure CORS based on environment settings; preflights are answered
+    # before any view or database access
+    cors.init_app(app)
+
+    # Set up application logging from the loaded config
+    Config.init_logging(app.config)
 
     # Initialize database 
     database.init_app(app)
     
+    # Initialize the summary/categories response cache
+    response_cache.init_app(app)
+    
+    # Per-request SQL timings and the Server-Timing header
+    instrumentation.init_app(app)
+    
+    # gzip/br for buffered JSON responses
+    compression.init_app(app)
+    
     # Register blueprints
-    from .routes import auth, households, transactions
+    from .routes import auth, dashboard, households, jobs, transactions
     app.register_blueprint(auth.bp)
     app.register_blueprint(households.bp)
     app.register_blueprint(transactions.bp)
+    app.register_blueprint(dashboard.bp)
+    app.register_blueprint(jobs.bp)
     
     return app
\ No newline at end of file
@@ -0,0 +1,177 @@
+# myapp/analytics.py
+import numpy as np
+
+from back_end.archive import transactions_source
+from back_end.database import get_db_stream_cursor
+
+# Owner-scoped (day, cents, category) rows from a transactions_source().
+# Days count from the Unix epoch and amounts are whole cents, so both
+# columns load straight into integer arrays.
+ANALYTICS_QUERY = """
+    SELECT DATEDIFF(t.date, '1970-01-01') as day,
+           CAST(ROUND(t.amount * 100) AS SIGNED) as cents,
+           COALESCE(t.category, '') as category
+    FROM {source}
+"""
+
+ANALYTICS_COLUMNS = "t.date, t.amount, t.category"
+
+
+class TransactionColumns:
+    """Transactions as parallel arrays: epoch day, amount in cents, category code."""
+
+    def __init__(self, days, cents, category_codes, categories):
+        self.days = days
+        self.cents = cents
+        self.category_codes = category_codes
+        self.categories = categories  # code -> name
+
+    def __len__(self):
+        return len(self.days)
+
+    @classmethod
+    def from_rows(cls, batches):
+        """Build the arrays from batches of (day, cents, category) tuples."""
+        days, cents, codes = [], [], []
+        category_codes = {}
+        for rows in batches:
+            if not rows:
+                continue
+            day_column, cents_column, category_column = zip(*rows)
+            days.append(np.fromiter(day_column, dtype=np.int32, count=len(rows)))
+            cents.append(np.fromiter(cents_column, dtype=np.int64, count=len(rows)))
+            codes.append(np.fromiter(
+                (category_codes.setdefault(name, len(category_codes)) for name in category_column),
+                dtype=np.int32, count=len(rows),
+            ))
+
+        if not days:
+            empty = np.empty(0, dtype=np.int32)
+            return cls(empty, np.empty(0, dtype=np.int64), empty, [])
+        return cls(np.concatenate(days), np.concatenate(cents), np.concatenate(codes),
+                   list(category_codes))
+
+
+def load_columns(conditions, params, start_date=None, batch_size=10000):
+    """Stream the rows matching ``conditions`` into TransactionColumns."""
+    source, params = transactions_source(conditions, params, start_date, columns=ANALYTICS_COLUMNS)
+    query = ANALYTICS_QUERY.format(source=source)
+
+    def batches(cursor):
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+
+    with get_db_stream_cursor(tuples=True) as cursor:
+        cursor.execute(query, params)
+        return TransactionColumns.from_rows(batches(cursor))
+
+
+def _grouped_quantiles(sorted_values, starts, counts, q):
+    """Linear-interpolated quantile ``q`` of each contiguous, sorted group."""
+    position = starts + q * (counts - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.ceil(position).astype(np.int64)
+    fraction = position - lower
+    return sorted_values[lower] * (1 - fraction) + sorted_values[upper] * fraction
+
+
+def _money(cents):
+    """Cents (possibly NaN) to a rounded currency amount or None."""
+    return None if np.isnan(cents) else round(float(cents) / 100, 2)
+
+
+def _ratio(value):
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+def compute_statistics(columns, window=3):
+    """Monthly and per-category spending statistics, vectorized over all rows.
+
+    Every calendar month between the first and last transaction is listed,
+    with total, count, median, p90, a trailing ``window``-month average of
+    totals and the month-over-month change. Categories get their total and
+    share of the grand total.
+    """
+    if not len(columns):
+        return {"months": [], "categories": [], "overall": {"count": 0, "total": 0.0,
+                                                            "median": None, "p90": None}}
+
+    cents = columns.cents
+    months = (columns.days.astype('datetime64[D]').astype('datetime64[M]')).astype(np.int64)
+
+    present, inverse, counts = np.unique(months, return_inverse=True, return_counts=True)
+    totals = np.bincount(inverse, weights=cents)
+
+    # Sort by month then amount so each month is a contiguous sorted run
+    order = np.lexsort((cents, inverse))
+    sorted_cents = cents[order].astype(np.float64)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    medians = _grouped_quantiles(sorted_cents, starts, counts, 0.5)
+    p90s = _grouped_quantiles(sorted_cents, starts, counts, 0.9)
+
+    # Spread over every calendar month so gaps count as zero spend
+    first = present[0]
+    span = int(present[-1] - first) + 1
+    slots = present - first
+    month_totals = np.zeros(span)
+    month_counts = np.zeros(span, dtype=np.int64)
+    month_medians = np.full(span, np.nan)
+    month_p90s = np.full(span, np.nan)
+    month_totals[slots] = totals
+    month_counts[slots] = counts
+    month_medians[slots] = medians
+    month_p90s[slots] = p90s
+
+    running = np.concatenate(([0.0], np.cumsum(month_totals)))
+    index = np.arange(span)
+    window_start = np.maximum(index + 1 - window, 0)
+    rolling = (running[index + 1] - running[window_start]) / (index + 1 - window_start)
+
+    previous = np.concatenate(([np.nan], month_totals[:-1]))
+    deltas = month_totals - previous
+    with np.errstate(divide='ignore', invalid='ignore'):
+        changes = np.where(previous != 0, deltas / np.abs(previous), np.nan)
+
+    labels = np.arange(first, first + span).astype('datetime64[M]').astype(str).tolist()
+    month_rows = [
+        {
+            "month": labels[i],
+            "total": _money(month_totals[i]),
+            "count": int(month_counts[i]),
+            "median": _money(month_medians[i]),
+            "p90": _money(month_p90s[i]),
+            "rolling_avg": _money(rolling[i]),
+            "mom_delta": _money(deltas[i]),
+            "mom_change": _ratio(changes[i]),
+        }
+        for i in range(span)
+    ]
+
+    grand_total = float(cents.sum())
+    category_totals = np.bincount(columns.category_codes, weights=cents,
+                                  minlength=len(columns.categories))
+    category_counts = np.bincount(columns.category_codes, minlength=len(columns.categories))
+    category_rows = [
+        {
+            "category": columns.categories[code] or None,
+            "total": _money(category_totals[code]),
+            "count": int(category_counts[code]),
+            "share": round(float(category_totals[code]) / grand_total, 4) if grand_total else None,
+        }
+        for code in np.argsort(-category_totals, kind='stable')
+    ]
+
+    overall = np.percentile(cents, [50, 90])
+    return {
+        "months": month_rows,
+        "categories": category_rows,
+        "overall": {
+            "count": int(len(cents)),
+            "total": _money(grand_total),
+            "median": _money(overall[0]),
+            "p90": _money(overall[1]),
+        },
+    }
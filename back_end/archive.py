@@ -0,0 +1,254 @@
+# myapp/archive.py
+import time
+from datetime import date, timedelta
+
+from flask import current_app
+
+from back_end.cache import get_named_cache
+from back_end.database import get_db_cursor
+
+# Columns shared by transactions and transactions_archive
+ARCHIVE_COLUMNS = "id, user_id, amount, date, description, category, household_id, created_at"
+
+# Every transaction, hot or archived, for batch jobs that scan everything
+ALL_TRANSACTIONS_SQL = f"""(
+    SELECT {ARCHIVE_COLUMNS} FROM transactions
+    UNION ALL
+    SELECT {ARCHIVE_COLUMNS} FROM transactions_archive
+)"""
+
+PARTITIONS_QUERY = """
+    SELECT PARTITION_NAME as name, PARTITION_DESCRIPTION as description
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'transactions_archive'
+    ORDER BY PARTITION_ORDINAL_POSITION
+"""
+
+
+def archive_cutoff(config=None):
+    """Transactions dated before this day may have been archived."""
+    config = config or current_app.config
+    return date.today() - timedelta(days=config['ARCHIVE_AFTER_DAYS'])
+
+
+def get_archive_mark_cache(config):
+    """Process-wide cache of the archive high-water mark."""
+    return get_named_cache('archive_mark', 1, ttl=config['ARCHIVE_MARK_CACHE_TTL'])
+
+
+def load_archive_mark():
+    """Read the day every archived transaction is dated before, or None if none are."""
+    with get_db_cursor() as cursor:
+        cursor.execute("SELECT archived_before FROM archive_state WHERE id = 1")
+        row = cursor.fetchone()
+    return row['archived_before'] if row else None
+
+
+def get_archive_mark():
+    """The archive high-water mark, cached for up to ARCHIVE_MARK_CACHE_TTL seconds.
+
+    archive_transactions() raises the mark and waits out the TTL before it
+    moves any rows, so a cached mark is never behind the archive's contents.
+    """
+    cache = get_archive_mark_cache(current_app.config)
+    entry = cache.get('mark')
+    if entry is None:
+        entry = (load_archive_mark(),)
+        cache.set('mark', entry)
+    return entry[0]
+
+
+def may_touch_archive(start_date):
+    """Whether a query from ``start_date`` (ISO string or None) can match archived rows.
+
+    Decided from what was actually archived, not from ARCHIVE_AFTER_DAYS,
+    which may have been raised since older rows were moved.
+    """
+    mark = get_archive_mark()
+    if mark is None:
+        return False
+    if not start_date:
+        return True
+    try:
+        return date.fromisoformat(start_date) < mark
+    except ValueError:
+        return True
+
+
+def raise_archive_mark(cutoff):
+    """Move the high-water mark up to ``cutoff``; returns whether it changed."""
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute("SELECT archived_before FROM archive_state WHERE id = 1 FOR UPDATE")
+        row = cursor.fetchone()
+        if row and row['archived_before'] is not None and row['archived_before'] >= cutoff:
+            return False
+        cursor.execute(
+            "INSERT INTO archive_state (id, archived_before) VALUES (1, %s) "
+            "ON DUPLICATE KEY UPDATE archived_before = VALUES(archived_before)",
+            (cutoff,)
+        )
+
+    get_archive_mark_cache(current_app.config).pop('mark')
+    return True
+
+
+def transactions_source(conditions, params, start_date=None, columns=None,
+                        order_by=None, limit=None):
+    """Derived table ``t`` of transactions matching ``conditions``, archive included.
+
+    ``conditions`` use the ``t.`` alias and are applied inside the source,
+    so callers only add joins, grouping, ordering and limits. When
+    ``start_date`` is past the archive's high-water mark it is skipped and
+    MySQL merges the derived table away, leaving the plain hot-table
+    query. Otherwise each table is filtered on its own indexes (and the
+    archive pruned to the matching partitions) before the rows are merged;
+    with ``order_by`` and ``limit`` each side is also sorted and cut first.
+
+    Returns (sql, params).
+    """
+    columns = columns or ", ".join(f"t.{c}" for c in ARCHIVE_COLUMNS.split(", "))
+    where = " AND ".join(conditions)
+    hot = f"SELECT {columns} FROM transactions t WHERE {where}"
+
+    if not may_touch_archive(start_date):
+        return f"({hot}) t", list(params)
+
+    cold = f"SELECT {columns} FROM transactions_archive t WHERE {where}"
+    branch_params = list(params)
+    if order_by and limit is not None:
+        hot += f" ORDER BY {order_by} LIMIT %s"
+        cold += f" ORDER BY {order_by} LIMIT %s"
+        branch_params.append(limit)
+    return f"(({hot}) UNION ALL ({cold})) t", branch_params * 2
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def get_partition_bounds():
+    """Return the upper bounds of the archive's monthly partitions, in order."""
+    with get_db_cursor() as cursor:
+        cursor.execute(PARTITIONS_QUERY)
+        rows = cursor.fetchall()
+    return [
+        date.fromisoformat(row['description'].strip("'"))
+        for row in rows
+        if row['description'] != 'MAXVALUE'
+    ]
+
+
+def plan_partitions(bounds, oldest, through):
+    """New monthly upper bounds so every month up to ``through`` has its own partition.
+
+    The first new partition starts at the last existing bound, or at the
+    ``oldest`` transaction's month when that is later, so an empty table
+    does not get years of empty partitions.
+    """
+    starts = [day for day in (bounds[-1] if bounds else None,
+                              month_start(oldest) if oldest else None) if day]
+    bound = next_month(max(starts) if starts else month_start(through))
+
+    planned = []
+    while bound <= next_month(month_start(through)):
+        planned.append(bound)
+        bound = next_month(bound)
+    return planned
+
+
+def partition_name(bound):
+    """Name a partition after the month it ends with, e.g. p2024_01."""
+    last_month = bound - timedelta(days=1)
+    return f"p{last_month.year}_{last_month.month:02d}"
+
+
+def ensure_partitions(months_ahead=None):
+    """Split monthly partitions off p_future up to ``months_ahead`` past the cutoff.
+
+    p_future is empty when partitions are kept ahead of the archive job, so
+    the reorganize only rewrites metadata. Returns the new partition names.
+    """
+    if months_ahead is None:
+        months_ahead = current_app.config['ARCHIVE_PARTITIONS_AHEAD']
+
+    through = archive_cutoff()
+    for _ in range(months_ahead):
+        through = next_month(through)
+
+    bounds = get_partition_bounds()
+    oldest = None
+    if not bounds:
+        # Only the first split needs to know where the history starts
+        with get_db_cursor() as cursor:
+            cursor.execute(f"SELECT MIN(date) as oldest FROM {ALL_TRANSACTIONS_SQL} t")
+            oldest = cursor.fetchone()['oldest']
+
+    planned = plan_partitions(bounds, oldest, through)
+    if not planned:
+        return []
+
+    definitions = [
+        f"PARTITION {partition_name(bound)} VALUES LESS THAN ('{bound.isoformat()}')"
+        for bound in planned
+    ]
+    definitions.append("PARTITION p_future VALUES LESS THAN (MAXVALUE)")
+
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(
+            "ALTER TABLE transactions_archive REORGANIZE PARTITION p_future INTO ("
+            + ", ".join(definitions) + ")"
+        )
+    return [partition_name(bound) for bound in planned]
+
+
+def archive_transactions(cutoff=None, batch_size=None, echo=None):
+    """Move transactions dated before ``cutoff`` into transactions_archive.
+
+    Each batch is copied and deleted in one DB transaction, so a row is in
+    exactly one table at any moment and UNION ALL readers never miss or
+    double-count it. Rollups are untouched: they already cover archived
+    rows. Returns the number of rows moved.
+    """
+    cutoff = cutoff or archive_cutoff()
+    batch_size = batch_size or current_app.config['ARCHIVE_BATCH_SIZE']
+
+    # Readers must include the archive for the new range before any row
+    # lands there; give every process time to drop its cached mark
+    if raise_archive_mark(cutoff):
+        wait = current_app.config['ARCHIVE_MARK_CACHE_TTL']
+        if echo:
+            echo(f"Raised the archive mark to {cutoff}; waiting {wait}s for readers...")
+        time.sleep(wait)
+
+    moved = 0
+    last_id = 0
+    while True:
+        with get_db_cursor(commit=True) as cursor:
+            # Walk the primary key so each batch resumes where the last stopped
+            cursor.execute(
+                "SELECT id FROM transactions WHERE id > %s AND date < %s "
+                "ORDER BY id LIMIT %s FOR UPDATE",
+                (last_id, cutoff, batch_size)
+            )
+            ids = [row['id'] for row in cursor.fetchall()]
+            if not ids:
+                break
+
+            placeholders = ", ".join(["%s"] * len(ids))
+            cursor.execute(
+                f"INSERT INTO transactions_archive ({ARCHIVE_COLUMNS}) "
+                f"SELECT {ARCHIVE_COLUMNS} FROM transactions WHERE id IN ({placeholders})",
+                ids
+            )
+            cursor.execute(f"DELETE FROM transactions WHERE id IN ({placeholders})", ids)
+
+        moved += len(ids)
+        last_id = ids[-1]
+        if echo:
+            echo(f"Archived {moved} transaction(s)...")
+
+    return moved
@@ -1,29 +1,50 @@
 # myapp/auth.py
-import json
+import hashlib
+import logging
+import time
 from functools import wraps
-from urllib.request import urlopen
 from flask import request, current_app, g, jsonify
 import jwt  # Using PyJWT for Auth0 token validation
-import base64
-import struct
+from back_end.cache import get_named_cache
+from back_end.instrumentation import record_timing
+from back_end.jwks import get_jwks_cache
+
+logger = logging.getLogger(__name__)
+
+def get_token_cache(config):
+    """Get the process-wide verified-token cache, or None if disabled.
+    
+    Entries are keyed by the SHA-256 of the raw token.
+    """
+    size = config.get('TOKEN_CACHE_SIZE', 0)
+    if size <= 0:
+        return None
+    return get_named_cache('verified_tokens', size)
+
+def get_user_id_cache(config):
+    """Get the process-wide auth0_id -> users.id cache, or None if disabled."""
+    size = config.get('USER_ID_CACHE_SIZE', 0)
+    if size <= 0:
+        return None
+    return get_named_cache('user_ids', size)
 
 def get_token_auth_header():
     """Obtains the access token from the Authorization Header."""
     auth = request.headers.get("Authorization", None)
     if not auth:
-        print("Authorization header is missing")
+        logger.debug("Authorization header is missing")
         return jsonify({"error": "Authorization header is missing"}), 401
     
     parts = auth.split()
     
     if parts[0].lower() != "bearer":
-        print("Authorization header must start with Bearer")
+        logger.debug("Authorization header must start with Bearer")
         return jsonify({"error": "Authorization header must start with Bearer"}), 401
     elif len(parts) == 1:
-        print("Token not found")
+        logger.debug("Token not found")
         return jsonify({"error": "Token not found"}), 401
     elif len(parts) > 2:
-        print("Authorization header must be Bearer token")
+        logger.debug("Authorization header must be Bearer token")
         return jsonify({"error": "Authorization header must be Bearer token"}), 401
     
     token = parts[1]
@@ -33,69 +54,38 @@ def requires_auth(f):
     """Decorator to validate JWT tokens from Auth0"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        # Always allow OPTIONS requests to pass through without authentication
-        # This is necessary for CORS preflight requests
-        if request.method == 'OPTIONS':
-            return f(*args, **kwargs)
-        
-        # For all other requests, validate the token
+        # CORS preflights never get here: cors.init_app answers them first
+        auth_started = time.perf_counter()
         token = get_token_auth_header()
         if isinstance(token, tuple):  # Error response
             return token
         
+        # Tokens already verified by this process skip the RSA check until
+        # their own exp
+        token_cache = get_token_cache(current_app.config)
+        token_key = hashlib.sha256(token.encode('utf-8')).digest()
+        if token_cache is not None:
+            payload = token_cache.get(token_key)
+            if payload is not None:
+                return _call_authenticated(f, payload, args, kwargs, auth_started)
+        
         try:
-            # Print token for debugging
-            print("Token received:", token[:20] + "..." if len(token) > 20 else token)
-            
             # Get Auth0 domain and audience from app config
             domain = current_app.config["AUTH0_DOMAIN"]
             audience = current_app.config["AUTH0_API_AUDIENCE"]
             algorithms = current_app.config["AUTH0_ALGORITHMS"]
             
-            print(f"Validating token with domain: {domain}, audience: {audience}")
+            logger.debug("Validating token", extra={"domain": domain, "audience": audience})
             
-            # Get the JWKS from Auth0
-            jwks_url = f'https://{domain}/.well-known/jwks.json'
-            print(f"Fetching JWKS from: {jwks_url}")
-            jwks_client = urlopen(jwks_url)
-            jwks = json.loads(jwks_client.read())
-            
-            # Parse the JWT
+            # Look up the signing key in the process-wide JWKS cache
             unverified_header = jwt.get_unverified_header(token)
-            print(f"JWT header: {unverified_header}")
+            logger.debug("JWT header", extra={"kid": unverified_header.get("kid"), "alg": unverified_header.get("alg")})
             
-            # Find the right key from JWKS
-            rsa_key = None
-            for key in jwks["keys"]:
-                if key["kid"] == unverified_header["kid"]:
-                    print(f"Found matching key: {key['kid']}")
-                    
-                    # Convert JWK to PEM format
-                    modulus = base64.urlsafe_b64decode(key['n'] + '==')
-                    exponent = base64.urlsafe_b64decode(key['e'] + '==')
-                    
-                    modulus_int = int.from_bytes(modulus, byteorder='big')
-                    exponent_int = int.from_bytes(exponent, byteorder='big')
-                    
-                    # Create PEM formatted public key
-                    from cryptography.hazmat.backends import default_backend
-                    from cryptography.hazmat.primitives.asymmetric import rsa
-                    from cryptography.hazmat.primitives import serialization
-                    
-                    public_numbers = rsa.RSAPublicNumbers(exponent_int, modulus_int)
-                    public_key = public_numbers.public_key(default_backend())
-                    pem = public_key.public_bytes(
-                        encoding=serialization.Encoding.PEM,
-                        format=serialization.PublicFormat.SubjectPublicKeyInfo
-                    )
-                    
-                    rsa_key = pem
-                    break
+            rsa_key = get_jwks_cache(current_app.config).get_key(unverified_header.get("kid"))
             
             if rsa_key:
                 try:
                     # Verify the token
-                    print("Attempting to decode JWT")
                     payload = jwt.decode(
                         token,
                         rsa_key,
@@ -116,42 +106,62 @@ def requires_auth(f):
                         }
                     )
                     
-                    print(f"JWT verified successfully. User: {payload['sub']}")
-                    
-                    # Store user info in flask.g
-                    g.user_id = payload["sub"]
-                    g.token_payload = payload
+                    logger.debug("JWT verified", extra={"sub": payload['sub']})
                     
-                    return f(*args, **kwargs)
+                    if token_cache is not None and 'exp' in payload:
+                        token_cache.set(token_key, payload, expires_at=payload['exp'])
                     
                 except jwt.ExpiredSignatureError:
-                    print("JWT validation failed: Token expired")
+                    logger.debug("JWT validation failed: Token expired")
                     return jsonify({"error": "Token expired"}), 401
                 except jwt.InvalidAudienceError:
-                    print(f"JWT validation failed: Invalid audience. Expected: {audience}")
+                    logger.debug("JWT validation failed: Invalid audience", extra={"expected": audience})
                     return jsonify({"error": "Invalid audience"}), 401
                 except jwt.InvalidIssuerError:
-                    print(f"JWT validation failed: Invalid issuer. Expected: https://{domain}/")
+                    logger.debug("JWT validation failed: Invalid issuer", extra={"expected": f"https://{domain}/"})
                     return jsonify({"error": "Invalid issuer"}), 401
                 except Exception as e:
-                    print(f"JWT validation failed: {str(e)}")
+                    logger.debug("JWT validation failed: %s", e)
                     return jsonify({"error": str(e)}), 401
-            
-            print("JWT validation failed: No matching key found in JWKS")
-            return jsonify({"error": "Unable to find appropriate key"}), 401
+            else:
+                logger.debug("JWT validation failed: No matching key found in JWKS")
+                return jsonify({"error": "Unable to find appropriate key"}), 401
             
         except Exception as e:
-            print(f"JWT validation general error: {str(e)}")
+            logger.debug("JWT validation general error: %s", e)
             return jsonify({"error": str(e)}), 401
+        
+        return _call_authenticated(f, payload, args, kwargs, auth_started)
             
     return decorated
 
+def _call_authenticated(f, payload, args, kwargs, auth_started):
+    """Store user info in flask.g and run the view."""
+    g.user_id = payload["sub"]
+    g.token_payload = payload
+    
+    # Internal users.id, or None if the user has not registered yet
+    g.internal_user_id = get_user_id_from_auth0_id()
+    
+    record_timing('auth', time.perf_counter() - auth_started)
+    return f(*args, **kwargs)
+
 def get_user_id_from_auth0_id():
-    """Get the internal user ID from Auth0 ID."""
+    """Get the internal user ID from Auth0 ID.
+    
+    Resolved ids are cached per process since the mapping never changes once
+    a user exists; unregistered users are not cached so they can register.
+    """
     from back_end.database import get_db_cursor
     
     auth0_id = g.user_id
     
+    user_id_cache = get_user_id_cache(current_app.config)
+    if user_id_cache is not None:
+        user_id = user_id_cache.get(auth0_id)
+        if user_id is not None:
+            return user_id
+    
     with get_db_cursor() as cursor:
         cursor.execute(
             "SELECT id FROM users WHERE auth0_id = %s",
@@ -160,6 +170,25 @@ def get_user_id_from_auth0_id():
         result = cursor.fetchone()
         
         if result:
+            if user_id_cache is not None:
+                user_id_cache.set(auth0_id, result['id'])
             return result['id']
         
-        return None
\ No newline at end of file
+        return None
+
+def cache_user_id(auth0_id, user_id):
+    """Record a newly registered user's internal ID."""
+    user_id_cache = get_user_id_cache(current_app.config)
+    if user_id_cache is not None:
+        user_id_cache.set(auth0_id, user_id)
+
+def invalidate_user_id(auth0_id=None):
+    """Forget the cached internal ID for one Auth0 user, or for all of them."""
+    user_id_cache = get_user_id_cache(current_app.config)
+    if user_id_cache is None:
+        return
+    
+    if auth0_id is None:
+        user_id_cache.clear()
+    else:
+        user_id_cache.pop(auth0_id)
@@ -0,0 +1,97 @@
+# myapp/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe bounded LRU cache with optional per-entry expiry.
+
+    ``ttl`` is a default lifetime in seconds; ``set`` can override it with an
+    absolute ``expires_at`` (a ``time.time()`` timestamp). Expired entries are
+    dropped lazily on lookup.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` or ``default``."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, expires_at=None):
+        """Store ``value`` under ``key``, evicting the oldest entry if full."""
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.time() + self.ttl
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove ``key`` and return its value."""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Hit/miss counters and current size."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
+
+
+# Process-wide caches shared by the auth and authorization layers
+_named_caches = {}
+_named_caches_lock = threading.Lock()
+
+
+def get_named_cache(name, maxsize, ttl=None):
+    """Get (or create) the process-wide LRUCache called ``name``."""
+    cache = _named_caches.get(name)
+    if cache is None:
+        with _named_caches_lock:
+            cache = _named_caches.get(name)
+            if cache is None:
+                cache = LRUCache(maxsize=maxsize, ttl=ttl)
+                _named_caches[name] = cache
+    return cache
+
+
+def reset_named_caches():
+    """Forget every named cache, e.g. after forking a worker."""
+    with _named_caches_lock:
+        _named_caches.clear()
@@ -0,0 +1,40 @@
+# myapp/columnar.py
+from flask import request
+
+RESPONSE_FORMATS = ('json', 'columnar')
+
+# Columns of every summary row
+SUMMARY_COLUMNS = [
+    'period', 'total_amount', 'transaction_count',
+    'min_amount', 'max_amount', 'avg_amount',
+]
+
+
+def get_response_format():
+    """The ``format`` query arg: 'json' (rows as objects) or 'columnar'.
+
+    Raises ValueError for anything else.
+    """
+    response_format = request.args.get('format', 'json')
+    if response_format not in RESPONSE_FORMATS:
+        raise ValueError(f"Invalid format. Use: {', '.join(RESPONSE_FORMATS)}")
+    return response_format
+
+
+def to_columnar(rows, columns):
+    """Turn a list of row dicts into column names plus one value array per column.
+
+    ``{"columns": ["id", "amount"], "values": [[1, 2], ["9.99", "5.00"]]}``
+    holds the same data as ``[{"id": 1, "amount": "9.99"}, {"id": 2, "amount": "5.00"}]``.
+    """
+    return {
+        "columns": list(columns),
+        "values": [[row[column] for row in rows] for column in columns],
+    }
+
+
+def format_rows(rows, columns, response_format):
+    """Return ``rows`` unchanged, or columnar when ``response_format`` asks for it."""
+    if response_format == 'columnar':
+        return to_columnar(rows, columns)
+    return rows
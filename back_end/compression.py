@@ -0,0 +1,69 @@
+# myapp/compression.py
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+def choose_encoding(accept_encodings):
+    """Pick 'br' or 'gzip' from an Accept-Encoding header, preferring br on ties."""
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best = None
+    best_quality = 0
+    for encoding in candidates:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding, config):
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESSION_BROTLI_QUALITY'])
+    return gzip.compress(data, compresslevel=config['COMPRESSION_LEVEL'], mtime=0)
+
+
+def init_app(app):
+    """Compress buffered responses with br or gzip as the client accepts.
+
+    Streamed responses (which compress themselves where useful, like the
+    export) and responses that already have a Content-Encoding are left
+    alone, as are bodies under COMPRESSION_MIN_SIZE.
+    """
+    if not app.config.get('COMPRESSION_ENABLED', False):
+        return
+
+    config = app.config
+    mimetypes = set(config['COMPRESSION_MIMETYPES'])
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in mimetypes):
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < config['COMPRESSION_MIN_SIZE']:
+            return response
+
+        response.set_data(compress(data, encoding, config))
+        response.headers['Content-Encoding'] = encoding
+
+        # The compressed body is a different representation of the same data
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+        return response
@@ -22,7 +22,7 @@ class Config:
     CORS_SUPPORTS_CREDENTIALS = os.getenv('CORS_SUPPORTS_CREDENTIALS', 'true').lower() == 'true'
     CORS_ALLOW_HEADERS = os.getenv('CORS_ALLOW_HEADERS', 'Content-Type,Authorization,X-Requested-With').split(',')
     CORS_METHODS = os.getenv('CORS_METHODS', 'GET,POST,PUT,DELETE,OPTIONS').split(',')
-    CORS_EXPOSE_HEADERS = os.getenv('CORS_EXPOSE_HEADERS', 'Content-Type,Authorization').split(',')
+    CORS_EXPOSE_HEADERS = os.getenv('CORS_EXPOSE_HEADERS', 'Content-Type,Authorization,X-Next-Cursor').split(',')
     CORS_MAX_AGE = int(os.getenv('CORS_MAX_AGE', 86400))  # 24 hours in seconds
     
     # Database settings
@@ -35,11 +35,86 @@ class Config:
     MYSQL_CONNECTION_TIMEOUT = int(os.getenv('MYSQL_TIMEOUT', 5))
     MYSQL_POOL_SIZE = int(os.getenv('MYSQL_POOL_SIZE', 5))
     MYSQL_POOL_RECYCLE = int(os.getenv('MYSQL_POOL_RECYCLE', 3600))
+    MYSQL_POOL_TIMEOUT = float(os.getenv('MYSQL_POOL_TIMEOUT', 5))  # Seconds to wait for a free connection
+    MYSQL_POOL_PING = os.getenv('MYSQL_POOL_PING', 'true').lower() == 'true'
+    
+    # Read replicas: 'host[:port],...' sharing the primary's credentials (empty = primary only)
+    MYSQL_REPLICA_HOSTS = os.getenv('MYSQL_REPLICA_HOSTS', '')
+    MYSQL_REPLICA_POOL_SIZE = int(os.getenv('MYSQL_REPLICA_POOL_SIZE', os.getenv('MYSQL_POOL_SIZE', 5)))  # Per replica
+    MYSQL_REPLICA_FAILURE_COOLDOWN = int(os.getenv('MYSQL_REPLICA_FAILURE_COOLDOWN', 30))  # Seconds a failed replica is skipped
+    READ_YOUR_WRITES_WINDOW = int(os.getenv('READ_YOUR_WRITES_WINDOW', 5))  # Seconds a writer's reads stay on the primary
+    READ_PRIMARY_COOKIE = os.getenv('READ_PRIMARY_COOKIE', 'db_read_primary')
+    
+    # Transaction listing
+    TRANSACTIONS_MAX_PAGE_SIZE = int(os.getenv('TRANSACTIONS_MAX_PAGE_SIZE', 500))
+    TRANSACTIONS_STREAM_BATCH_SIZE = int(os.getenv('TRANSACTIONS_STREAM_BATCH_SIZE', 1000))
+    DASHBOARD_RECENT_LIMIT = int(os.getenv('DASHBOARD_RECENT_LIMIT', 5))  # Default recent transactions on /api/dashboard
+    SEARCH_PAGE_SIZE = int(os.getenv('SEARCH_PAGE_SIZE', 50))  # Default page size for /api/transactions/search
+    SEARCH_MIN_WORD_LENGTH = int(os.getenv('SEARCH_MIN_WORD_LENGTH', 3))  # Match the server's innodb_ft_min_token_size
+    SYNC_SETTLE_WINDOW = int(os.getenv('SYNC_SETTLE_WINDOW', 5))  # Seconds; longer than any write transaction
+    
+    # JSON responses: Decimal amounts as 'string' ("12.50") or 'float' (12.5)
+    JSON_DECIMAL_MODE = os.getenv('JSON_DECIMAL_MODE', 'string')
+    
+    # Response compression (br needs the optional brotli package)
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))  # Bytes; smaller bodies are sent as-is
+    COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', 6))  # gzip 1-9
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))  # brotli 0-11
+    COMPRESSION_MIMETYPES = ['application/json', 'text/csv', 'text/plain', 'application/x-ndjson']
+    
+    # Bulk import
+    BULK_IMPORT_MAX_ROWS = int(os.getenv('BULK_IMPORT_MAX_ROWS', 20000))
+    BULK_INSERT_CHUNK_SIZE = int(os.getenv('BULK_INSERT_CHUNK_SIZE', 1000))
+    
+    # Serve /summary from transaction_daily_rollups (run `flask backfill-rollups` first)
+    SUMMARY_FROM_ROLLUPS = os.getenv('SUMMARY_FROM_ROLLUPS', 'true').lower() == 'true'
+    
+    # Cold history: `flask archive-transactions` moves older rows to transactions_archive
+    ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 730))
+    ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 5000))
+    ARCHIVE_PARTITIONS_AHEAD = int(os.getenv('ARCHIVE_PARTITIONS_AHEAD', 3))  # Months past the cutoff
+    ARCHIVE_MARK_CACHE_TTL = int(os.getenv('ARCHIVE_MARK_CACHE_TTL', 5))  # Seconds; archiving waits this long before moving rows
+    
+    # Background jobs: `flask run-workers` processes the jobs table
+    JOB_WORKER_PROCESSES = int(os.getenv('JOB_WORKER_PROCESSES', 2))
+    JOB_MAX_RUNNING_PER_USER = int(os.getenv('JOB_MAX_RUNNING_PER_USER', 1))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+    JOB_RETRY_BASE_DELAY = float(os.getenv('JOB_RETRY_BASE_DELAY', 10))  # Seconds; doubles per attempt
+    JOB_RETRY_MAX_DELAY = float(os.getenv('JOB_RETRY_MAX_DELAY', 600))
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', 600))  # Requeue running jobs without a heartbeat
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1))  # Seconds an idle worker sleeps
+    JOB_RESULTS_DIR = os.getenv('JOB_RESULTS_DIR', '/tmp/finance-app-jobs')  # Must be shared by the API and workers running exports
+    JOB_RETENTION_DAYS = int(os.getenv('JOB_RETENTION_DAYS', 7))  # Finished jobs and export files are deleted after this
+    
+    # Response cache for summary/categories: 'local', 'redis' or 'none'
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'local')
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 2048))
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 300))
+    RESPONSE_CACHE_REDIS_URL = os.getenv('RESPONSE_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    RESPONSE_CACHE_CONTROL = os.getenv('RESPONSE_CACHE_CONTROL', 'private, no-cache')
     
     # Auth0 settings
     AUTH0_DOMAIN = os.getenv('AUTH0_DOMAIN', '')
     AUTH0_API_AUDIENCE = os.getenv('AUTH0_API_AUDIENCE', '')
     AUTH0_ALGORITHMS = os.getenv('AUTH0_ALGORITHMS', 'RS256').split(',')
+    AUTH0_JWKS_URL = os.getenv('AUTH0_JWKS_URL', '')  # Defaults to https://AUTH0_DOMAIN/.well-known/jwks.json
+    
+    # JWKS key cache
+    JWKS_CACHE_TTL = int(os.getenv('JWKS_CACHE_TTL', 600))  # 10 minutes
+    JWKS_REFRESH_AHEAD = int(os.getenv('JWKS_REFRESH_AHEAD', 60))
+    JWKS_MIN_REFETCH_INTERVAL = int(os.getenv('JWKS_MIN_REFETCH_INTERVAL', 30))
+    JWKS_FETCH_TIMEOUT = int(os.getenv('JWKS_FETCH_TIMEOUT', 5))
+    
+    # Verified-token cache (0 disables it)
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+    
+    # auth0_id -> users.id cache (0 disables it)
+    USER_ID_CACHE_SIZE = int(os.getenv('USER_ID_CACHE_SIZE', 10000))
+    
+    # users.id -> household ids cache (0 disables it)
+    MEMBERSHIP_CACHE_SIZE = int(os.getenv('MEMBERSHIP_CACHE_SIZE', 10000))
+    MEMBERSHIP_CACHE_TTL = int(os.getenv('MEMBERSHIP_CACHE_TTL', 300))
     
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -47,11 +122,63 @@ class Config:
     LOG_FILE = os.getenv('LOG_FILE', 'app.log')
     LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))  # 10MB
     LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+    LOG_JSON = os.getenv('LOG_JSON', 'true').lower() == 'true'  # One JSON object per line
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))  # Records beyond this are dropped
+    LOG_DEBUG_SAMPLE_EVERY = int(os.getenv('LOG_DEBUG_SAMPLE_EVERY', 1))  # Keep 1 in N debug records per message
 
-    @classmethod
-    def init_logging(cls):
-        """Initialize logging configuration"""
+    # Production server (python run.py serve)
+    SERVER_BIND = os.getenv('SERVER_BIND', '0.0.0.0:5000')
+    SERVER_WORKERS = int(os.getenv('SERVER_WORKERS', (os.cpu_count() or 1) * 2 + 1))
+    SERVER_THREADS = int(os.getenv('SERVER_THREADS', 4))  # Keep MYSQL_POOL_SIZE >= this
+    SERVER_PRELOAD = os.getenv('SERVER_PRELOAD', 'true').lower() == 'true'  # Build the app once, before forking
+    SERVER_TIMEOUT = int(os.getenv('SERVER_TIMEOUT', 30))
+    SERVER_GRACEFUL_TIMEOUT = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30))  # Seconds workers get to finish on reload/stop
+    SERVER_KEEPALIVE = int(os.getenv('SERVER_KEEPALIVE', 5))
+    SERVER_MAX_REQUESTS = int(os.getenv('SERVER_MAX_REQUESTS', 0))  # Recycle workers after N requests (0 = never)
+    SERVER_PIDFILE = os.getenv('SERVER_PIDFILE', '')
+    SERVER_ACCESS_LOG = os.getenv('SERVER_ACCESS_LOG', '')  # '-' for stdout
+    
+    # Request instrumentation
+    SQL_INSTRUMENTATION = os.getenv('SQL_INSTRUMENTATION', 'false').lower() == 'true'
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
 
+    @classmethod
+    def init_logging(cls, config=None):
+        """Initialize logging configuration
+        
+        Records from every ``back_end.*`` logger go through a bounded queue
+        to a background thread that writes them to stderr and the rotating
+        LOG_FILE, so request threads never block on log I/O. Safe to call
+        more than once, e.g. again in each forked worker.
+        """
+        from back_end.log import JsonFormatter, start_queue_logging
+        
+        if config is None:
+            config = {key: getattr(cls, key) for key in dir(cls) if key.isupper()}
+        
+        if config['LOG_JSON']:
+            formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(config['LOG_FORMAT'])
+        
+        handlers = [logging.StreamHandler()]
+        if config['LOG_FILE']:
+            handlers.append(RotatingFileHandler(
+                config['LOG_FILE'],
+                maxBytes=config['LOG_MAX_BYTES'],
+                backupCount=config['LOG_BACKUP_COUNT'],
+            ))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        logger = logging.getLogger('back_end')
+        logger.setLevel(getattr(logging, str(config['LOG_LEVEL']).upper(), logging.INFO))
+        start_queue_logging(
+            logger,
+            handlers,
+            queue_size=config['LOG_QUEUE_SIZE'],
+            sample_every=config['LOG_DEBUG_SAMPLE_EVERY'],
+        )
         
     @classmethod
     def validate_config(cls):
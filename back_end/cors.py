@@ -0,0 +1,100 @@
+# myapp/cors.py
+import re
+
+from flask import request
+from flask_cors import CORS
+
+# Paths CORS applies to
+CORS_PATH_PREFIX = '/api/'
+
+# Characters that make a CORS_ORIGINS entry a regex rather than an origin
+REGEX_CHARS = frozenset('*\\?$^[]()')
+
+
+def compile_origins(origins):
+    """CORS_ORIGINS as ['*'] or a list of patterns matching whole origins.
+
+    Entries containing regex characters are used as regexes, the rest as
+    exact origins; both ignore case and must match the entire Origin header.
+    """
+    if '*' in origins:
+        return ['*']
+
+    patterns = []
+    for origin in origins:
+        if not origin:
+            continue
+        pattern = origin if REGEX_CHARS.intersection(origin) else re.escape(origin)
+        patterns.append(re.compile(rf'(?:{pattern})\Z', re.IGNORECASE))
+    return patterns
+
+
+def origin_allowed(origin, origins):
+    """Whether ``origin`` matches the compiled CORS_ORIGINS."""
+    return origins == ['*'] or any(pattern.match(origin) for pattern in origins)
+
+
+def cors_options(config):
+    """Flask-CORS options for /api/* from the CORS_* settings."""
+    return {
+        "origins": compile_origins(config.get('CORS_ORIGINS', [])),
+        "supports_credentials": config.get('CORS_SUPPORTS_CREDENTIALS', True),
+        "allow_headers": config.get('CORS_ALLOW_HEADERS', ["Content-Type", "Authorization", "X-Requested-With"]),
+        "methods": config.get('CORS_METHODS', ["GET", "POST", "PUT", "DELETE", "OPTIONS"]),
+        "expose_headers": config.get('CORS_EXPOSE_HEADERS', ["Content-Type", "Authorization", "X-Next-Cursor"]),
+        "max_age": config.get('CORS_MAX_AGE', 86400),
+    }
+
+
+def preflight_headers(options):
+    """The origin-independent preflight response headers, built once."""
+    headers = {
+        'Access-Control-Allow-Methods': ', '.join(options['methods']),
+        'Access-Control-Allow-Headers': ', '.join(options['allow_headers']),
+        'Access-Control-Max-Age': str(options['max_age']),
+        'Vary': 'Origin',
+    }
+    if options['supports_credentials']:
+        headers['Access-Control-Allow-Credentials'] = 'true'
+    return headers
+
+
+def is_preflight():
+    return (request.method == 'OPTIONS'
+            and 'Access-Control-Request-Method' in request.headers
+            and request.path.startswith(CORS_PATH_PREFIX))
+
+
+def init_app(app):
+    """Set up CORS for /api/*.
+
+    Flask-CORS adds the headers to actual requests. Preflights are answered
+    by the first before_request hook from headers computed here, so no
+    view, authentication or database access runs for them.
+    """
+    if not app.config.get('CORS_ENABLED', False):
+        return
+
+    options = cors_options(app.config)
+    CORS(app, resources={CORS_PATH_PREFIX + '*': options})
+
+    headers = preflight_headers(options)
+    # Flask-CORS gets the same compiled patterns, so preflights and actual
+    # requests always agree on which origins are allowed
+    origins = options['origins']
+
+    def answer_preflight():
+        if not is_preflight():
+            return None
+
+        response = app.response_class(status=204)
+        origin = request.headers.get('Origin')
+        if origin and origin_allowed(origin, origins):
+            response.headers.update(headers)
+            response.headers['Access-Control-Allow-Origin'] = origin
+        else:
+            response.headers['Vary'] = 'Origin'
+        return response
+
+    # Ahead of every other hook, including the ones already registered
+    app.before_request_funcs.setdefault(None, []).insert(0, answer_preflight)
@@ -1,16 +1,22 @@
 # myapp/database.py
+import functools
+import os
+import threading
+import time
 import pymysql.cursors
 from pymysql.constants import CLIENT
-from flask import current_app, g
-import threading
+from flask import current_app, g, has_request_context, request
 from contextlib import contextmanager
+from back_end.cache import get_named_cache
+from back_end.instrumentation import instrument_cursor
+from back_end.pool import ConnectionPool
+from back_end.replicas import ReplicaSet, parse_hosts
 
-# Thread-local storage for connection pooling
-_local = threading.local()
+_pool_lock = threading.Lock()
 
-def get_db_config():
-    """Get database configuration from current Flask app."""
-    config = current_app.config
+def get_db_config(app=None):
+    """Get database configuration from the Flask app."""
+    config = (app or current_app).config
     return {
         'host': config['MYSQL_HOST'],
         'port': config['MYSQL_PORT'],
@@ -18,29 +24,188 @@ def get_db_config():
         'password': config['MYSQL_PASSWORD'],
         'db': config['MYSQL_DB'],
         'charset': config['MYSQL_CHARSET'],
+        'connect_timeout': config['MYSQL_CONNECTION_TIMEOUT'],
         'cursorclass': pymysql.cursors.DictCursor,
         'autocommit': False,
         'client_flag': CLIENT.MULTI_STATEMENTS,
     }
 
-def get_connection():
-    """Get a database connection for the current request."""
+def create_pool(app):
+    """Build a connection pool from the app's MYSQL_* settings.
+    
+    MYSQL_CONNECTION_FACTORY may name a zero-argument callable used instead
+    of pymysql.connect, e.g. a fake connection in tests.
+    """
+    config = app.config
+    factory = config.get('MYSQL_CONNECTION_FACTORY')
+    if factory is None:
+        factory = functools.partial(pymysql.connect, **get_db_config(app))
+    
+    return ConnectionPool(
+        factory,
+        size=config['MYSQL_POOL_SIZE'],
+        recycle=config['MYSQL_POOL_RECYCLE'],
+        timeout=config['MYSQL_POOL_TIMEOUT'],
+        ping=config['MYSQL_POOL_PING'],
+    )
+
+def get_pool(app=None):
+    """Get the app's connection pool, creating it in each process on first use."""
+    app = app or current_app._get_current_object()
+    pool = app.extensions.get('db_pool')
+    
+    # A pool inherited across fork() shares sockets with the parent
+    if pool is None or pool.pid != os.getpid():
+        with _pool_lock:
+            pool = app.extensions.get('db_pool')
+            if pool is None or pool.pid != os.getpid():
+                pool = create_pool(app)
+                app.extensions['db_pool'] = pool
+    
+    return pool
+
+def create_replica_set(app):
+    """Build a ReplicaSet from MYSQL_REPLICA_HOSTS, or None without replicas.
+    
+    MYSQL_REPLICA_CONNECTION_FACTORIES may list zero-argument callables
+    used instead, one per replica, like MYSQL_CONNECTION_FACTORY.
+    """
+    config = app.config
+    factories = config.get('MYSQL_REPLICA_CONNECTION_FACTORIES')
+    if factories is None:
+        db_config = get_db_config(app)
+        factories = [
+            functools.partial(pymysql.connect, **{**db_config, 'host': host, 'port': port})
+            for host, port in parse_hosts(config['MYSQL_REPLICA_HOSTS'])
+        ]
+    if not factories:
+        return None
+    
+    pools = [
+        ConnectionPool(
+            factory,
+            size=config['MYSQL_REPLICA_POOL_SIZE'],
+            recycle=config['MYSQL_POOL_RECYCLE'],
+            timeout=config['MYSQL_POOL_TIMEOUT'],
+            ping=config['MYSQL_POOL_PING'],
+        )
+        for factory in factories
+    ]
+    return ReplicaSet(pools, cooldown=config['MYSQL_REPLICA_FAILURE_COOLDOWN'])
+
+def get_replicas(app=None):
+    """Get the app's ReplicaSet (None without replicas), rebuilt after a fork."""
+    app = app or current_app._get_current_object()
+    replicas = app.extensions.get('db_replicas')
+    
+    if replicas is not None and replicas.pid != os.getpid():
+        with _pool_lock:
+            replicas = app.extensions.get('db_replicas')
+            if replicas is not None and replicas.pid != os.getpid():
+                replicas = create_replica_set(app)
+                app.extensions['db_replicas'] = replicas
+    
+    return replicas
+
+def reset_pool(app):
+    """Close idle connections and start fresh pools on next use."""
+    pool = app.extensions.pop('db_pool', None)
+    if pool is not None and pool.pid == os.getpid():
+        pool.close_all()
+    
+    replicas = app.extensions.get('db_replicas')
+    if replicas is not None:
+        if replicas.pid == os.getpid():
+            replicas.close_all()
+        app.extensions['db_replicas'] = create_replica_set(app)
+
+def get_sticky_writers(config):
+    """Process-wide cache of users.id -> time of their last write."""
+    return get_named_cache('primary_sticky_writers', 10000, ttl=config['READ_YOUR_WRITES_WINDOW'])
+
+def record_write():
+    """Pin the rest of this request, and the writer's next reads, to the primary."""
+    if not has_request_context():
+        return
+    
+    g.db_wrote = True
+    user_id = g.get('internal_user_id')
+    if user_id:
+        get_sticky_writers(current_app.config).set(user_id, time.time())
+
+def reads_pinned_to_primary():
+    """Whether the current request must read from the primary.
+    
+    True after a write in this request, or within READ_YOUR_WRITES_WINDOW
+    of the user's last write. The window is tracked in this process and in
+    a cookie, so it holds when the next request lands on another worker.
+    """
+    if g.get('db_wrote'):
+        return True
+    
+    user_id = g.get('internal_user_id')
+    if user_id and get_sticky_writers(current_app.config).get(user_id) is not None:
+        return True
+    
+    try:
+        pinned_until = float(request.cookies.get(current_app.config['READ_PRIMARY_COOKIE'], 0))
+    except ValueError:
+        return False
+    return pinned_until > time.time()
+
+def get_connection(read_only=False):
+    """Get a database connection for the current request.
+    
+    Read-only work inside a request goes to a replica when replicas are
+    configured and the request is not pinned to the primary. CLI commands
+    and migrations always use the primary.
+    """
+    if read_only and has_request_context() and not reads_pinned_to_primary():
+        if 'db_replica' not in g:
+            replicas = get_replicas()
+            if replicas is not None:
+                pool, connection = replicas.acquire()
+                if connection is not None:
+                    g.db_replica_pool = pool
+                    g.db_replica = connection
+        if 'db_replica' in g:
+            return g.db_replica
+    
     # Check if we already have a connection for this request
     if 'db' not in g:
-        # Create a new connection
-        g.db = pymysql.connect(**get_db_config())
+        # Check one out of the pool
+        g.db = get_pool().acquire()
     
     return g.db
 
+def replica_failed(connection, error):
+    """Take the replica behind ``connection`` out of rotation after a connection error.
+    
+    The connection is dropped from the request, so later reads check out one
+    from another replica or the primary. Returns the replica's pool, which
+    the caller must ``discard`` the connection to, or None if nothing failed.
+    """
+    if isinstance(error, pymysql.err.OperationalError) and connection is g.get('db_replica'):
+        g.pop('db_replica')
+        pool = g.pop('db_replica_pool')
+        get_replicas().mark_down(pool, error)
+        return pool
+    return None
+
 def close_connection(e=None):
-    """Close the database connection at the end of the request."""
+    """Return the database connections to their pools at the end of the request."""
     db = g.pop('db', None)
     
     if db is not None:
-        db.close()
+        get_pool().release(db)
+    
+    replica = g.pop('db_replica', None)
+    replica_pool = g.pop('db_replica_pool', None)
+    if replica is not None:
+        replica_pool.release(replica)
 
 @contextmanager
-def get_db_cursor(commit=False):
+def get_db_cursor(commit=False, primary=False):
     """Context manager for database cursors.
     
     Usage:
@@ -49,29 +214,87 @@ def get_db_cursor(commit=False):
             results = cursor.fetchall()
     
     Args:
-        commit (bool): Whether to commit the transaction after the block
+        commit (bool): Whether to commit the transaction after the block.
+            Cursors without commit are read-only and may be served by a
+            replica.
+        primary (bool): Read from the primary even without commit, for
+            reads that must not lag behind writes.
     """
-    connection = get_connection()
-    cursor = connection.cursor()
+    connection = get_connection(read_only=not (commit or primary))
+    cursor = instrument_cursor(connection.cursor())
+    failed_pool = None
     
     try:
         yield cursor
         if commit:
             connection.commit()
+            record_write()
     except Exception as e:
-        connection.rollback()
+        failed_pool = replica_failed(connection, e)
+        if failed_pool is None:
+            connection.rollback()
         raise e
     finally:
-        cursor.close()
+        if failed_pool is None:
+            cursor.close()
+        else:
+            # Closing the broken connection ends the cursor too
+            failed_pool.discard(connection)
+
+@contextmanager
+def get_db_stream_cursor(tuples=False):
+    """Context manager for an unbuffered, server-side dict cursor.
+    
+    Rows are read from the socket as they are fetched, so memory stays flat
+    however large the result set is. The request's connection cannot run
+    other queries until the cursor is closed. With ``tuples`` rows come back
+    as plain tuples, which is cheaper when the caller unpacks them anyway.
+    """
+    connection = get_connection(read_only=True)
+    cursorclass = pymysql.cursors.SSCursor if tuples else pymysql.cursors.SSDictCursor
+    cursor = instrument_cursor(connection.cursor(cursorclass))
+    failed_pool = None
+    
+    try:
+        yield cursor
+    except Exception as e:
+        failed_pool = replica_failed(connection, e)
+        raise e
+    finally:
+        if failed_pool is None:
+            cursor.close()
+        else:
+            failed_pool.discard(connection)
 
 def init_app(app):
     """Initialize the database extension with the Flask app."""
+    # Connections are opened lazily, so building the pools here is cheap
+    app.extensions['db_pool'] = create_pool(app)
+    app.extensions['db_replicas'] = create_replica_set(app)
+    
+    if app.extensions['db_replicas'] is not None:
+        app.after_request(set_read_primary_cookie)
+    
     # Register close_connection to be called when the app context ends
     app.teardown_appcontext(close_connection)
     
     # Register CLI commands if any
     register_cli_commands(app)
 
+def set_read_primary_cookie(response):
+    """Tell the client to read from the primary for a while after it wrote."""
+    if g.get('db_wrote'):
+        window = current_app.config['READ_YOUR_WRITES_WINDOW']
+        response.set_cookie(
+            current_app.config['READ_PRIMARY_COOKIE'],
+            str(int(time.time() + window)),
+            max_age=window,
+            httponly=True,
+            secure=current_app.config.get('SESSION_COOKIE_SECURE', False),
+            samesite=current_app.config.get('SESSION_COOKIE_SAMESITE'),
+        )
+    return response
+
 def register_cli_commands(app):
     """Register database-related CLI commands with the Flask app."""
     import click
@@ -88,6 +311,141 @@ def register_cli_commands(app):
         create_schema()
         click.echo('Initialized the database.')
     
+    @app.cli.command('backfill-rollups')
+    @click.option('--background', is_flag=True, help='Queue the rebuild for the job workers')
+    def backfill_rollups_command(background):
+        """Rebuild the daily transaction rollups from raw transactions."""
+        from back_end.rollups import backfill
+        
+        if background:
+            from back_end.jobs import enqueue_job
+            
+            job = enqueue_job('backfill_rollups', None, {})
+            click.echo(f"Queued job {job['id']}.")
+            return
+        
+        click.echo('Rebuilding transaction rollups...')
+        rows = backfill()
+        click.echo(f'Wrote {rows} rollup row(s).')
+    
+    @app.cli.command('check-rollups')
+    @click.option('--limit', type=int, default=20, help='Maximum mismatches to show')
+    def check_rollups_command(limit):
+        """Compare the daily rollups with aggregates over raw transactions."""
+        from back_end.rollups import check_consistency
+        
+        mismatches = check_consistency(limit=limit)
+        for row in mismatches:
+            click.echo(
+                f"{row['owner_type']} {row['owner_id']} {row['day']} {row['category'] or '-'}: "
+                f"raw total={row['raw_total_amount']} count={row['raw_transaction_count']}, "
+                f"rollup total={row['rollup_total_amount']} count={row['rollup_transaction_count']}"
+            )
+        
+        if mismatches:
+            raise click.ClickException(f'{len(mismatches)} rollup row(s) disagree with raw data')
+        click.echo('Rollups match raw transactions.')
+    
+    @app.cli.command('create-partitions')
+    @click.option('--months-ahead', type=int, default=None,
+                  help='Months past the archive cutoff to create (default ARCHIVE_PARTITIONS_AHEAD)')
+    def create_partitions_command(months_ahead):
+        """Create the next monthly partitions of transactions_archive."""
+        from back_end.archive import ensure_partitions
+        
+        created = ensure_partitions(months_ahead=months_ahead)
+        click.echo(f"Created {len(created)} partition(s){': ' + ', '.join(created) if created else '.'}")
+    
+    @app.cli.command('archive-transactions')
+    @click.option('--older-than-days', type=int, default=None,
+                  help='Archive transactions older than this (default ARCHIVE_AFTER_DAYS)')
+    @click.option('--batch-size', type=int, default=None, help='Rows moved per DB transaction')
+    def archive_transactions_command(older_than_days, batch_size):
+        """Move old transactions into the partitioned archive table."""
+        from datetime import date, timedelta
+        from back_end.archive import archive_cutoff, archive_transactions, ensure_partitions
+        
+        if older_than_days is not None and older_than_days < current_app.config['ARCHIVE_AFTER_DAYS']:
+            # Reads skip the archive for dates after ARCHIVE_AFTER_DAYS
+            raise click.ClickException('--older-than-days must be at least ARCHIVE_AFTER_DAYS')
+        
+        cutoff = archive_cutoff()
+        if older_than_days is not None:
+            cutoff = date.today() - timedelta(days=older_than_days)
+        
+        created = ensure_partitions()
+        if created:
+            click.echo(f"Created partition(s): {', '.join(created)}")
+        
+        click.echo(f'Archiving transactions dated before {cutoff}...')
+        moved = archive_transactions(cutoff=cutoff, batch_size=batch_size, echo=click.echo)
+        click.echo(f'Archived {moved} transaction(s).')
+    
+    @app.cli.command('migrate')
+    @click.option('--target', type=int, default=None, help='Stop after this migration version')
+    @click.option('--list', 'list_only', is_flag=True, help='Only list pending migrations')
+    def migrate_command(target, list_only):
+        """Apply pending schema migrations."""
+        from back_end.migrations import get_pending_migrations, migrate
+        
+        if list_only:
+            pending = get_pending_migrations()
+            for version, name, _ in pending:
+                click.echo(f'{version:04d}_{name}')
+            if not pending:
+                click.echo('No pending migrations.')
+            return
+        
+        applied = migrate(target=target, echo=click.echo)
+        click.echo(f'Applied {len(applied)} migration(s).')
+    
+    @app.cli.command('check-indexes')
+    @click.option('--user-id', type=int, default=1, help='User id to plan user-scoped queries with')
+    @click.option('--household-id', type=int, default=1, help='Household id to plan household queries with')
+    @click.option('--start-date', default='2000-01-01', help='Lower date bound used in date filters')
+    @click.option('--search', default='+amazon*', help='BOOLEAN MODE query used by search plans')
+    def check_indexes_command(user_id, household_id, start_date, search):
+        """EXPLAIN the hot queries and fail if one stops using its index."""
+        from back_end.query_plans import check_hot_queries
+        
+        results = check_hot_queries({
+            'user_id': user_id,
+            'household_id': household_id,
+            'start_date': start_date,
+            'search': search,
+        })
+        
+        for result in results:
+            status = 'ok' if result['ok'] else 'FAIL'
+            detail = '; '.join(result['problems']) or f"{result['index']}, ~{result['rows']} rows"
+            if result['partitions']:
+                detail += f", partitions {result['partitions']}"
+            click.echo(f"[{status}] {result['name']}: {detail}")
+        
+        failed = [result for result in results if not result['ok']]
+        if failed:
+            raise click.ClickException(f'{len(failed)} hot query plan(s) regressed')
+    
+    @app.cli.command('run-workers')
+    @click.option('--processes', type=int, default=None,
+                  help='Worker processes (default JOB_WORKER_PROCESSES)')
+    def run_workers_command(processes):
+        """Run background job workers until interrupted."""
+        from flask import current_app
+        from back_end.jobs import run_workers
+        
+        run_workers(current_app._get_current_object(), processes, echo=click.echo)
+    
+    @app.cli.command('purge-jobs')
+    @click.option('--retention-days', type=int, default=None,
+                  help='Keep finished jobs this many days (default JOB_RETENTION_DAYS)')
+    def purge_jobs_command(retention_days):
+        """Delete finished background jobs and their export files."""
+        from back_end.jobs import purge_jobs
+        
+        jobs_deleted, files_deleted = purge_jobs(retention_days)
+        click.echo(f'Deleted {jobs_deleted} job(s) and {files_deleted} result file(s).')
+    
     @app.cli.command('seed-db')
     def seed_db_command():
         """Seed the database with initial data."""
@@ -102,20 +460,15 @@ def execute_script(script_path, commit=True):
     
     with get_db_cursor(commit=commit) as cursor:
         cursor.execute(sql_script)
+        # Drain the results of every statement so the connection stays usable
+        while cursor.nextset():
+            pass
 
 def create_schema():
-    """Create database schema from SQL files."""
-    import os
-    from flask import current_app
-    
-    # Path to schema files
-    schema_dir = os.path.join(current_app.root_path, 'schema')
+    """Create or upgrade the database schema by applying pending migrations."""
+    from back_end.migrations import migrate
     
-    # Execute each schema file in order
-    for filename in sorted(os.listdir(schema_dir)):
-        if filename.endswith('.sql'):
-            script_path = os.path.join(schema_dir, filename)
-            execute_script(script_path)
+    return migrate()
 
 def drop_all_tables():
     """Drop all tables in the database."""
@@ -0,0 +1,190 @@
+# myapp/importers.py
+import csv
+import io
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from flask import current_app
+
+from back_end.database import get_db_cursor
+from back_end.membership import cached_household_ids, load_household_ids
+from back_end.response_cache import invalidate_scopes, owner_scope
+from back_end.rollups import apply_transactions
+
+# Limits from the transactions table definition
+MAX_AMOUNT = Decimal('99999999.99')
+MAX_DESCRIPTION_LENGTH = 255
+MAX_CATEGORY_LENGTH = 50
+
+OFX_TRANSACTION_RE = re.compile(r'<STMTTRN>(.*?)(?:</STMTTRN>|(?=<STMTTRN>)|(?=</BANKTRANLIST>))',
+                                re.IGNORECASE | re.DOTALL)
+OFX_FIELD_RE = re.compile(r'<(\w+)>([^<\r\n]*)')
+
+
+def parse_csv(text):
+    """Parse CSV text with a header row into a list of row dicts.
+
+    Header names are matched case-insensitively against the transaction
+    fields (amount, date, description, category, household_id).
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    rows = []
+    for record in reader:
+        rows.append({
+            (key or '').strip().lower(): (value.strip() if isinstance(value, str) else value)
+            for key, value in record.items()
+        })
+    return rows
+
+
+def parse_ofx(text):
+    """Parse the <STMTTRN> entries of an OFX statement into row dicts.
+
+    Handles both SGML (OFX 1.x, unclosed tags) and XML (OFX 2.x) files.
+    NAME becomes the description, falling back to MEMO.
+    """
+    rows = []
+    for block in OFX_TRANSACTION_RE.findall(text):
+        fields = {tag.upper(): value.strip() for tag, value in OFX_FIELD_RE.findall(block)}
+        posted = fields.get('DTPOSTED', '')
+        rows.append({
+            'amount': fields.get('TRNAMT'),
+            # DTPOSTED is YYYYMMDD optionally followed by time and timezone
+            'date': f'{posted[0:4]}-{posted[4:6]}-{posted[6:8]}' if len(posted) >= 8 else posted,
+            'description': fields.get('NAME') or fields.get('MEMO'),
+            'category': None,
+        })
+    return rows
+
+
+def _parse_amount(value):
+    try:
+        amount = Decimal(str(value).replace(',', '')).quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"Invalid amount: {value!r}")
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+    if abs(amount) > MAX_AMOUNT:
+        raise ValueError(f"Amount out of range: {value!r}")
+    return amount
+
+
+def _parse_date(value):
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value).strip()[:10], '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"Invalid date, expected YYYY-MM-DD: {value!r}")
+
+
+def validate_rows(rows, default_household_id=None):
+    """Validate and normalize imported rows in a single pass.
+
+    Returns ``(transactions, errors)``. Each transaction is a dict with a
+    Decimal amount, a date, and description/category/household_id; each
+    error is ``{"row": n, "error": message}`` with 1-based row numbers.
+    """
+    transactions = []
+    errors = []
+
+    for index, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append({"row": index, "error": "Row must be an object"})
+            continue
+
+        missing = [field for field in ('amount', 'date', 'description')
+                   if row.get(field) in (None, '')]
+        if missing:
+            errors.append({"row": index, "error": f"Missing required fields: {', '.join(missing)}"})
+            continue
+
+        try:
+            amount = _parse_amount(row['amount'])
+            day = _parse_date(row['date'])
+
+            description = str(row['description']).strip()
+            if len(description) > MAX_DESCRIPTION_LENGTH:
+                raise ValueError(f"Description longer than {MAX_DESCRIPTION_LENGTH} characters")
+
+            category = row.get('category') or None
+            if category is not None:
+                category = str(category).strip()
+                if len(category) > MAX_CATEGORY_LENGTH:
+                    raise ValueError(f"Category longer than {MAX_CATEGORY_LENGTH} characters")
+
+            household_id = row.get('household_id') or default_household_id
+            household_id = int(household_id) if household_id not in (None, '') else None
+        except (TypeError, ValueError) as e:
+            errors.append({"row": index, "error": str(e)})
+            continue
+
+        transactions.append({
+            'row': index,
+            'amount': amount,
+            'date': day,
+            'description': description,
+            'category': category,
+            'household_id': household_id,
+        })
+
+    return transactions, errors
+
+
+def import_transactions(user_id, rows, default_household_id=None, progress=None, before_commit=None):
+    """Validate ``rows`` and insert them for ``user_id`` in one DB transaction.
+
+    Returns ``(inserted, errors)``; when any row is invalid nothing is
+    inserted. ``progress(done, total)`` is called after each insert chunk
+    and ``before_commit(cursor, inserted)`` just before the commit.
+    """
+    transactions, errors = validate_rows(rows, default_household_id)
+
+    # One membership query covers every household referenced by the import
+    household_ids = sorted({t['household_id'] for t in transactions if t['household_id']})
+    if household_ids:
+        member_of = cached_household_ids(user_id)
+        if member_of is None or not member_of.issuperset(household_ids):
+            # Read once on a miss, or in case a recent join is not cached yet
+            member_of = load_household_ids(user_id)
+
+        for transaction in transactions:
+            if transaction['household_id'] and transaction['household_id'] not in member_of:
+                errors.append({"row": transaction['row'], "error": "Not a member of the specified household"})
+
+    if errors:
+        errors.sort(key=lambda error: error['row'])
+        return 0, errors
+
+    chunk_size = current_app.config['BULK_INSERT_CHUNK_SIZE']
+    for transaction in transactions:
+        transaction['user_id'] = user_id
+
+    # One DB transaction: either every row and its rollups land, or none
+    with get_db_cursor(commit=True) as cursor:
+        for start in range(0, len(transactions), chunk_size):
+            chunk = transactions[start:start + chunk_size]
+            cursor.executemany(
+                """
+                INSERT INTO transactions 
+                (user_id, amount, date, description, category, household_id)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """,
+                [
+                    (user_id, t['amount'], t['date'], t['description'], t['category'], t['household_id'])
+                    for t in chunk
+                ]
+            )
+            if progress:
+                progress(start + len(chunk), len(transactions))
+
+        apply_transactions(cursor, transactions)
+        if before_commit:
+            before_commit(cursor, len(transactions))
+
+    scopes = {owner_scope(user_id)}
+    scopes.update(owner_scope(user_id, household_id) for household_id in household_ids)
+    invalidate_scopes(*scopes)
+
+    return len(transactions), []
@@ -0,0 +1,155 @@
+# myapp/instrumentation.py
+import functools
+import logging
+import re
+import time
+from contextlib import contextmanager
+from flask import current_app, g, has_request_context
+
+logger = logging.getLogger('back_end.sql')
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/|--[^\n]*', re.DOTALL)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+_PLACEHOLDER_RE = re.compile(r'%\(\w+\)s|%s|\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(sql):
+    """Normalize a SQL template so every execution of it groups together.
+
+    Literals and placeholders become ``?`` and IN lists collapse to
+    ``(...)``, e.g. ``SELECT id FROM users WHERE auth0_id = ?``.
+    """
+    sql = _COMMENT_RE.sub(' ', sql)
+    sql = _STRING_RE.sub('?', sql)
+    sql = _PLACEHOLDER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('(...)', sql)
+    return _WHITESPACE_RE.sub(' ', sql).strip()
+
+
+class RequestStats:
+    """Queries and named timings collected during one request."""
+
+    def __init__(self):
+        self.queries = []  # (fingerprint, seconds, rows)
+        self.db_time = 0.0
+        self.timings = {}
+
+    def add_query(self, sql, seconds, rows):
+        self.queries.append((fingerprint(sql), seconds, rows))
+        self.db_time += seconds
+
+    def add_timing(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def server_timing(self):
+        """Format the collected totals as a Server-Timing header value."""
+        parts = [f'db;dur={self.db_time * 1000:.2f};desc="{len(self.queries)} queries"']
+        for name, seconds in self.timings.items():
+            parts.append(f'{name};dur={seconds * 1000:.2f}')
+        return ', '.join(parts)
+
+
+def get_request_stats():
+    """Stats for the current request, or None when instrumentation is off."""
+    if not has_request_context():
+        return None
+    return g.get('request_stats')
+
+
+def record_timing(name, seconds):
+    stats = get_request_stats()
+    if stats is not None:
+        stats.add_timing(name, seconds)
+
+
+@contextmanager
+def timed(name):
+    """Add the duration of the block to the current request's ``name`` timing."""
+    stats = get_request_stats()
+    if stats is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_timing(name, time.perf_counter() - started)
+
+
+class InstrumentedCursor:
+    """Cursor proxy that times every execute/executemany."""
+
+    def __init__(self, cursor, stats, slow_threshold):
+        self._cursor = cursor
+        self._stats = stats
+        self._slow_threshold = slow_threshold
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _record(self, sql, started):
+        seconds = time.perf_counter() - started
+        rows = self._cursor.rowcount
+        self._stats.add_query(sql, seconds, rows)
+        if seconds >= self._slow_threshold:
+            logger.warning("Slow query %.1f ms rows=%s: %s", seconds * 1000, rows, fingerprint(sql))
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query, args)
+        finally:
+            self._record(query, started)
+
+    def executemany(self, query, args):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, args)
+        finally:
+            self._record(query, started)
+
+
+def instrument_cursor(cursor):
+    """Wrap ``cursor`` if the current request is being instrumented."""
+    stats = get_request_stats()
+    if stats is None:
+        return cursor
+    return InstrumentedCursor(cursor, stats, current_app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000)
+
+
+def init_app(app):
+    """Collect per-request SQL stats and report them in Server-Timing."""
+    if not app.config.get('SQL_INSTRUMENTATION', False):
+        return
+
+    # Time JSON serialization wherever the provider is used
+    provider = app.json
+    dumps = provider.dumps
+
+    def timed_dumps(obj, **kwargs):
+        with timed('serialize'):
+            return dumps(obj, **kwargs)
+
+    provider.dumps = timed_dumps
+
+    @app.before_request
+    def start_request_stats():
+        g.request_stats = RequestStats()
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def add_server_timing(response):
+        stats = g.get('request_stats')
+        if stats is not None:
+            total = time.perf_counter() - g.request_started
+            response.headers['Server-Timing'] = (
+                f'{stats.server_timing()}, total;dur={total * 1000:.2f}'
+            )
+        return response
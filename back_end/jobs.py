@@ -0,0 +1,514 @@
+# myapp/jobs.py
+"""Background jobs on a queue kept in the MySQL ``jobs`` table.
+
+Requests enqueue a job and answer 202 with its id; ``flask run-workers``
+starts a pool of worker processes that claim queued jobs, run the handler
+registered for their kind and record the outcome. Failed attempts are
+retried with exponential backoff until max_attempts, and no user has more
+than JOB_MAX_RUNNING_PER_USER jobs running at once.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import socket
+import threading
+import time
+
+from flask import current_app, jsonify, url_for
+
+from back_end.database import get_db_cursor, get_pool
+
+logger = logging.getLogger(__name__)
+
+# kind -> handler(context, payload), filled in by @job_handler
+JOB_HANDLERS = {}
+
+# Everything but the payload, which can be large and is only read by workers
+JOB_COLUMNS = """
+    id, user_id, kind, status, result, error, progress, progress_message,
+    attempts, max_attempts, run_after, created_at, started_at, finished_at
+"""
+
+# Due jobs, oldest first, skipping rows other workers are claiming and
+# users already at the cap (rechecked under a lock before claiming)
+CLAIM_CANDIDATES_QUERY = """
+    SELECT j.id, j.user_id FROM jobs j
+    WHERE j.status = 'queued' AND j.run_after <= NOW(6)
+      AND (j.user_id IS NULL OR (
+          SELECT COUNT(*) FROM jobs r WHERE r.user_id = j.user_id AND r.status = 'running'
+      ) < %s)
+    ORDER BY j.run_after, j.id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+"""
+
+RUNNING_COUNT_QUERY = """
+    SELECT COUNT(*) AS running FROM jobs
+    WHERE user_id = %s AND status = 'running'
+    FOR SHARE
+"""
+
+CLAIM_JOB_SQL = """
+    UPDATE jobs
+    SET status = 'running', attempts = attempts + 1, locked_by = %s,
+        started_at = NOW(6), heartbeat_at = NOW(6), progress = 0, progress_message = NULL
+    WHERE id = %s
+"""
+
+# Outcome updates only apply while the worker still holds the job
+OWNED_BY_WORKER = "WHERE id = %s AND status = 'running' AND locked_by = %s"
+
+COMPLETE_JOB_SQL = f"""
+    UPDATE jobs
+    SET status = 'succeeded', result = %s, error = NULL, progress = 100,
+        payload = NULL, locked_by = NULL, finished_at = NOW(6)
+    {OWNED_BY_WORKER}
+"""
+
+FAIL_JOB_SQL = f"""
+    UPDATE jobs
+    SET status = 'failed', result = %s, error = %s, payload = NULL,
+        locked_by = NULL, finished_at = NOW(6)
+    {OWNED_BY_WORKER}
+"""
+
+RETRY_JOB_SQL = f"""
+    UPDATE jobs
+    SET status = 'queued', error = %s, locked_by = NULL, heartbeat_at = NULL,
+        run_after = NOW(6) + INTERVAL %s MICROSECOND
+    {OWNED_BY_WORKER}
+"""
+
+PROGRESS_SQL = f"""
+    UPDATE jobs
+    SET progress = COALESCE(%s, progress), progress_message = %s, heartbeat_at = NOW(6)
+    {OWNED_BY_WORKER}
+"""
+
+HEARTBEAT_SQL = f"UPDATE jobs SET heartbeat_at = NOW(6) {OWNED_BY_WORKER}"
+
+# Jobs whose worker died: retried straight away, or failed when out of attempts
+REQUEUE_STALE_SQL = """
+    UPDATE jobs
+    SET finished_at = IF(attempts < max_attempts, NULL, NOW(6)),
+        payload = IF(attempts < max_attempts, payload, NULL),
+        status = IF(attempts < max_attempts, 'queued', 'failed'),
+        error = 'Worker stopped responding', locked_by = NULL
+    WHERE status = 'running' AND heartbeat_at < NOW(6) - INTERVAL %s SECOND
+"""
+
+# Finished jobs past the retention period, deleted a batch at a time
+PURGE_JOBS_SQL = """
+    DELETE FROM jobs
+    WHERE status IN ('succeeded', 'failed') AND finished_at < NOW(6) - INTERVAL %s DAY
+    LIMIT %s
+"""
+
+# Rows deleted per purge statement
+PURGE_BATCH = 1000
+
+# Seconds between a worker's retention sweeps
+PURGE_INTERVAL = 3600
+
+# Candidates looked at per claim
+CLAIM_BATCH = 20
+
+# Seconds to wait for another worker's per-user claim lock
+USER_LOCK_TIMEOUT = 5
+
+# Minimum seconds between progress writes
+PROGRESS_INTERVAL = 0.5
+
+
+class JobFailed(Exception):
+    """A permanent failure: the job is marked failed without further attempts.
+
+    ``result`` is stored with the job, e.g. per-row validation errors.
+    """
+
+    def __init__(self, message, result=None):
+        super().__init__(message)
+        self.result = result
+
+
+class JobLeaseLost(Exception):
+    """The job was requeued or finished elsewhere while this worker ran it."""
+
+
+def job_handler(kind):
+    """Register the decorated function as the handler for ``kind`` jobs."""
+    def decorator(fn):
+        JOB_HANDLERS[kind] = fn
+        return fn
+    return decorator
+
+
+def serialize_job(row):
+    """A jobs row as returned by the API, with the result decoded."""
+    job = dict(row)
+    job.pop('payload', None)
+    if job.get('result') is not None:
+        job['result'] = json.loads(job['result'])
+    return job
+
+
+def enqueue_job(kind, user_id, payload, max_attempts=None):
+    """Queue a ``kind`` job for ``user_id`` (None for system jobs) and return it."""
+    if max_attempts is None:
+        max_attempts = current_app.config['JOB_MAX_ATTEMPTS']
+
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(
+            "INSERT INTO jobs (user_id, kind, payload, max_attempts) VALUES (%s, %s, %s, %s)",
+            (user_id, kind, json.dumps(payload, default=str), max_attempts)
+        )
+        cursor.execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = %s", (cursor.lastrowid,))
+        return serialize_job(cursor.fetchone())
+
+
+def job_accepted(job):
+    """202 response for a queued job, pointing at its status endpoint."""
+    response = jsonify(job)
+    response.status_code = 202
+    response.headers['Location'] = url_for('jobs.get_job_status', job_id=job['id'])
+    return response
+
+
+def get_job(job_id, user_id):
+    """The user's job ``job_id``, or None."""
+    # From the primary: pollers must see the worker's latest progress
+    with get_db_cursor(primary=True) as cursor:
+        cursor.execute(
+            f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = %s AND user_id = %s",
+            (job_id, user_id)
+        )
+        row = cursor.fetchone()
+    return serialize_job(row) if row else None
+
+
+def list_jobs(user_id, limit=50):
+    """The user's most recent jobs, newest first."""
+    with get_db_cursor(primary=True) as cursor:
+        cursor.execute(
+            f"SELECT {JOB_COLUMNS} FROM jobs WHERE user_id = %s ORDER BY id DESC LIMIT %s",
+            (user_id, limit)
+        )
+        return [serialize_job(row) for row in cursor.fetchall()]
+
+
+def execute_detached(sql, params, app=None):
+    """Run one statement on its own pooled connection and commit it.
+
+    Progress and heartbeats go through here so they are visible at once
+    and never commit, or wait on, the job's own DB transaction.
+    """
+    pool = get_pool(app)
+    connection = pool.acquire()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rowcount = cursor.rowcount
+        connection.commit()
+        return rowcount
+    finally:
+        pool.release(connection)
+
+
+class JobContext:
+    """The running job as seen by its handler."""
+
+    def __init__(self, job, worker_id):
+        self.job = job
+        self.worker_id = worker_id
+        self.completed = False
+        self._last_progress = 0.0
+
+    def progress(self, done, total=None, message=None):
+        """Record progress; ``done`` of ``total`` becomes a percentage below 100."""
+        now = time.monotonic()
+        if now - self._last_progress < PROGRESS_INTERVAL and (total is None or done < total):
+            return
+        self._last_progress = now
+
+        percent = min(99, done * 100 // total) if total else None
+        if message is None and total:
+            message = f"{done} of {total}"
+        execute_detached(PROGRESS_SQL, (percent, message, self.job['id'], self.worker_id))
+
+    def succeed(self, cursor, result):
+        """Mark the job succeeded on ``cursor``, inside the handler's DB transaction.
+
+        Handlers whose writes must happen at most once call this before
+        their transaction commits, so a retry never repeats committed work.
+        Raises JobLeaseLost, rolling the writes back, if the job is no
+        longer this worker's.
+        """
+        cursor.execute(
+            COMPLETE_JOB_SQL,
+            (json.dumps(result, default=str), self.job['id'], self.worker_id)
+        )
+        if cursor.rowcount != 1:
+            raise JobLeaseLost(f"Job {self.job['id']} is no longer held by {self.worker_id}")
+        self.completed = True
+
+
+class Heartbeat(threading.Thread):
+    """Keep a running job's lease alive while its handler works."""
+
+    def __init__(self, app, job_id, worker_id, interval):
+        super().__init__(name=f'job-{job_id}-heartbeat', daemon=True)
+        self.app = app
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                execute_detached(HEARTBEAT_SQL, (self.job_id, self.worker_id), self.app)
+            except Exception as e:
+                logger.warning("Heartbeat for job %s failed: %s", self.job_id, e)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def retry_delay(attempts, config):
+    """Seconds before the next attempt: exponential backoff with jitter."""
+    ceiling = min(config['JOB_RETRY_MAX_DELAY'], config['JOB_RETRY_BASE_DELAY'] * 2 ** (attempts - 1))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+def claim_job(worker_id):
+    """Claim the oldest due job whose owner is under the running cap, or None.
+
+    A named lock per user serializes claims for that user across workers,
+    so two workers can never both take the last free slot.
+    """
+    cap = current_app.config['JOB_MAX_RUNNING_PER_USER']
+    job = None
+    user_lock = None
+
+    try:
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(CLAIM_CANDIDATES_QUERY, (cap, CLAIM_BATCH))
+            for candidate in cursor.fetchall():
+                user_id = candidate['user_id']
+                if user_id is not None:
+                    lock_name = f'jobs_user_{user_id}'
+                    cursor.execute("SELECT GET_LOCK(%s, %s) AS acquired", (lock_name, USER_LOCK_TIMEOUT))
+                    if not cursor.fetchone()['acquired']:
+                        continue
+                    user_lock = lock_name
+
+                    cursor.execute(RUNNING_COUNT_QUERY, (user_id,))
+                    if cursor.fetchone()['running'] >= cap:
+                        cursor.execute("SELECT RELEASE_LOCK(%s)", (lock_name,))
+                        user_lock = None
+                        continue
+
+                cursor.execute(CLAIM_JOB_SQL, (worker_id, candidate['id']))
+                cursor.execute(f"SELECT {JOB_COLUMNS}, payload FROM jobs WHERE id = %s", (candidate['id'],))
+                job = cursor.fetchone()
+                break
+    finally:
+        # Held until the claim commits, so the next claimer counts this job
+        if user_lock:
+            with get_db_cursor() as cursor:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (user_lock,))
+
+    return job
+
+
+def finish_job(job, worker_id, sql, params):
+    """Apply an outcome update; returns 0 if the worker no longer held the job."""
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(sql, (*params, job['id'], worker_id))
+        return cursor.rowcount
+
+
+def run_job(app, job, worker_id):
+    """Run a claimed job's handler and record the outcome."""
+    config = app.config
+    context = JobContext(job, worker_id)
+    heartbeat = Heartbeat(app, job['id'], worker_id, max(1, config['JOB_LEASE_SECONDS'] // 3))
+    heartbeat.start()
+
+    try:
+        handler = JOB_HANDLERS.get(job['kind'])
+        if handler is None:
+            raise JobFailed(f"Unknown job kind: {job['kind']}")
+        result = handler(context, json.loads(job['payload']))
+    except JobLeaseLost as e:
+        logger.warning("%s", e)
+    except JobFailed as e:
+        result = json.dumps(e.result, default=str) if e.result is not None else None
+        finish_job(job, worker_id, FAIL_JOB_SQL, (result, str(e)))
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        if job['attempts'] < job['max_attempts']:
+            delay = retry_delay(job['attempts'], config)
+            logger.warning("Job %s (%s) attempt %s failed, retrying in %.0fs: %s",
+                           job['id'], job['kind'], job['attempts'], delay, error)
+            finish_job(job, worker_id, RETRY_JOB_SQL, (error, int(delay * 1e6)))
+        else:
+            logger.exception("Job %s (%s) failed after %s attempt(s)", job['id'], job['kind'], job['attempts'])
+            finish_job(job, worker_id, FAIL_JOB_SQL, (None, error))
+    else:
+        if not context.completed:
+            if not finish_job(job, worker_id, COMPLETE_JOB_SQL, (json.dumps(result, default=str),)):
+                logger.warning("Job %s finished after its lease was lost", job['id'])
+    finally:
+        heartbeat.stop()
+
+
+def requeue_stale_jobs(lease_seconds=None):
+    """Requeue running jobs whose worker stopped heartbeating; returns how many."""
+    if lease_seconds is None:
+        lease_seconds = current_app.config['JOB_LEASE_SECONDS']
+
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(REQUEUE_STALE_SQL, (lease_seconds,))
+        return cursor.rowcount
+
+
+def purge_job_results(retention_days=None):
+    """Delete files in JOB_RESULTS_DIR older than the retention period.
+
+    Goes by modification time, so partial files left by crashed workers
+    are removed too. Returns how many files were deleted.
+    """
+    config = current_app.config
+    if retention_days is None:
+        retention_days = config['JOB_RETENTION_DAYS']
+
+    results_dir = config['JOB_RESULTS_DIR']
+    if not os.path.isdir(results_dir):
+        return 0
+
+    expires_before = time.time() - retention_days * 86400
+    removed = 0
+    for entry in os.scandir(results_dir):
+        if entry.is_file() and entry.stat().st_mtime < expires_before:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass  # Another worker's sweep got there first
+    return removed
+
+
+def purge_jobs(retention_days=None):
+    """Delete finished jobs and result files older than JOB_RETENTION_DAYS.
+
+    Returns (jobs deleted, files deleted).
+    """
+    if retention_days is None:
+        retention_days = current_app.config['JOB_RETENTION_DAYS']
+
+    deleted = 0
+    while True:
+        # Short DB transactions, so the sweep never holds many row locks
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(PURGE_JOBS_SQL, (retention_days, PURGE_BATCH))
+            batch = cursor.rowcount
+        deleted += batch
+        if batch < PURGE_BATCH:
+            break
+
+    return deleted, purge_job_results(retention_days)
+
+
+def work(app, index, stop):
+    """Worker process body: claim and run jobs until ``stop`` is set.
+
+    ``stop`` is shared by the whole pool and only set by the parent. A
+    SIGTERM sent to this worker alone stops just this worker, after its
+    current job, and the parent starts a replacement.
+    """
+    from back_end.serve import reset_after_fork
+
+    stopping = threading.Event()
+
+    # The parent handles Ctrl-C; SIGTERM finishes the current job first
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    reset_after_fork(app)
+
+    worker_id = f'{socket.gethostname()}:{os.getpid()}'
+    poll_interval = app.config['JOB_POLL_INTERVAL']
+    requeue_interval = max(1, app.config['JOB_LEASE_SECONDS'] // 3)
+    # Stagger the stale-job and retention sweeps across workers
+    next_requeue = time.monotonic() + index
+    next_purge = time.monotonic() + 60 * index
+
+    while not (stopping.is_set() or stop.is_set()):
+        job = None
+        try:
+            with app.app_context():
+                if time.monotonic() >= next_requeue:
+                    requeued = requeue_stale_jobs()
+                    if requeued:
+                        logger.warning("Requeued %s stale job(s)", requeued)
+                    next_requeue = time.monotonic() + requeue_interval
+
+                if time.monotonic() >= next_purge:
+                    jobs_deleted, files_deleted = purge_jobs()
+                    if jobs_deleted or files_deleted:
+                        logger.info("Purged %s finished job(s) and %s result file(s)",
+                                    jobs_deleted, files_deleted)
+                    next_purge = time.monotonic() + PURGE_INTERVAL
+
+                job = claim_job(worker_id)
+                if job is not None:
+                    run_job(app, job, worker_id)
+        except Exception:
+            logger.exception("Job worker %s failed", worker_id)
+
+        if job is None:
+            stopping.wait(poll_interval)
+
+
+def run_workers(app, processes=None, echo=None):
+    """Run ``processes`` job worker processes until SIGINT or SIGTERM.
+
+    Workers that exit unexpectedly are restarted. On shutdown each worker
+    finishes the job it is running before exiting.
+    """
+    # Register the handlers once, before forking
+    import back_end.tasks  # noqa: F401
+
+    processes = processes or app.config['JOB_WORKER_PROCESSES']
+    context = multiprocessing.get_context('fork')
+    stop = context.Event()
+
+    def start(index):
+        process = context.Process(target=work, args=(app, index, stop), name=f'jobs-worker-{index}')
+        process.start()
+        return process
+
+    def shutdown(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+
+    workers = [start(index) for index in range(processes)]
+    if echo:
+        echo(f"Started {processes} job worker(s): {', '.join(str(p.pid) for p in workers)}")
+
+    while not stop.wait(1):
+        for index, process in enumerate(workers):
+            if not process.is_alive():
+                logger.warning("Job worker %s exited with %s; restarting", process.pid, process.exitcode)
+                workers[index] = start(index)
+
+    if echo:
+        echo('Stopping job workers...')
+    for process in workers:
+        process.join()
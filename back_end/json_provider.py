@@ -0,0 +1,58 @@
+# myapp/json_provider.py
+import decimal
+import uuid
+
+import orjson
+from flask.json.provider import JSONProvider
+
+DECIMAL_MODES = ('string', 'float')
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson.
+
+    Dates and datetimes are written natively as ISO 8601. Decimals, which
+    orjson does not know, go through ``default``: as fixed-point strings
+    ("12.50") in the default ``string`` mode, or as JSON numbers in
+    ``float`` mode (JSON_DECIMAL_MODE).
+    """
+
+    sort_keys = True
+
+    def __init__(self, app):
+        super().__init__(app)
+        mode = app.config.get('JSON_DECIMAL_MODE', 'string')
+        if mode not in DECIMAL_MODES:
+            raise ValueError(f"Unknown JSON_DECIMAL_MODE: {mode}")
+        self.decimal_as_float = mode == 'float'
+
+    def _default(self, o):
+        if isinstance(o, decimal.Decimal):
+            return float(o) if self.decimal_as_float else format(o, 'f')
+        if isinstance(o, uuid.UUID):
+            return str(o)
+        if hasattr(o, '__html__'):
+            return str(o.__html__())
+        raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+    def _option(self, kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps_bytes(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self._default, option=self._option(kwargs))
+
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj, **kwargs).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self._app.debug
+        return self._app.response_class(self.dumps(obj, indent=indent), mimetype='application/json')
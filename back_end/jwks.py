@@ -0,0 +1,167 @@
+# myapp/jwks.py
+import base64
+import json
+import logging
+import threading
+import time
+from urllib.request import urlopen
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+logger = logging.getLogger(__name__)
+
+# Process-wide caches, one per JWKS URL
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def jwk_to_public_key(key):
+    """Build an RSA public key object from a JWK dict."""
+    modulus = base64.urlsafe_b64decode(key['n'] + '==')
+    exponent = base64.urlsafe_b64decode(key['e'] + '==')
+
+    modulus_int = int.from_bytes(modulus, byteorder='big')
+    exponent_int = int.from_bytes(exponent, byteorder='big')
+
+    public_numbers = rsa.RSAPublicNumbers(exponent_int, modulus_int)
+    return public_numbers.public_key(default_backend())
+
+
+class JWKSCache:
+    """Cache of parsed JWKS public keys keyed by ``kid``.
+
+    Keys are fetched once and served from memory until ``ttl`` seconds have
+    passed. Within ``refresh_ahead`` seconds of expiry a background thread
+    refreshes the set so request threads never wait on Auth0. An unknown
+    ``kid`` triggers a single synchronous refetch shared by all waiting
+    threads, rate limited by ``min_refetch_interval``. If a fetch fails the
+    previously loaded keys keep being served.
+    """
+
+    def __init__(self, jwks_url, ttl=600, refresh_ahead=60,
+                 min_refetch_interval=30, fetch_timeout=5):
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.min_refetch_interval = min_refetch_interval
+        self.fetch_timeout = fetch_timeout
+
+        self._keys = {}
+        self._fetched_at = None
+        self._last_attempt = None
+        self._fetch_lock = threading.Lock()
+
+        self.fetches = 0
+        self.fetch_failures = 0
+
+    def get_key(self, kid):
+        """Return the public key for ``kid`` or None if it is unknown."""
+        now = time.monotonic()
+        fetched_at = self._fetched_at
+        key = self._keys.get(kid)
+
+        if key is not None and fetched_at is not None:
+            age = now - fetched_at
+            if age < self.ttl:
+                if age >= self.ttl - self.refresh_ahead:
+                    self._refresh_in_background()
+                return key
+
+        # Cold cache, expired keys or a kid we have not seen yet
+        self._refresh(self.fetches)
+        if self._fetched_at != fetched_at:
+            # A fresh key set: a kid it no longer publishes was rotated out
+            return self._keys.get(kid)
+        return key
+
+    def _refresh(self, seen_attempts):
+        """Refetch the key set unless another thread tried while we waited."""
+        with self._fetch_lock:
+            if self.fetches != seen_attempts:
+                return
+
+            # Don't hammer Auth0 with unknown kids or while it is failing;
+            # the current (possibly stale) keys are served meanwhile.
+            if (self._keys and self._last_attempt is not None and
+                    time.monotonic() - self._last_attempt < self.min_refetch_interval):
+                return
+
+            self._fetch()
+
+    def _refresh_in_background(self):
+        """Start a refresh thread if no fetch is already in flight."""
+        last_attempt = self._last_attempt
+        if last_attempt is not None and time.monotonic() - last_attempt < self.min_refetch_interval:
+            return
+        if not self._fetch_lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self._fetch()
+            finally:
+                self._fetch_lock.release()
+
+        try:
+            threading.Thread(target=run, name='jwks-refresh', daemon=True).start()
+        except Exception:
+            self._fetch_lock.release()
+            raise
+
+    def _fetch(self):
+        """Download and parse the key set. Must hold ``_fetch_lock``."""
+        self._last_attempt = time.monotonic()
+        self.fetches += 1
+        try:
+            with urlopen(self.jwks_url, timeout=self.fetch_timeout) as response:
+                jwks = json.loads(response.read())
+
+            keys = {}
+            for key in jwks.get('keys', []):
+                if key.get('kty') != 'RSA' or 'kid' not in key:
+                    continue
+                keys[key['kid']] = jwk_to_public_key(key)
+        except Exception as e:
+            self.fetch_failures += 1
+            logger.warning("JWKS fetch from %s failed, serving %d cached keys: %s",
+                           self.jwks_url, len(self._keys), e)
+            return
+
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+
+    def clear(self):
+        """Drop all cached keys."""
+        with self._fetch_lock:
+            self._keys = {}
+            self._fetched_at = None
+            self._last_attempt = None
+
+
+def get_jwks_cache(config):
+    """Get the process-wide JWKS cache for the configured Auth0 tenant."""
+    jwks_url = config.get('AUTH0_JWKS_URL') or \
+        f"https://{config['AUTH0_DOMAIN']}/.well-known/jwks.json"
+
+    cache = _caches.get(jwks_url)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(jwks_url)
+            if cache is None:
+                cache = JWKSCache(
+                    jwks_url,
+                    ttl=config.get('JWKS_CACHE_TTL', 600),
+                    refresh_ahead=config.get('JWKS_REFRESH_AHEAD', 60),
+                    min_refetch_interval=config.get('JWKS_MIN_REFETCH_INTERVAL', 30),
+                    fetch_timeout=config.get('JWKS_FETCH_TIMEOUT', 5),
+                )
+                _caches[jwks_url] = cache
+
+    return cache
+
+
+def reset_jwks_caches():
+    """Forget every cached key set, e.g. after forking a worker."""
+    with _caches_lock:
+        _caches.clear()
@@ -0,0 +1,138 @@
+# myapp/log.py
+import atexit
+import copy
+import datetime
+import json
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else came from ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+# Renders tracebacks before records are queued
+_exception_formatter = logging.Formatter()
+
+# The listener currently draining the log queue, if any
+_listener = None
+_listener_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line.
+
+    Fields passed with ``extra=`` are included as top-level keys.
+    """
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc)
+                  .isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Rendered before the record was queued
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class DebugSamplingFilter(logging.Filter):
+    """Keep one in every ``every`` DEBUG records per message template.
+
+    Higher levels always pass. Counting per template keeps rare debug events
+    visible while thinning the ones logged on every request.
+    """
+
+    def __init__(self, every=1):
+        super().__init__()
+        self.every = max(1, int(every))
+        self._counts = {}
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+        key = (record.name, record.msg)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.every == 0
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        """Merge the args into the message and render the traceback into exc_text.
+
+        Unlike QueueHandler.prepare, the traceback is not folded into the
+        message, so formatters on the listener thread (JsonFormatter's
+        ``exc``) still see it separately.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            # Tracebacks keep frames alive; the rendered text is enough
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def start_queue_logging(logger, handlers, queue_size=10000, sample_every=1):
+    """Route ``logger`` through a bounded queue drained by a background thread.
+
+    The request thread only formats the message and enqueues it; ``handlers``
+    (files, streams) run on the listener thread. Replaces any listener
+    started by an earlier call.
+    """
+    global _listener
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(DebugSamplingFilter(sample_every))
+    queue_handler.back_end_handler = True
+
+    with _listener_lock:
+        stop_queue_logging()
+        for handler in list(logger.handlers):
+            if getattr(handler, 'back_end_handler', False):
+                logger.removeHandler(handler)
+                handler.close()
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        logger.addHandler(queue_handler)
+
+    return queue_handler
+
+
+def stop_queue_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(stop_queue_logging)
@@ -0,0 +1,93 @@
+# myapp/membership.py
+from functools import wraps
+from flask import current_app, g, jsonify, request
+from back_end.cache import get_named_cache
+from back_end.database import get_db_cursor
+
+
+def get_membership_cache(config):
+    """Get the process-wide users.id -> household ids cache, or None if disabled."""
+    size = config.get('MEMBERSHIP_CACHE_SIZE', 0)
+    if size <= 0:
+        return None
+    return get_named_cache('household_memberships', size, ttl=config['MEMBERSHIP_CACHE_TTL'])
+
+
+def load_household_ids(user_id):
+    """Read the ids of every household ``user_id`` belongs to and cache them."""
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            "SELECT household_id FROM household_members WHERE user_id = %s",
+            (user_id,)
+        )
+        household_ids = frozenset(row['household_id'] for row in cursor.fetchall())
+
+    cache = get_membership_cache(current_app.config)
+    if cache is not None:
+        cache.set(user_id, household_ids)
+    return household_ids
+
+
+def cached_household_ids(user_id):
+    """The cached household ids of ``user_id``, or None on a miss."""
+    cache = get_membership_cache(current_app.config)
+    if cache is None:
+        return None
+    return cache.get(user_id)
+
+
+def get_household_ids(user_id):
+    """Ids of the households ``user_id`` belongs to, from the cache when possible."""
+    household_ids = cached_household_ids(user_id)
+    if household_ids is not None:
+        return household_ids
+    return load_household_ids(user_id)
+
+
+def is_household_member(user_id, household_id):
+    """Whether ``user_id`` belongs to ``household_id``.
+
+    Memberships are only ever added, so a cached hit is trusted; a miss is
+    re-read from the database before denying, in case the user joined
+    through another worker since the set was cached.
+    """
+    try:
+        household_id = int(household_id)
+    except (TypeError, ValueError):
+        return False
+
+    # A cache miss loads the set fresh, so it is only read once
+    household_ids = cached_household_ids(user_id)
+    if household_ids is not None and household_id in household_ids:
+        return True
+    return household_id in load_household_ids(user_id)
+
+
+def invalidate_memberships(*user_ids):
+    """Forget the cached households of ``user_ids`` after their membership changed."""
+    cache = get_membership_cache(current_app.config)
+    if cache is None:
+        return
+
+    for user_id in user_ids:
+        cache.pop(user_id)
+
+
+def not_a_member():
+    return jsonify({"error": "Not a member of the specified household"}), 403
+
+
+def requires_household_member(f):
+    """Reject requests whose ``household_id`` query arg names another household.
+
+    Goes below @requires_auth, which sets ``g.internal_user_id``. Requests
+    without a household_id pass straight through.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        household_id = request.args.get('household_id')
+        user_id = g.get('internal_user_id')
+        if household_id and user_id and not is_household_member(user_id, household_id):
+            return not_a_member()
+        return f(*args, **kwargs)
+    return decorated
@@ -0,0 +1,89 @@
+# myapp/migrations.py
+import os
+import re
+from flask import current_app
+from back_end.database import get_db_cursor, execute_script
+
+# Files are named NNNN_description.sql and applied in version order
+MIGRATION_FILE_RE = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+
+class MigrationError(Exception):
+    """Raised when the migration history or files are inconsistent."""
+
+
+def get_migrations_dir():
+    return os.path.join(current_app.root_path, 'schema', 'migrations')
+
+
+def discover_migrations():
+    """Return [(version, name, path)] for every migration file, in order."""
+    migrations_dir = get_migrations_dir()
+    migrations = {}
+
+    for filename in os.listdir(migrations_dir):
+        match = MIGRATION_FILE_RE.match(filename)
+        if not match:
+            continue
+
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(f"Duplicate migration version {version:04d}: {filename}")
+        migrations[version] = (version, match.group(2), os.path.join(migrations_dir, filename))
+
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def ensure_migrations_table():
+    """Create the table recording applied migrations."""
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS `schema_migrations` (
+              `version` INT NOT NULL,
+              `name` VARCHAR(255) NOT NULL,
+              `applied_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+              PRIMARY KEY (`version`)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+            """
+        )
+
+
+def get_applied_versions():
+    """Return the set of migration versions already applied."""
+    with get_db_cursor() as cursor:
+        cursor.execute("SELECT version FROM schema_migrations")
+        return {row['version'] for row in cursor.fetchall()}
+
+
+def get_pending_migrations():
+    ensure_migrations_table()
+    applied = get_applied_versions()
+    return [migration for migration in discover_migrations() if migration[0] not in applied]
+
+
+def migrate(target=None, echo=None):
+    """Apply pending migrations up to and including ``target``.
+
+    MySQL commits DDL implicitly, so each migration is recorded right after
+    it runs; a failure leaves earlier migrations applied and the failing one
+    pending.
+    """
+    applied = []
+
+    for version, name, path in get_pending_migrations():
+        if target is not None and version > target:
+            break
+
+        if echo:
+            echo(f"Applying {version:04d}_{name}...")
+        execute_script(path)
+
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                (version, name)
+            )
+        applied.append((version, name))
+
+    return applied
@@ -0,0 +1,193 @@
+# myapp/pool.py
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+class ConnectionPool:
+    """Thread-safe, bounded pool of DB-API connections.
+
+    ``factory`` is any zero-argument callable returning a new connection, so
+    the pool can be driven by ``pymysql.connect`` or by a fake in tests. At
+    most ``size`` connections are open at once; connections older than
+    ``recycle`` seconds are replaced on checkout, and idle ones are pinged
+    before being handed out when ``ping`` is set.
+    """
+
+    def __init__(self, factory, size=5, recycle=3600, timeout=5, ping=True):
+        self._factory = factory
+        self.size = size
+        self.recycle = recycle
+        self.timeout = timeout
+        self.ping = ping
+        self.pid = os.getpid()
+
+        self._idle = deque()  # (connection, created_at), most recent last
+        self._created_at = {}  # id(connection) -> created_at for checked-out ones
+        self._open = 0
+        self._cond = threading.Condition()
+
+        # Metrics
+        self.in_use = 0
+        self.checkouts = 0
+        self.created = 0
+        self.recycled = 0
+        self.ping_failures = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def acquire(self, timeout=None):
+        """Check out a connection, waiting up to ``timeout`` seconds.
+
+        ``timeout`` defaults to the pool's; 0 fails at once when none is free.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    connection, created_at = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    connection, created_at = None, None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        f"No database connection available after {timeout}s "
+                        f"({self.in_use}/{self.size} in use)"
+                    )
+                self._cond.wait(remaining)
+
+            self.in_use += 1
+
+        try:
+            connection, created_at = self._prepare(connection, created_at)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self.in_use -= 1
+                self._cond.notify()
+            raise
+
+        waited = time.monotonic() - started
+        with self._cond:
+            self._created_at[id(connection)] = created_at
+            self.checkouts += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+
+        return connection
+
+    def release(self, connection):
+        """Return a connection to the pool, ending any open transaction.
+
+        Connections this pool did not check out (released twice, or from
+        another pool) are ignored, so the counters stay accurate.
+        """
+        created_at = self._created_at.pop(id(connection), None)
+        if created_at is None:
+            logger.warning("Ignoring release of a connection this pool did not check out")
+            return
+
+        keep = True
+        try:
+            connection.rollback()
+        except Exception as e:
+            logger.warning("Discarding connection that failed to roll back: %s", e)
+            keep = False
+
+        if not keep:
+            self._close(connection)
+
+        with self._cond:
+            self.in_use -= 1
+            if keep:
+                self._idle.append((connection, created_at))
+            else:
+                self._open -= 1
+            self._cond.notify()
+
+    def discard(self, connection):
+        """Close a checked-out connection instead of returning it, e.g. once it broke."""
+        if self._created_at.pop(id(connection), None) is None:
+            logger.warning("Ignoring discard of a connection this pool did not check out")
+            return
+
+        self._close(connection)
+        with self._cond:
+            self.in_use -= 1
+            self._open -= 1
+            self._cond.notify()
+
+    def _prepare(self, connection, created_at):
+        """Open, recycle or ping a connection that was just reserved."""
+        if connection is not None:
+            if time.monotonic() - created_at >= self.recycle:
+                self.recycled += 1
+                self._close(connection)
+                connection = None
+            elif self.ping:
+                try:
+                    connection.ping(reconnect=False)
+                except Exception as e:
+                    self.ping_failures += 1
+                    logger.info("Replacing dead pooled connection: %s", e)
+                    self._close(connection)
+                    connection = None
+
+        if connection is None:
+            connection = self._factory()
+            created_at = time.monotonic()
+            self.created += 1
+
+        return connection, created_at
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        """Close every idle connection."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for connection, _ in idle:
+            self._close(connection)
+
+    def metrics(self):
+        """Current pool usage and wait-time counters."""
+        with self._cond:
+            return {
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self.in_use,
+                'checkouts': self.checkouts,
+                'created': self.created,
+                'recycled': self.recycled,
+                'ping_failures': self.ping_failures,
+                'timeouts': self.timeouts,
+                'wait_time_total': self.wait_time_total,
+                'wait_time_max': self.wait_time_max,
+                'wait_time_avg': self.wait_time_total / self.checkouts if self.checkouts else 0.0,
+            }
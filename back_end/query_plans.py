@@ -0,0 +1,207 @@
+# myapp/query_plans.py
+from back_end.database import get_db_cursor
+
+# Hot queries whose plans are checked by `flask check-indexes`. Each entry
+# mirrors a query built by a route, with %(user_id)s / %(household_id)s /
+# %(start_date)s placeholders filled from the command's options.
+HOT_QUERIES = []
+
+
+def register_hot_query(name, sql, table, index, allow_filesort=False):
+    """Register a query that must use ``index`` when reading ``table``.
+
+    ``table`` is the table name or alias as it appears in EXPLAIN output.
+    Unless ``allow_filesort`` is set, the plan must also avoid a filesort.
+    """
+    HOT_QUERIES.append({
+        'name': name,
+        'sql': sql,
+        'table': table,
+        'index': index,
+        'allow_filesort': allow_filesort,
+    })
+
+
+register_hot_query(
+    'transactions_by_user',
+    """
+    SELECT t.id, t.user_id, t.amount, t.date, t.description,
+           t.category, t.household_id, t.created_at, u.username as user_name
+    FROM transactions t
+    JOIN users u ON t.user_id = u.id
+    WHERE t.user_id = %(user_id)s AND t.date >= %(start_date)s
+    ORDER BY t.date DESC, t.created_at DESC, t.id DESC
+    LIMIT 100
+    """,
+    table='t',
+    index='idx_transactions_user_date',
+)
+
+register_hot_query(
+    'transactions_by_household',
+    """
+    SELECT t.id, t.user_id, t.amount, t.date, t.description,
+           t.category, t.household_id, t.created_at, u.username as user_name
+    FROM transactions t
+    JOIN users u ON t.user_id = u.id
+    WHERE t.household_id = %(household_id)s AND t.date >= %(start_date)s
+    ORDER BY t.date DESC, t.created_at DESC, t.id DESC
+    LIMIT 100
+    """,
+    table='t',
+    index='idx_transactions_household_date',
+)
+
+register_hot_query(
+    'archive_by_user',
+    """
+    SELECT t.id, t.user_id, t.amount, t.date, t.description,
+           t.category, t.household_id, t.created_at
+    FROM transactions_archive t
+    WHERE t.user_id = %(user_id)s AND t.date >= %(start_date)s
+    ORDER BY t.date DESC, t.created_at DESC, t.id DESC
+    LIMIT 100
+    """,
+    table='t',
+    index='idx_transactions_archive_user_date',
+)
+
+register_hot_query(
+    'archive_by_household',
+    """
+    SELECT t.id, t.user_id, t.amount, t.date, t.description,
+           t.category, t.household_id, t.created_at
+    FROM transactions_archive t
+    WHERE t.household_id = %(household_id)s AND t.date >= %(start_date)s
+    ORDER BY t.date DESC, t.created_at DESC, t.id DESC
+    LIMIT 100
+    """,
+    table='t',
+    index='idx_transactions_archive_household_date',
+)
+
+register_hot_query(
+    'changes_by_user',
+    """
+    SELECT t.id, t.updated_at
+    FROM transactions t
+    WHERE (t.updated_at > %(start_date)s OR (t.updated_at = %(start_date)s AND t.id > 0))
+      AND t.user_id = %(user_id)s
+    ORDER BY t.updated_at ASC, t.id ASC
+    LIMIT 501
+    """,
+    table='t',
+    index='idx_transactions_user_updated',
+)
+
+register_hot_query(
+    'changes_by_household',
+    """
+    SELECT t.id, t.updated_at
+    FROM transactions t
+    WHERE (t.updated_at > %(start_date)s OR (t.updated_at = %(start_date)s AND t.id > 0))
+      AND t.household_id = %(household_id)s
+    ORDER BY t.updated_at ASC, t.id ASC
+    LIMIT 501
+    """,
+    table='t',
+    index='idx_transactions_household_updated',
+)
+
+register_hot_query(
+    'summary_by_user',
+    """
+    SELECT DATE_FORMAT(r.day, '%%Y-%%m') as period, SUM(r.total_amount) as total_amount
+    FROM transaction_daily_rollups r
+    WHERE r.owner_type = 'user' AND r.owner_id = %(user_id)s AND r.day >= %(start_date)s
+    GROUP BY period
+    """,
+    table='r',
+    index='PRIMARY',
+    allow_filesort=True,
+)
+
+register_hot_query(
+    'summary_by_household',
+    """
+    SELECT DATE_FORMAT(r.day, '%%Y-%%m') as period, SUM(r.total_amount) as total_amount
+    FROM transaction_daily_rollups r
+    WHERE r.owner_type = 'household' AND r.owner_id = %(household_id)s AND r.day >= %(start_date)s
+    GROUP BY period
+    """,
+    table='r',
+    index='PRIMARY',
+    allow_filesort=True,
+)
+
+register_hot_query(
+    'categories_by_user',
+    """
+    SELECT DISTINCT category FROM transactions
+    WHERE category IS NOT NULL AND (user_id = %(user_id)s)
+    ORDER BY category ASC
+    """,
+    table='transactions',
+    index='idx_transactions_user_category',
+)
+
+register_hot_query(
+    'categories_by_household',
+    """
+    SELECT DISTINCT category FROM transactions
+    WHERE category IS NOT NULL AND (household_id = %(household_id)s)
+    ORDER BY category ASC
+    """,
+    table='transactions',
+    index='idx_transactions_household_category',
+)
+
+register_hot_query(
+    'search_by_user',
+    """
+    SELECT t.id, MATCH (t.description) AGAINST (%(search)s IN BOOLEAN MODE) as score
+    FROM transactions t
+    WHERE MATCH (t.description) AGAINST (%(search)s IN BOOLEAN MODE) AND t.user_id = %(user_id)s
+    ORDER BY score DESC, t.date DESC, t.created_at DESC, t.id DESC
+    LIMIT 51
+    """,
+    table='t',
+    index='ft_transactions_description',
+    allow_filesort=True,
+)
+
+
+def check_hot_queries(params):
+    """EXPLAIN every registered hot query.
+
+    Returns a list of result dicts with ``ok`` set to False for queries that
+    no longer use their intended index (or started filesorting).
+    """
+    results = []
+
+    with get_db_cursor() as cursor:
+        for query in HOT_QUERIES:
+            cursor.execute("EXPLAIN " + query['sql'], params)
+            plan = cursor.fetchall()
+
+            row = next((r for r in plan if r['table'] == query['table']), None)
+            used_index = row['key'] if row else None
+            extra = (row.get('Extra') or '') if row else ''
+
+            problems = []
+            if used_index != query['index']:
+                problems.append(f"uses {used_index or 'no index'}, expected {query['index']}")
+            if not query['allow_filesort'] and 'Using filesort' in extra:
+                problems.append("needs a filesort")
+
+            results.append({
+                'name': query['name'],
+                'index': used_index,
+                'rows': row['rows'] if row else None,
+                'partitions': row.get('partitions') if row else None,
+                'extra': extra,
+                'ok': not problems,
+                'problems': problems,
+            })
+
+    return results
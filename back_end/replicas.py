@@ -0,0 +1,101 @@
+# myapp/replicas.py
+import itertools
+import logging
+import os
+import threading
+import time
+
+from back_end.pool import PoolTimeout
+
+logger = logging.getLogger(__name__)
+
+
+def parse_hosts(value, default_port=3306):
+    """Parse 'host[:port],host[:port]' into [(host, port)]."""
+    hosts = []
+    for entry in value.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.partition(':')
+        hosts.append((host, int(port) if port else default_port))
+    return hosts
+
+
+class ReplicaSet:
+    """Read replicas behind one ConnectionPool each, with health tracking.
+
+    Connections are handed out round-robin, skipping replicas whose pool is
+    busy. A replica that fails to give a working connection (or errors
+    mid-query, via ``mark_down``) is skipped for ``cooldown`` seconds; when
+    none is healthy, callers fall back to the primary.
+    """
+
+    def __init__(self, pools, cooldown=30):
+        self.pools = list(pools)
+        self.cooldown = cooldown
+        self.pid = os.getpid()
+        self._down_until = [0.0] * len(self.pools)
+        self._rotation = itertools.count()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.failovers = 0
+
+    def acquire(self):
+        """Check out a replica connection as ``(pool, connection)``.
+
+        Busy replicas are passed over without waiting; only when every
+        healthy replica is busy does this wait, on one of them, for the
+        pool timeout. A full pool is not a failure, so it never marks a
+        replica down. Returns ``(None, None)`` if no replica could serve.
+        """
+        count = len(self.pools)
+        start = next(self._rotation)
+        busy = []
+        for offset in range(count):
+            index = (start + offset) % count
+            if self._down_until[index] > time.monotonic():
+                continue
+
+            pool = self.pools[index]
+            try:
+                return pool, pool.acquire(timeout=0)
+            except PoolTimeout:
+                busy.append(pool)
+            except Exception as e:
+                self.mark_down(pool, e)
+
+        if busy:
+            pool = busy[0]
+            try:
+                return pool, pool.acquire()
+            except PoolTimeout:
+                pass
+            except Exception as e:
+                self.mark_down(pool, e)
+
+        with self._lock:
+            self.failovers += 1
+        return None, None
+
+    def mark_down(self, pool, error=None):
+        """Take ``pool``'s replica out of rotation for ``cooldown`` seconds."""
+        index = self.pools.index(pool)
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.cooldown
+        logger.warning("Replica %d marked down for %ss: %s", index, self.cooldown, error)
+
+    def close_all(self):
+        for pool in self.pools:
+            pool.close_all()
+
+    def metrics(self):
+        now = time.monotonic()
+        return {
+            'failovers': self.failovers,
+            'replicas': [
+                {**pool.metrics(), 'healthy': self._down_until[index] <= now}
+                for index, pool in enumerate(self.pools)
+            ],
+        }
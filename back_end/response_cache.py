@@ -0,0 +1,179 @@
+# myapp/response_cache.py
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from urllib.parse import urlencode
+from flask import current_app, g, request
+from back_end.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCacheBackend:
+    """In-process LRU backend. Each worker process has its own copy."""
+
+    def __init__(self, maxsize=2048, ttl=300):
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._versions = LRUCache(maxsize=maxsize)
+        # Versions come from one process-wide counter, so a scope whose
+        # version was evicted never gets an old number back
+        self._counter = itertools.count(1)
+        self._counter_lock = threading.Lock()
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, value):
+        self._entries.set(key, value)
+
+    def get_version(self, scope):
+        """(version, time of the last invalidation or 0) for ``scope``."""
+        entry = self._versions.get(scope)
+        if entry is None:
+            entry = self._new_version(scope, 0)
+        return entry
+
+    def bump_version(self, scope):
+        return self._new_version(scope, time.time())[0]
+
+    def _new_version(self, scope, bumped_at):
+        with self._counter_lock:
+            version = next(self._counter)
+        self._versions.set(scope, (version, bumped_at))
+        return version, bumped_at
+
+
+class RedisCacheBackend:
+    """Shared backend so every worker sees the same entries and versions.
+
+    Needs the optional ``redis`` package.
+    """
+
+    def __init__(self, url, ttl=300, prefix='finance:rc:'):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self._redis.get(self.prefix + 'e:' + key)
+        if value is None:
+            return None
+        etag, _, body = value.partition(b'\n')
+        return body, etag.decode('ascii')
+
+    def set(self, key, value):
+        body, etag = value
+        self._redis.set(self.prefix + 'e:' + key, etag.encode('ascii') + b'\n' + body, ex=self.ttl)
+
+    def get_version(self, scope):
+        """(version, time of the last invalidation or 0) for ``scope``."""
+        version, bumped_at = self._redis.mget(self.prefix + 'v:' + scope, self.prefix + 't:' + scope)
+        return int(version or 0), float(bumped_at or 0)
+
+    def bump_version(self, scope):
+        pipeline = self._redis.pipeline()
+        pipeline.incr(self.prefix + 'v:' + scope)
+        pipeline.set(self.prefix + 't:' + scope, time.time())
+        return pipeline.execute()[0]
+
+
+def create_backend(config):
+    """Build the backend named by RESPONSE_CACHE_BACKEND, or None if disabled."""
+    backend = config['RESPONSE_CACHE_BACKEND']
+
+    if backend == 'local':
+        return LocalCacheBackend(
+            maxsize=config['RESPONSE_CACHE_SIZE'],
+            ttl=config['RESPONSE_CACHE_TTL'],
+        )
+    if backend == 'redis':
+        return RedisCacheBackend(
+            config['RESPONSE_CACHE_REDIS_URL'],
+            ttl=config['RESPONSE_CACHE_TTL'],
+        )
+    if backend in ('none', ''):
+        return None
+
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {backend}")
+
+
+def init_app(app):
+    """Attach the response cache backend to the app."""
+    app.extensions['response_cache'] = create_backend(app.config)
+
+
+def owner_scope(user_id, household_id=None):
+    """Cache scope for data owned by a household, or by a user otherwise."""
+    if household_id:
+        return f'household:{household_id}'
+    return f'user:{user_id}'
+
+
+def transaction_scopes(user_id, household_id=None):
+    """Scopes whose cached data includes a transaction by ``user_id``."""
+    scopes = [owner_scope(user_id)]
+    if household_id:
+        scopes.append(owner_scope(user_id, household_id))
+    return scopes
+
+
+def invalidate_scopes(*scopes):
+    """Make every cached response for ``scopes`` stale by bumping their versions."""
+    backend = current_app.extensions.get('response_cache')
+    if backend is None:
+        return
+
+    for scope in scopes:
+        try:
+            backend.bump_version(scope)
+        except Exception as e:
+            logger.error("Failed to invalidate response cache scope %s: %s", scope, e)
+
+
+def cached_json_response(endpoint, scope, compute):
+    """Return ``compute()`` as a JSON response, cached per scope and query.
+
+    The cache key combines the endpoint, the owner scope, that scope's
+    current version and the sorted query parameters, so bumping the version
+    with invalidate_scopes() retires every entry for the scope at once.
+    Responses carry an ETag and honor If-None-Match with a 304.
+
+    Bodies computed on a replica within READ_YOUR_WRITES_WINDOW of the
+    scope's last invalidation are not stored: the replica may not have the
+    write yet, and the writer, whose reads are pinned to the primary, would
+    get that stale entry back from the cache.
+    """
+    backend = current_app.extensions.get('response_cache')
+    entry = None
+
+    if backend is not None:
+        try:
+            version, bumped_at = backend.get_version(scope)
+            recently_written = time.time() - bumped_at < current_app.config['READ_YOUR_WRITES_WINDOW']
+            query = urlencode(sorted(request.args.items(multi=True)))
+            key = f'{endpoint}|{scope}|v{version}|{query}'
+            entry = backend.get(key)
+        except Exception as e:
+            # A broken shared cache must not take the endpoint down
+            logger.error("Response cache lookup failed: %s", e)
+            backend = None
+
+    if entry is None:
+        body = current_app.json.dumps(compute()).encode('utf-8')
+        entry = (body, hashlib.sha1(body).hexdigest())
+        if backend is not None and not (recently_written and 'db_replica' in g):
+            try:
+                backend.set(key, entry)
+            except Exception as e:
+                logger.error("Response cache store failed: %s", e)
+
+    body, etag = entry
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = current_app.config['RESPONSE_CACHE_CONTROL']
+    response.vary.add('Authorization')
+    return response.make_conditional(request)
@@ -0,0 +1,151 @@
+# myapp/rollups.py
+from back_end.archive import ALL_TRANSACTIONS_SQL
+from back_end.database import get_db_cursor
+
+# Period expressions over the rollup day, matching the raw-table summary
+PERIOD_EXPRESSIONS = {
+    'daily': "r.day",
+    'weekly': "YEARWEEK(r.day)",
+    'monthly': "DATE_FORMAT(r.day, '%%Y-%%m')",
+    'yearly': "YEAR(r.day)",
+}
+
+UPSERT_ROLLUP_SQL = """
+    INSERT INTO transaction_daily_rollups
+    (owner_type, owner_id, day, category, total_amount, transaction_count,
+     min_amount, max_amount)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        total_amount = total_amount + VALUES(total_amount),
+        transaction_count = transaction_count + VALUES(transaction_count),
+        min_amount = LEAST(min_amount, VALUES(min_amount)),
+        max_amount = GREATEST(max_amount, VALUES(max_amount))
+"""
+
+# Raw aggregates in rollup shape, used by the backfill and the checker.
+# Archived transactions count too.
+RAW_AGGREGATES_SQL = f"""
+    SELECT 'user' AS owner_type, t.user_id AS owner_id, t.date AS day,
+           COALESCE(t.category, '') AS category,
+           SUM(t.amount) AS total_amount, COUNT(*) AS transaction_count,
+           MIN(t.amount) AS min_amount, MAX(t.amount) AS max_amount
+    FROM {ALL_TRANSACTIONS_SQL} t
+    GROUP BY t.user_id, t.date, COALESCE(t.category, '')
+    UNION ALL
+    SELECT 'household', t.household_id, t.date,
+           COALESCE(t.category, ''),
+           SUM(t.amount), COUNT(*), MIN(t.amount), MAX(t.amount)
+    FROM {ALL_TRANSACTIONS_SQL} t
+    WHERE t.household_id IS NOT NULL
+    GROUP BY t.household_id, t.date, COALESCE(t.category, '')
+"""
+
+
+def rollup_keys(transaction):
+    """Return the (owner_type, owner_id, day, category) rows a transaction counts towards."""
+    category = transaction.get('category') or ''
+    keys = [('user', transaction['user_id'], transaction['date'], category)]
+    if transaction.get('household_id'):
+        keys.append(('household', transaction['household_id'], transaction['date'], category))
+    return keys
+
+
+def apply_transactions(cursor, transactions):
+    """Add transactions to the daily rollups using the caller's cursor.
+
+    Call this inside the same DB transaction as the inserts so rollups and
+    raw rows commit (or roll back) together. ``date`` must be a date or an
+    ISO date string and ``amount`` a Decimal.
+    """
+    aggregates = {}
+    for transaction in transactions:
+        amount = transaction['amount']
+        for key in rollup_keys(transaction):
+            total, count, low, high = aggregates.get(key, (0, 0, amount, amount))
+            aggregates[key] = (total + amount, count + 1, min(low, amount), max(high, amount))
+
+    # Sorted keys give concurrent writers a consistent lock order
+    rows = [
+        (*key, total, count, low, high)
+        for key, (total, count, low, high) in sorted(aggregates.items(), key=lambda item: str(item[0]))
+    ]
+    if rows:
+        cursor.executemany(UPSERT_ROLLUP_SQL, rows)
+
+
+def summary_query(owner_type, owner_id, period, start_date=None, end_date=None):
+    """Build the per-period summary query over the daily rollups."""
+    query = f"""
+        SELECT {PERIOD_EXPRESSIONS[period]} as period,
+        SUM(r.total_amount) as total_amount,
+        CAST(SUM(r.transaction_count) AS SIGNED) as transaction_count,
+        MIN(r.min_amount) as min_amount,
+        MAX(r.max_amount) as max_amount,
+        SUM(r.total_amount) / SUM(r.transaction_count) as avg_amount
+        FROM transaction_daily_rollups r
+        WHERE r.owner_type = %s AND r.owner_id = %s
+    """
+    params = [owner_type, owner_id]
+
+    if start_date:
+        query += " AND r.day >= %s"
+        params.append(start_date)
+
+    if end_date:
+        query += " AND r.day <= %s"
+        params.append(end_date)
+
+    query += " GROUP BY period ORDER BY period ASC"
+    return query, params
+
+
+def backfill():
+    """Rebuild every rollup row from the transactions table.
+
+    Runs as one DB transaction, so readers keep seeing the old rollups until
+    it commits. Returns the number of rollup rows written.
+    """
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute("DELETE FROM transaction_daily_rollups")
+        cursor.execute(
+            f"""
+            INSERT INTO transaction_daily_rollups
+            (owner_type, owner_id, day, category, total_amount, transaction_count,
+             min_amount, max_amount)
+            {RAW_AGGREGATES_SQL}
+            """
+        )
+        return cursor.rowcount
+
+
+def check_consistency(limit=100):
+    """Compare the rollups with aggregates over the raw transactions.
+
+    Returns up to ``limit`` mismatching rows, each with the raw and rollup
+    values (None when a side has no row).
+    """
+    columns = ('total_amount', 'transaction_count', 'min_amount', 'max_amount')
+    mismatch = " OR ".join(f"NOT (raw.{c} <=> r.{c})" for c in columns)
+    select = ", ".join(f"raw.{c} AS raw_{c}, r.{c} AS rollup_{c}" for c in columns)
+
+    with get_db_cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT raw.owner_type, raw.owner_id, raw.day, raw.category, {select}
+            FROM ({RAW_AGGREGATES_SQL}) raw
+            LEFT JOIN transaction_daily_rollups r
+              ON r.owner_type = raw.owner_type AND r.owner_id = raw.owner_id
+             AND r.day = raw.day AND r.category = raw.category
+            WHERE {mismatch}
+            UNION ALL
+            SELECT r.owner_type, r.owner_id, r.day, r.category, {select}
+            FROM transaction_daily_rollups r
+            LEFT JOIN ({RAW_AGGREGATES_SQL}) raw
+              ON raw.owner_type = r.owner_type AND raw.owner_id = r.owner_id
+             AND raw.day = r.day AND raw.category = r.category
+            WHERE raw.owner_id IS NULL
+            LIMIT %s
+            """,
+            (limit,)
+        )
+        return cursor.fetchall()
@@ -1,7 +1,7 @@
 # myapp/routes/auth.py
 from flask import Blueprint, request, jsonify, g
 from back_end.database import get_db_cursor
-from back_end.auth import requires_auth
+from back_end.auth import requires_auth, cache_user_id
 
 bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -25,14 +25,9 @@ def register():
     
     auth0_id = g.user_id
     
-    # Check if user already exists
-    with get_db_cursor() as cursor:
-        cursor.execute(
-            "SELECT id FROM users WHERE auth0_id = %s",
-            (auth0_id,)
-        )
-        if cursor.fetchone():
-            return jsonify({"error": "User already registered"}), 409
+    # requires_auth already resolved any existing user
+    if g.internal_user_id:
+        return jsonify({"error": "User already registered"}), 409
     
     try:
         with get_db_cursor(commit=True) as cursor:
@@ -47,8 +42,10 @@ def register():
                 (user_id,)
             )
             user = cursor.fetchone()
-            
-            return jsonify(user), 201
+        
+        cache_user_id(auth0_id, user_id)
+        g.internal_user_id = user_id
+        return jsonify(user), 201
             
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -57,12 +54,13 @@ def register():
 @requires_auth
 def me():
     """Get current user profile."""
-    auth0_id = g.user_id
+    if not g.internal_user_id:
+        return jsonify({"error": "User not found"}), 404
     
     with get_db_cursor() as cursor:
         cursor.execute(
-            "SELECT id, username, email, created_at FROM users WHERE auth0_id = %s",
-            (auth0_id,)
+            "SELECT id, username, email, created_at FROM users WHERE id = %s",
+            (g.internal_user_id,)
         )
         user = cursor.fetchone()
         
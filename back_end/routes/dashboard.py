@@ -0,0 +1,76 @@
+# myapp/routes/dashboard.py
+from flask import Blueprint, current_app, request, jsonify, g
+from back_end.database import get_db_cursor
+from back_end.archive import transactions_source
+from back_end.auth import requires_auth
+from back_end.columnar import SUMMARY_COLUMNS, format_rows, get_response_format
+from back_end.routes.households import HOUSEHOLD_LIST_QUERY
+from back_end.routes.transactions import SUMMARY_PERIODS, build_summary_query
+from back_end.transactions import TRANSACTION_COLUMNS, TRANSACTION_LIST_QUERY, TRANSACTION_ORDER
+
+bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
+
+@bp.route('', methods=['GET'])
+@requires_auth
+def get_dashboard():
+    """Get the summary, recent transactions and households in one request.
+
+    Takes the period/start_date/end_date args of /api/transactions/summary,
+    a limit for the recent transactions and format=columnar. The three
+    queries are sent to MySQL as one multi-statement batch on the request's
+    connection, so the whole dashboard costs one token check and one
+    database round trip.
+    """
+    user_id = g.internal_user_id
+    if not user_id:
+        return jsonify({"error": "User not registered"}), 403
+
+    period = request.args.get('period', 'monthly')
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+
+    if period not in SUMMARY_PERIODS:
+        return jsonify({"error": f"Invalid period. Use: {', '.join(SUMMARY_PERIODS)}"}), 400
+
+    try:
+        limit = int(request.args.get('limit', current_app.config['DASHBOARD_RECENT_LIMIT']))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+    limit = min(limit, current_app.config['TRANSACTIONS_MAX_PAGE_SIZE'])
+
+    try:
+        response_format = get_response_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    summary_sql, summary_params = build_summary_query(user_id, None, period, start_date, end_date)
+    source, recent_params = transactions_source(["t.user_id = %s"], [user_id],
+                                                order_by=TRANSACTION_ORDER, limit=limit)
+    recent_sql = TRANSACTION_LIST_QUERY.format(source=source) + f" ORDER BY {TRANSACTION_ORDER} LIMIT %s"
+
+    # A connection runs one statement at a time, so batch the independent
+    # queries into a single round trip instead
+    query = ";\n".join([summary_sql, recent_sql, HOUSEHOLD_LIST_QUERY])
+    params = [*summary_params, *recent_params, limit, user_id]
+
+    try:
+        with get_db_cursor() as cursor:
+            cursor.execute(query, params)
+            summary = cursor.fetchall()
+            cursor.nextset()
+            transactions = cursor.fetchall()
+            cursor.nextset()
+            households = cursor.fetchall()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify({
+        "summary": {
+            "period": period,
+            "summary": format_rows(summary, SUMMARY_COLUMNS, response_format)
+        },
+        "transactions": format_rows(transactions, TRANSACTION_COLUMNS, response_format),
+        "households": households
+    }), 200
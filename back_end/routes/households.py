@@ -4,10 +4,22 @@ import string
 from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify, g
 from back_end.database import get_db_cursor
-from back_end.auth import requires_auth, get_user_id_from_auth0_id
+from back_end.auth import requires_auth
+from back_end.membership import invalidate_memberships, is_household_member
 
 bp = Blueprint('households', __name__, url_prefix='/api/households')
 
+# Households the user belongs to, newest first
+HOUSEHOLD_LIST_QUERY = """
+    SELECT h.id, h.name, h.creator_id, h.created_at,
+           u.username as creator_name
+    FROM households h
+    JOIN users u ON h.creator_id = u.id
+    JOIN household_members hm ON h.id = hm.household_id
+    WHERE hm.user_id = %s
+    ORDER BY h.created_at DESC
+"""
+
 def generate_invite_code(length=8):
     """Generate a random invite code."""
     chars = string.ascii_uppercase + string.digits
@@ -17,24 +29,13 @@ def generate_invite_code(length=8):
 @requires_auth
 def get_households():
     """Get all households the user is a member of."""
-    user_id = get_user_id_from_auth0_id()
+    user_id = g.internal_user_id
     if not user_id:
         return jsonify({"error": "User not registered"}), 403
     
     try:
         with get_db_cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT h.id, h.name, h.creator_id, h.created_at,
-                       u.username as creator_name
-                FROM households h
-                JOIN users u ON h.creator_id = u.id
-                JOIN household_members hm ON h.id = hm.household_id
-                WHERE hm.user_id = %s
-                ORDER BY h.created_at DESC
-                """,
-                (user_id,)
-            )
+            cursor.execute(HOUSEHOLD_LIST_QUERY, (user_id,))
             households = cursor.fetchall()
             
             return jsonify(households), 200
@@ -51,7 +52,7 @@ def create_household():
     if not data or 'name' not in data:
         return jsonify({"error": "Missing required field: name"}), 400
     
-    user_id = get_user_id_from_auth0_id()
+    user_id = g.internal_user_id
     if not user_id:
         return jsonify({"error": "User not registered"}), 403
     
@@ -82,8 +83,10 @@ def create_household():
                 (household_id,)
             )
             household = cursor.fetchone()
-            
-            return jsonify(household), 201
+        
+        invalidate_memberships(user_id)
+        
+        return jsonify(household), 201
             
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -95,7 +98,7 @@ def create_invite(household_id):
     data = request.get_json() or {}
     expires_in_days = data.get('expires_in_days', 7)
     
-    user_id = get_user_id_from_auth0_id()
+    user_id = g.internal_user_id
     if not user_id:
         return jsonify({"error": "User not registered"}), 403
     
@@ -139,7 +142,7 @@ def create_invite(household_id):
 @requires_auth
 def join_household(invite_code):
     """Join a household using an invite code."""
-    user_id = get_user_id_from_auth0_id()
+    user_id = g.internal_user_id
     if not user_id:
         return jsonify({"error": "User not registered"}), 403
     
@@ -159,14 +162,10 @@ def join_household(invite_code):
         
         if invite['expires_at'] and invite['expires_at'] < datetime.now():
             return jsonify({"error": "Invite code has expired"}), 400
-        
-        # Check if user is already a member
-        cursor.execute(
-            "SELECT 1 FROM household_members WHERE household_id = %s AND user_id = %s",
-            (invite['household_id'], user_id)
-        )
-        if cursor.fetchone():
-            return jsonify({"error": "You are already a member of this household"}), 409
+    
+    # Check if user is already a member
+    if is_household_member(user_id, invite['household_id']):
+        return jsonify({"error": "You are already a member of this household"}), 409
     
     try:
         with get_db_cursor(commit=True) as cursor:
@@ -187,11 +186,13 @@ def join_household(invite_code):
                 (invite['household_id'],)
             )
             household = cursor.fetchone()
-            
-            return jsonify({
-                "message": f"Successfully joined household '{household['name']}'",
-                "household": household
-            }), 200
+        
+        invalidate_memberships(user_id)
+        
+        return jsonify({
+            "message": f"Successfully joined household '{household['name']}'",
+            "household": household
+        }), 200
             
     except Exception as e:
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,69 @@
+# myapp/routes/jobs.py
+import os
+from flask import Blueprint, jsonify, g, send_file
+from back_end.auth import requires_auth
+from back_end.jobs import get_job, list_jobs
+
+bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+
+@bp.route('', methods=['GET'])
+@requires_auth
+def get_jobs():
+    """Get the user's most recent background jobs, newest first."""
+    user_id = g.internal_user_id
+    if not user_id:
+        return jsonify({"error": "User not registered"}), 403
+    
+    try:
+        return jsonify(list_jobs(user_id)), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/<int:job_id>', methods=['GET'])
+@requires_auth
+def get_job_status(job_id):
+    """Get a job's status, progress and, once finished, its result or error."""
+    user_id = g.internal_user_id
+    if not user_id:
+        return jsonify({"error": "User not registered"}), 403
+    
+    try:
+        job = get_job(job_id, user_id)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    
+    response = jsonify(job)
+    response.headers['Cache-Control'] = 'no-store'
+    return response, 200
+
+@bp.route('/<int:job_id>/download', methods=['GET'])
+@requires_auth
+def download_job_result(job_id):
+    """Download the gzipped file written by a finished export job."""
+    from back_end.tasks import export_path
+    
+    user_id = g.internal_user_id
+    if not user_id:
+        return jsonify({"error": "User not registered"}), 403
+    
+    job = get_job(job_id, user_id)
+    if job is None or job['kind'] != 'export_transactions':
+        return jsonify({"error": "Job not found"}), 404
+    if job['status'] != 'succeeded':
+        return jsonify({"error": f"Job is {job['status']}"}), 409
+    
+    export_format = job['result']['format']
+    path = export_path(job_id, export_format)
+    if not os.path.exists(path):
+        return jsonify({"error": "Export file is no longer available"}), 410
+    
+    return send_file(
+        path,
+        mimetype='application/gzip',
+        as_attachment=True,
+        download_name=f'transactions.{export_format}.gz',
+        max_age=0,
+    )
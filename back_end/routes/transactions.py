@@ -1,10 +1,223 @@
 # myapp/routes/transactions.py
-from flask import Blueprint, request, jsonify
-from back_end.database import get_db_cursor
-from back_end.auth import requires_auth, get_user_id_from_auth0_id
+import base64
+import binascii
+import json
+import re
+import zlib
+from datetime import date, datetime
+from flask import Blueprint, Response, current_app, request, jsonify, g, stream_with_context
+from back_end.database import get_db_cursor, get_db_stream_cursor
+from back_end.analytics import compute_statistics, load_columns
+from back_end.archive import transactions_source
+from back_end.auth import requires_auth
+from back_end.columnar import SUMMARY_COLUMNS, format_rows, get_response_format
+from back_end.importers import import_transactions, parse_csv, parse_ofx
+from back_end.jobs import enqueue_job, job_accepted
+from back_end.membership import is_household_member, not_a_member, requires_household_member
+from back_end.response_cache import (
+    cached_json_response, invalidate_scopes, owner_scope, transaction_scopes
+)
+from back_end.rollups import apply_transactions, summary_query
+from back_end.sync import CHANGES_ORDER, CHANGES_QUERY, SyncToken, next_watermark
+from back_end.transactions import (
+    EXPORT_FORMATS, TRANSACTION_COLUMNS, TRANSACTION_LIST_QUERY, TRANSACTION_ORDER, transaction_filters
+)
 
 bp = Blueprint('transactions', __name__, url_prefix='/api/transactions')
 
+# Ranked full-text matches; conditions start with the MATCH predicate.
+# Archived transactions are not searched: a partitioned table cannot have
+# a FULLTEXT index.
+SEARCH_QUERY = """
+    SELECT t.id, t.user_id, t.amount, t.date, t.description, 
+           t.category, t.household_id, t.created_at,
+           u.username as user_name,
+           MATCH (t.description) AGAINST (%s IN BOOLEAN MODE) as score
+    FROM transactions t
+    JOIN users u ON t.user_id = u.id
+    WHERE 
+"""
+
+SEARCH_COLUMNS = TRANSACTION_COLUMNS + ['score']
+
+def build_transaction_filters(user_id):
+    """Build WHERE conditions for the household_id/start_date/end_date/category args.
+    
+    Returns (conditions, params, error) where error is a response tuple if
+    the user may not read the requested household.
+    """
+    household_id = request.args.get('household_id')
+    if household_id and not is_household_member(user_id, household_id):
+        return None, None, not_a_member()
+    
+    conditions, params = transaction_filters(
+        user_id,
+        household_id,
+        request.args.get('start_date'),
+        request.args.get('end_date'),
+        request.args.get('category'),
+    )
+    return conditions, params, None
+
+SUMMARY_PERIODS = ['daily', 'weekly', 'monthly', 'yearly']
+
+def build_summary_query(user_id, household_id, period, start_date=None, end_date=None):
+    """Build the per-period summary query for a user or household.
+    
+    Reads the daily rollups when SUMMARY_FROM_ROLLUPS is set, the raw
+    transactions otherwise. Membership must already have been checked.
+    """
+    if current_app.config['SUMMARY_FROM_ROLLUPS']:
+        # Roll the requested period up from the daily rollup rows
+        if household_id:
+            return summary_query('household', household_id, period, start_date, end_date)
+        return summary_query('user', user_id, period, start_date, end_date)
+    
+    # Build period format expression
+    if period == 'daily':
+        period_expr = "DATE(t.date)"
+    elif period == 'weekly':
+        period_expr = "YEARWEEK(t.date)"
+    elif period == 'monthly':
+        period_expr = "DATE_FORMAT(t.date, '%%Y-%%m')"
+    else:  # yearly
+        period_expr = "YEAR(t.date)"
+    
+    query = f"""
+        SELECT {period_expr} as period,
+        SUM(t.amount) as total_amount,
+        COUNT(t.id) as transaction_count,
+        MIN(t.amount) as min_amount,
+        MAX(t.amount) as max_amount,
+        AVG(t.amount) as avg_amount
+        FROM {{source}}
+    """
+    
+    conditions = []
+    params = []
+    
+    if household_id:
+        conditions.append("t.household_id = %s")
+        params.append(household_id)
+    else:
+        conditions.append("t.user_id = %s")
+        params.append(user_id)
+    
+    if start_date:
+        conditions.append("t.date >= %s")
+        params.append(start_date)
+    
+    if end_date:
+        conditions.append("t.date <= %s")
+        params.append(end_date)
+    
+    source, params = transactions_source(conditions, params, start_date)
+    query = query.format(source=source) + " GROUP BY period ORDER BY period ASC"
+    return query, params
+
+def encode_cursor(row):
+    """Encode a row's (date, created_at, id) sort key as an opaque page cursor."""
+    created_at = row['created_at'].isoformat(sep=' ') if row['created_at'] else None
+    key = [row['date'].isoformat(), created_at, row['id']]
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token):
+    """Decode a page cursor back into (date, created_at, id).
+    
+    Raises ValueError if the token was not produced by encode_cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        after_date, after_created_at, after_id = json.loads(raw)
+        return (
+            date.fromisoformat(after_date),
+            datetime.fromisoformat(after_created_at) if after_created_at else None,
+            int(after_id),
+        )
+    except (TypeError, ValueError, binascii.Error) as e:
+        raise ValueError("Invalid cursor") from e
+
+def after_cursor_condition(after_date, after_created_at, after_id):
+    """WHERE condition for rows strictly after a (date, created_at, id) key in list order."""
+    condition = (
+        "(t.date < %s OR (t.date = %s AND "
+        "(t.created_at < %s OR (t.created_at = %s AND t.id < %s))))"
+    )
+    return condition, [after_date, after_date, after_created_at, after_created_at, after_id]
+
+def parse_limit(default=None):
+    """Parse the limit arg, capped at TRANSACTIONS_MAX_PAGE_SIZE.
+    
+    Returns (limit, error) where error is a 400 response tuple.
+    """
+    limit = request.args.get('limit', default)
+    if limit is None:
+        return None, None
+    try:
+        limit = int(limit)
+    except ValueError:
+        return None, (jsonify({"error": "limit must be an integer"}), 400)
+    if limit < 1:
+        return None, (jsonify({"error": "limit must be positive"}), 400)
+    return min(limit, current_app.config['TRANSACTIONS_MAX_PAGE_SIZE']), None
+
+# Words of a search query; \w never matches a BOOLEAN MODE operator
+SEARCH_WORD_RE = re.compile(r'\w+')
+
+def fulltext_terms(q):
+    """Turn free text into a BOOLEAN MODE query requiring every word as a prefix.
+    
+    Words shorter than SEARCH_MIN_WORD_LENGTH (InnoDB's ft_min_token_size)
+    are not in the index and are dropped. Returns '' if nothing is left.
+    """
+    min_length = current_app.config['SEARCH_MIN_WORD_LENGTH']
+    words = [word for word in SEARCH_WORD_RE.findall(q) if len(word) >= min_length]
+    return ' '.join(f'+{word}*' for word in words)
+
+def encode_offset_cursor(offset):
+    """Encode a result offset as an opaque page cursor for ranked results."""
+    return base64.urlsafe_b64encode(json.dumps({'offset': offset}).encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_offset_cursor(token):
+    """Decode a page cursor from encode_offset_cursor; raises ValueError if invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        offset = int(json.loads(raw)['offset'])
+    except (TypeError, KeyError, ValueError, binascii.Error) as e:
+        raise ValueError("Invalid cursor") from e
+    if offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
+
+def stream_json_rows(query, params):
+    """Stream a query's rows as a JSON array without buffering the result set."""
+    batch_size = current_app.config['TRANSACTIONS_STREAM_BATCH_SIZE']
+    
+    def generate():
+        dumps = current_app.json.dumps
+        with get_db_stream_cursor() as cursor:
+            cursor.execute(query, params)
+            yield '['
+            separator = ''
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield separator + ','.join(dumps(row) for row in rows)
+                separator = ','
+            yield ']'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+def gzip_chunks(chunks):
+    """Gzip a stream of text chunks incrementally."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip header
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
 @bp.route('', methods=['POST'])
 @requires_auth
 def create_transaction():
@@ -23,20 +236,14 @@ def create_transaction():
             "missing": missing_fields
         }), 400
     
-    user_id = get_user_id_from_auth0_id()
+    user_id = g.internal_user_id
     if not user_id:
         return jsonify({"error": "User not registered"}), 403
     
     # Check if household_id is valid
     household_id = data.get('household_id')
-    if household_id:
-        with get_db_cursor() as cursor:
-            cursor.execute(
-                "SELECT 1 FROM household_members WHERE household_id = %s AND user_id = %s",
-                (household_id, user_id)
-            )
-            if not cursor.fetchone():
-                return jsonify({"error": "Not a member of the specified household"}), 403
+    if household_id and not is_household_member(user_id, household_id):
+        return not_a_member()
     
     try:
         with get_db_cursor(commit=True) as cursor:
@@ -67,80 +274,375 @@ def create_transaction():
             )
             transaction = cursor.fetchone()
             
-            return jsonify(transaction), 201
+            # Same DB transaction, so the rollups never drift from the raw rows
+            apply_transactions(cursor, [transaction])
+        
+        # Cached summaries and categories for this user and household are now stale
+        invalidate_scopes(*transaction_scopes(user_id, household_id))
+        
+        return jsonify(transaction), 201
             
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@bp.route('/bulk', methods=['POST'])
+@requires_auth
+def bulk_create_transactions():
+    """Import many transactions at once from JSON, CSV or OFX.
+    
+    Accepts a JSON array (or {"transactions": [...]}) or a multipart upload
+    in a "file" field. Uploads may set a default household_id form field.
+    All rows are validated first; if any row is invalid nothing is inserted
+    and the per-row errors are returned. With background=true the import
+    is queued as a job and the response is 202 with the job to poll.
+    """
+    user_id = g.internal_user_id
+    if not user_id:
+        return jsonify({"error": "User not registered"}), 403
+    
+    default_household_id = None
+    upload = request.files.get('file')
+    if upload:
+        file_format = (request.form.get('format') or upload.filename.rsplit('.', 1)[-1]).lower()
+        text = upload.read().decode('utf-8-sig', errors='replace')
+        if file_format == 'csv':
+            rows = parse_csv(text)
+        elif file_format in ('ofx', 'qfx'):
+            rows = parse_ofx(text)
+        else:
+            return jsonify({"error": "Unsupported file format. Use: csv, ofx"}), 400
+        default_household_id = request.form.get('household_id')
+    else:
+        data = request.get_json(silent=True)
+        rows = data.get('transactions') if isinstance(data, dict) else data
+        if not isinstance(rows, list):
+            return jsonify({"error": "Expected a JSON array of transactions or a file upload"}), 400
+    
+    if not rows:
+        return jsonify({"error": "No transactions to import"}), 400
+    
+    max_rows = current_app.config['BULK_IMPORT_MAX_ROWS']
+    if len(rows) > max_rows:
+        return jsonify({"error": f"Too many rows; at most {max_rows} per import"}), 413
+    
+    if request.args.get('background', '').lower() == 'true':
+        # Rows are validated by the worker; poll the job for the outcome
+        job = enqueue_job('import_transactions', user_id, {
+            'rows': rows,
+            'default_household_id': default_household_id,
+        })
+        return job_accepted(job)
+    
+    try:
+        inserted, errors = import_transactions(user_id, rows, default_household_id)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    
+    if errors:
+        return jsonify({"error": "Import contains invalid rows", "errors": errors}), 400
+    
+    return jsonify({"inserted": inserted}), 201
+
 @bp.route('', methods=['GET'])
 @requires_auth
 def get_transactions():
     """Get user transactions with optional filtering."""
-    user_id = get_user_id_from_auth0_id()
+    user_id = g.internal_user_id
     if not user_id:
         return jsonify({"error": "User not registered"}), 403
     
-    # Get query parameters
-    household_id = request.args.get('household_id')
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    category = request.args.get('category')
-    
-    # Build query with parameterized SQL
-    query = """
-        SELECT t.id, t.user_id, t.amount, t.date, t.description, 
-               t.category, t.household_id, t.created_at,
-               u.username as user_name
-        FROM transactions t
-        JOIN users u ON t.user_id = u.id
-        WHERE 
-    """
+    try:
+        response_format = get_response_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
-    conditions = []
-    params = []
+    conditions, params, error = build_transaction_filters(user_id)
+    if error:
+        return error
     
-    if household_id:
-        # Verify membership
-        with get_db_cursor() as cursor:
-            cursor.execute(
-                "SELECT 1 FROM household_members WHERE household_id = %s AND user_id = %s",
-                (household_id, user_id)
-            )
-            if not cursor.fetchone():
-                return jsonify({"error": "Not a member of the specified household"}), 403
+    # Keyset pagination: resume strictly after the last row of the previous page
+    limit, error = parse_limit()
+    if error:
+        return error
+    
+    cursor_token = request.args.get('cursor')
+    if cursor_token:
+        try:
+            after_date, after_created_at, after_id = decode_cursor(cursor_token)
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
         
-        conditions.append("t.household_id = %s")
-        params.append(household_id)
-    else:
-        conditions.append("t.user_id = %s")
-        params.append(user_id)
+        condition, condition_params = after_cursor_condition(after_date, after_created_at, after_id)
+        conditions.append(condition)
+        params.extend(condition_params)
+        
+        if limit is None:
+            limit = current_app.config['TRANSACTIONS_MAX_PAGE_SIZE']
     
-    if start_date:
-        conditions.append("t.date >= %s")
-        params.append(start_date)
+    stream = request.args.get('stream', '').lower() == 'true'
+    if stream and response_format == 'columnar':
+        return jsonify({"error": "format=columnar cannot be streamed"}), 400
     
-    if end_date:
-        conditions.append("t.date <= %s")
-        params.append(end_date)
+    # One extra row tells us whether another page exists
+    fetch = None if limit is None else (limit if stream else limit + 1)
     
-    if category:
-        conditions.append("t.category = %s")
-        params.append(category)
+    source, params = transactions_source(conditions, params, request.args.get('start_date'),
+                                         order_by=TRANSACTION_ORDER, limit=fetch)
+    query = TRANSACTION_LIST_QUERY.format(source=source) + f" ORDER BY {TRANSACTION_ORDER}"
+    if fetch is not None:
+        query += " LIMIT %s"
+        params.append(fetch)
     
-    query += " AND ".join(conditions)
-    query += " ORDER BY t.date DESC, t.created_at DESC"
+    if stream:
+        return stream_json_rows(query, params)
     
     with get_db_cursor() as cursor:
         cursor.execute(query, params)
         transactions = cursor.fetchall()
+    
+    response = jsonify(format_rows(transactions[:limit], TRANSACTION_COLUMNS, response_format))
+    if limit is not None and len(transactions) > limit:
+        response.headers['X-Next-Cursor'] = encode_cursor(transactions[limit - 1])
+    
+    return response, 200
+
+@bp.route('/search', methods=['GET'])
+@requires_auth
+def search_transactions():
+    """Full-text search over transaction descriptions, best matches first.
+    
+    Takes q plus the household_id/start_date/end_date/category filters of
+    GET /api/transactions. Pages with limit and the X-Next-Cursor header.
+    """
+    user_id = g.internal_user_id
+    if not user_id:
+        return jsonify({"error": "User not registered"}), 403
+    
+    terms = fulltext_terms(request.args.get('q', ''))
+    if not terms:
+        min_length = current_app.config['SEARCH_MIN_WORD_LENGTH']
+        return jsonify({"error": f"q must contain a word of at least {min_length} characters"}), 400
+    
+    try:
+        response_format = get_response_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    limit, error = parse_limit(default=current_app.config['SEARCH_PAGE_SIZE'])
+    if error:
+        return error
+    
+    offset = 0
+    cursor_token = request.args.get('cursor')
+    if cursor_token:
+        try:
+            offset = decode_offset_cursor(cursor_token)
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+    
+    conditions, params, error = build_transaction_filters(user_id)
+    if error:
+        return error
+    
+    query = SEARCH_QUERY + " AND ".join(["MATCH (t.description) AGAINST (%s IN BOOLEAN MODE)", *conditions])
+    query += f" ORDER BY score DESC, {TRANSACTION_ORDER} LIMIT %s OFFSET %s"
+    # One extra row tells us whether another page exists
+    params = [terms, terms, *params, limit + 1, offset]
+    
+    with get_db_cursor() as cursor:
+        cursor.execute(query, params)
+        transactions = cursor.fetchall()
+    
+    response = jsonify(format_rows(transactions[:limit], SEARCH_COLUMNS, response_format))
+    if len(transactions) > limit:
+        response.headers['X-Next-Cursor'] = encode_offset_cursor(offset + limit)
+    
+    return response, 200
+
+@bp.route('/changes', methods=['GET'])
+@requires_auth
+@requires_household_member
+def get_changes():
+    """Get the transactions added or changed since a sync token.
+    
+    Without since, pages through a snapshot of every transaction of the
+    user (or household_id), archive included, with "reset": true on the
+    first page so the client starts from an empty cache. After that each
+    call returns the rows changed since the token, oldest change first.
+    Call again with the returned token while has_more is true, first
+    waiting retry_after seconds when it is set (a full page of changes
+    too recent to be final). Reads go to
+    the primary so a lagging replica cannot make a client skip changes.
+    """
+    user_id = g.internal_user_id
+    if not user_id:
+        return jsonify({"error": "User not registered"}), 403
+    
+    household_id = request.args.get('household_id') or None
+    
+    try:
+        response_format = get_response_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    limit, error = parse_limit(default=current_app.config['TRANSACTIONS_MAX_PAGE_SIZE'])
+    if error:
+        return error
+    
+    token = None
+    since = request.args.get('since')
+    if since:
+        try:
+            token = SyncToken.decode(since)
+        except ValueError:
+            return jsonify({"error": "Invalid sync token"}), 400
+        if token.household_id != household_id:
+            return jsonify({"error": "Sync token belongs to a different household_id"}), 400
+    
+    owner_condition = "t.household_id = %s" if household_id else "t.user_id = %s"
+    owner_id = household_id or user_id
+    
+    with get_db_cursor(primary=True) as cursor:
+        # Changes stamped before this have committed (see SYNC_SETTLE_WINDOW)
+        cursor.execute("SELECT NOW(6) - INTERVAL %s SECOND AS settled_before",
+                       (current_app.config['SYNC_SETTLE_WINDOW'],))
+        settled_before = cursor.fetchone()['settled_before']
         
-        return jsonify(transactions), 200
+        if token is None or token.snapshot:
+            # Snapshot pages, newest first; changes made meanwhile are
+            # picked up from the watermark the snapshot started at
+            conditions, params = [owner_condition], [owner_id]
+            if token:
+                condition, condition_params = after_cursor_condition(*token.snapshot)
+                conditions.append(condition)
+                params.extend(condition_params)
+            
+            source, params = transactions_source(conditions, params,
+                                                 order_by=TRANSACTION_ORDER, limit=limit + 1)
+            cursor.execute(
+                TRANSACTION_LIST_QUERY.format(source=source) + f" ORDER BY {TRANSACTION_ORDER} LIMIT %s",
+                [*params, limit + 1]
+            )
+            rows = cursor.fetchall()
+            
+            snapshot = None
+            if len(rows) > limit:
+                last = rows[limit - 1]
+                snapshot = (last['date'], last['created_at'], last['id'])
+            
+            watermark = token.watermark if token else (settled_before, 0)
+            next_token = SyncToken(household_id, watermark, snapshot)
+            has_more = True  # the changes since the snapshot began come next
+            retry_after = None
+        else:
+            updated_at, last_id = token.watermark
+            cursor.execute(
+                CHANGES_QUERY + owner_condition + f" ORDER BY {CHANGES_ORDER} LIMIT %s",
+                [updated_at, updated_at, last_id, owner_id, limit + 1]
+            )
+            rows = cursor.fetchall()
+            
+            watermark, has_more, retry_after = next_watermark(rows, limit, token.watermark, settled_before)
+            next_token = SyncToken(household_id, watermark)
+            for row in rows:
+                del row['updated_at']
+    
+    return jsonify({
+        "transactions": format_rows(rows[:limit], TRANSACTION_COLUMNS, response_format),
+        "token": next_token.encode(),
+        "has_more": has_more,
+        "retry_after": retry_after,
+        "reset": token is None,
+    }), 200
+
+@bp.route('/export', methods=['GET'])
+@requires_auth
+def export_transactions():
+    """Stream transactions as CSV or NDJSON with constant memory.
+    
+    Takes the same filters as GET /api/transactions. Rows are read through a
+    server-side cursor and written as they arrive; the body is gzipped on
+    the fly when the client accepts gzip or passes compress=gzip.
+    """
+    user_id = g.internal_user_id
+    if not user_id:
+        return jsonify({"error": "User not registered"}), 403
+    
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Invalid format. Use: {', '.join(EXPORT_FORMATS)}"}), 400
+    
+    conditions, params, error = build_transaction_filters(user_id)
+    if error:
+        return error
+    
+    source, params = transactions_source(conditions, params, request.args.get('start_date'))
+    query = TRANSACTION_LIST_QUERY.format(source=source) + f" ORDER BY {TRANSACTION_ORDER}"
+    
+    mimetype, encode_rows = EXPORT_FORMATS[export_format]
+    batch_size = current_app.config['TRANSACTIONS_STREAM_BATCH_SIZE']
+    
+    def generate():
+        with get_db_stream_cursor() as cursor:
+            cursor.execute(query, params)
+            first = True
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows and not first:
+                    break
+                yield encode_rows(rows, header=first)
+                first = False
+    
+    chunks = stream_with_context(generate())
+    headers = {
+        'Content-Disposition': f'attachment; filename=transactions.{export_format}',
+        'Cache-Control': 'no-store',
+    }
+    
+    if request.args.get('compress') == 'gzip' or request.accept_encodings['gzip']:
+        chunks = gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    
+    return Response(chunks, mimetype=mimetype, headers=headers)
+
+@bp.route('/export', methods=['POST'])
+@requires_auth
+def queue_export():
+    """Queue an export as a background job; the file is fetched from the job.
+
+    Takes the same format and filters as GET /export, as query parameters
+    or a JSON body. Responds 202 with the job; when it has succeeded the
+    gzipped file is at GET /api/jobs/<id>/download.
+    """
+    user_id = g.internal_user_id
+    if not user_id:
+        return jsonify({"error": "User not registered"}), 403
+    
+    options = {**request.args.to_dict(), **(request.get_json(silent=True) or {})}
+    export_format = options.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"Invalid format. Use: {', '.join(EXPORT_FORMATS)}"}), 400
+    
+    household_id = options.get('household_id')
+    if household_id and not is_household_member(user_id, household_id):
+        return not_a_member()
+    
+    job = enqueue_job('export_transactions', user_id, {
+        'format': export_format,
+        'household_id': household_id,
+        'start_date': options.get('start_date'),
+        'end_date': options.get('end_date'),
+        'category': options.get('category'),
+    })
+    return job_accepted(job)
 
 @bp.route('/summary', methods=['GET'])
 @requires_auth
+@requires_household_member
 def get_summary():
     """Get a summary of transactions by period."""
-    user_id = get_user_id_from_auth0_id()
+    user_id = g.internal_user_id
     if not user_id:
         return jsonify({"error": "User not registered"}), 403
     
@@ -149,129 +651,110 @@ def get_summary():
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     
-    valid_periods = ['daily', 'weekly', 'monthly', 'yearly']
-    if period not in valid_periods:
-        return jsonify({"error": f"Invalid period. Use: {', '.join(valid_periods)}"}), 400
+    if period not in SUMMARY_PERIODS:
+        return jsonify({"error": f"Invalid period. Use: {', '.join(SUMMARY_PERIODS)}"}), 400
     
-    # Build period format expression
-    if period == 'daily':
-        period_expr = "DATE(t.date)"
-    elif period == 'weekly':
-        period_expr = "YEARWEEK(t.date)"
-    elif period == 'monthly':
-        period_expr = "DATE_FORMAT(t.date, '%%Y-%%m')"
-    else:  # yearly
-        period_expr = "YEAR(t.date)"
-    
-    query = f"""
-        SELECT {period_expr} as period,
-        SUM(t.amount) as total_amount,
-        COUNT(t.id) as transaction_count,
-        MIN(t.amount) as min_amount,
-        MAX(t.amount) as max_amount,
-        AVG(t.amount) as avg_amount
-        FROM transactions t
-        WHERE 
-    """
+    try:
+        response_format = get_response_format()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
-    conditions = []
-    params = []
+    query, params = build_summary_query(user_id, household_id, period, start_date, end_date)
     
-    if household_id:
-        # Verify membership
+    def compute_summary():
         with get_db_cursor() as cursor:
-            cursor.execute(
-                "SELECT 1 FROM household_members WHERE household_id = %s AND user_id = %s",
-                (household_id, user_id)
-            )
-            if not cursor.fetchone():
-                return jsonify({"error": "Not a member of the specified household"}), 403
-        
-        conditions.append("t.household_id = %s")
-        params.append(household_id)
-    else:
-        conditions.append("t.user_id = %s")
-        params.append(user_id)
+            cursor.execute(query, params)
+            summary = cursor.fetchall()
+            
+            return {
+                "period": period,
+                "summary": format_rows(summary, SUMMARY_COLUMNS, response_format)
+            }
     
-    if start_date:
-        conditions.append("t.date >= %s")
-        params.append(start_date)
+    scope = owner_scope(user_id, household_id)
+    return cached_json_response('transactions.summary', scope, compute_summary)
+
+@bp.route('/analytics', methods=['GET'])
+@requires_auth
+def get_analytics():
+    """Get monthly and per-category spending statistics.
     
-    if end_date:
-        conditions.append("t.date <= %s")
-        params.append(end_date)
+    Takes the household_id/start_date/end_date/category filters of
+    GET /api/transactions and window, the number of months in the rolling
+    average (default 3).
+    """
+    user_id = g.internal_user_id
+    if not user_id:
+        return jsonify({"error": "User not registered"}), 403
     
-    query += " AND ".join(conditions)
-    query += " GROUP BY period ORDER BY period ASC"
+    try:
+        window = int(request.args.get('window', 3))
+    except ValueError:
+        return jsonify({"error": "window must be an integer"}), 400
+    if not 1 <= window <= 24:
+        return jsonify({"error": "window must be between 1 and 24"}), 400
     
-    with get_db_cursor() as cursor:
-        cursor.execute(query, params)
-        summary = cursor.fetchall()
-        
-        return jsonify({
-            "period": period,
-            "summary": summary
-        }), 200
+    conditions, params, error = build_transaction_filters(user_id)
+    if error:
+        return error
+    
+    def compute_analytics():
+        columns = load_columns(conditions, params, request.args.get('start_date'),
+                               batch_size=current_app.config['TRANSACTIONS_STREAM_BATCH_SIZE'])
+        return compute_statistics(columns, window=window)
+    
+    scope = owner_scope(user_id, request.args.get('household_id'))
+    return cached_json_response('transactions.analytics', scope, compute_analytics)
 
 @bp.route('/categories', methods=['GET'])
 @requires_auth
+@requires_household_member
 def get_categories():
     """Get all distinct categories used in transactions."""
-    user_id = get_user_id_from_auth0_id()
+    user_id = g.internal_user_id
     if not user_id:
         return jsonify({"error": "User not registered"}), 403
         
     household_id = request.args.get('household_id')
     
-    query = """
-        SELECT DISTINCT category 
-        FROM transactions 
-        WHERE category IS NOT NULL
-        AND (
-    """
-    
-    conditions = []
+    conditions = ["t.category IS NOT NULL"]
     params = []
     
     if household_id:
-        # Verify membership
-        with get_db_cursor() as cursor:
-            cursor.execute(
-                "SELECT 1 FROM household_members WHERE household_id = %s AND user_id = %s",
-                (household_id, user_id)
-            )
-            if not cursor.fetchone():
-                return jsonify({"error": "Not a member of the specified household"}), 403
-        
-        conditions.append("household_id = %s")
+        conditions.append("t.household_id = %s")
         params.append(household_id)
     else:
-        conditions.append("user_id = %s")
+        conditions.append("t.user_id = %s")
         params.append(user_id)
     
-    query += " OR ".join(conditions)
-    query += ") ORDER BY category ASC"
+    # De-duplicate inside each table first so the index does the work
+    source, params = transactions_source(conditions, params, columns="DISTINCT t.category")
+    query = f"SELECT DISTINCT t.category as category FROM {source} ORDER BY category ASC"
     
-    with get_db_cursor() as cursor:
-        cursor.execute(query, params)
-        categories = [row['category'] for row in cursor.fetchall()]
-        
-        # Include default categories if needed
-        default_categories = [
-            "Groceries", 
-            "Dining", 
-            "Entertainment", 
-            "Transportation", 
-            "Housing", 
-            "Utilities", 
-            "Healthcare", 
-            "Shopping", 
-            "Travel", 
-            "Income"
-        ]
-        
-        # Merge categories from DB with defaults, avoiding duplicates
-        all_categories = list(set(categories + default_categories))
-        all_categories.sort()
-        
-        return jsonify(all_categories), 200
\ No newline at end of file
+    def compute_categories():
+        with get_db_cursor() as cursor:
+            cursor.execute(query, params)
+            categories = [row['category'] for row in cursor.fetchall()]
+            
+            # Include default categories if needed
+            default_categories = [
+                "Groceries", 
+                "Dining", 
+                "Entertainment", 
+                "Transportation", 
+                "Housing", 
+                "Utilities", 
+                "Healthcare", 
+                "Shopping", 
+                "Travel", 
+                "Income"
+            ]
+            
+            # Merge categories from DB with defaults, avoiding duplicates
+            all_categories = list(set(categories + default_categories))
+            all_categories.sort()
+            
+            return all_categories
+    
+    scope = owner_scope(user_id, household_id)
+    return cached_json_response('transactions.categories', scope, compute_categories)
\ No newline at end of file
@@ -1,11 +0,0 @@
--- myapp/schema/households.sql
-CREATE TABLE IF NOT EXISTS `households` (
-  `id` INT NOT NULL AUTO_INCREMENT,
-  `name` VARCHAR(100) NOT NULL,
-  `creator_id` INT NOT NULL,
-  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-  PRIMARY KEY (`id`),
-  INDEX `idx_creator_id` (`creator_id`),
-  CONSTRAINT `fk_households_creator` FOREIGN KEY (`creator_id`) 
-    REFERENCES `users` (`id`) ON DELETE CASCADE
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
\ No newline at end of file
@@ -0,0 +1,69 @@
+-- myapp/schema/migrations/0001_initial.sql
+-- Baseline schema. IF NOT EXISTS lets databases created by the old
+-- create_schema() adopt the migration history without changes.
+CREATE TABLE IF NOT EXISTS `users` (
+  `id` INT NOT NULL AUTO_INCREMENT,
+  `username` VARCHAR(80) NOT NULL,
+  `email` VARCHAR(120) NOT NULL,
+  `auth0_id` VARCHAR(128) NOT NULL,
+  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  UNIQUE INDEX `idx_username` (`username`),
+  UNIQUE INDEX `idx_email` (`email`),
+  UNIQUE INDEX `idx_auth0_id` (`auth0_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS `households` (
+  `id` INT NOT NULL AUTO_INCREMENT,
+  `name` VARCHAR(100) NOT NULL,
+  `creator_id` INT NOT NULL,
+  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  INDEX `idx_creator_id` (`creator_id`),
+  CONSTRAINT `fk_households_creator` FOREIGN KEY (`creator_id`) 
+    REFERENCES `users` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS `household_members` (
+  `household_id` INT NOT NULL,
+  `user_id` INT NOT NULL,
+  `joined_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`household_id`, `user_id`),
+  INDEX `idx_user_id` (`user_id`),
+  CONSTRAINT `fk_household_members_household` FOREIGN KEY (`household_id`) 
+    REFERENCES `households` (`id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_household_members_user` FOREIGN KEY (`user_id`) 
+    REFERENCES `users` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS `invites` (
+  `id` INT NOT NULL AUTO_INCREMENT,
+  `household_id` INT NOT NULL,
+  `invite_code` VARCHAR(16) NOT NULL,
+  `is_active` BOOLEAN NOT NULL DEFAULT TRUE,
+  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  `expires_at` DATETIME DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  UNIQUE INDEX `idx_invite_code` (`invite_code`),
+  INDEX `idx_household_id` (`household_id`),
+  CONSTRAINT `fk_invites_household` FOREIGN KEY (`household_id`) 
+    REFERENCES `households` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS `transactions` (
+  `id` INT NOT NULL AUTO_INCREMENT,
+  `user_id` INT NOT NULL,
+  `amount` DECIMAL(10,2) NOT NULL,
+  `date` DATE NOT NULL,
+  `description` VARCHAR(255) NOT NULL,
+  `category` VARCHAR(50) DEFAULT NULL,
+  `household_id` INT DEFAULT NULL,
+  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  INDEX `idx_user_id` (`user_id`),
+  INDEX `idx_household_id` (`household_id`),
+  CONSTRAINT `fk_transactions_user` FOREIGN KEY (`user_id`) 
+    REFERENCES `users` (`id`) ON DELETE CASCADE,
+  CONSTRAINT `fk_transactions_household` FOREIGN KEY (`household_id`) 
+    REFERENCES `households` (`id`) ON DELETE SET NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,15 @@
+-- myapp/schema/migrations/0002_transaction_indexes.sql
+-- Composite indexes matching the owner + date/category filters and the
+-- date DESC, created_at DESC, id DESC ordering used by the transaction
+-- routes. amount is included so the summary aggregates are index-only.
+-- The new indexes lead with the foreign key columns, so the old
+-- single-column ones can go.
+ALTER TABLE `transactions`
+  ADD INDEX `idx_transactions_user_date` (`user_id`, `date`, `created_at`, `amount`),
+  ADD INDEX `idx_transactions_household_date` (`household_id`, `date`, `created_at`, `amount`),
+  ADD INDEX `idx_transactions_user_category` (`user_id`, `category`),
+  ADD INDEX `idx_transactions_household_category` (`household_id`, `category`);
+
+ALTER TABLE `transactions`
+  DROP INDEX `idx_user_id`,
+  DROP INDEX `idx_household_id`;
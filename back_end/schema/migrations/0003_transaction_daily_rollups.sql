@@ -0,0 +1,16 @@
+-- myapp/schema/migrations/0003_transaction_daily_rollups.sql
+-- Per-day, per-category aggregates for each owner. Every transaction counts
+-- towards its user's rows and, when it has one, its household's rows.
+-- Uncategorized transactions use category ''. Maintained by
+-- create_transaction; populate existing data with `flask backfill-rollups`.
+CREATE TABLE IF NOT EXISTS `transaction_daily_rollups` (
+  `owner_type` ENUM('user', 'household') NOT NULL,
+  `owner_id` INT NOT NULL,
+  `day` DATE NOT NULL,
+  `category` VARCHAR(50) NOT NULL DEFAULT '',
+  `total_amount` DECIMAL(16,2) NOT NULL,
+  `transaction_count` INT NOT NULL,
+  `min_amount` DECIMAL(10,2) NOT NULL,
+  `max_amount` DECIMAL(10,2) NOT NULL,
+  PRIMARY KEY (`owner_type`, `owner_id`, `day`, `category`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -0,0 +1,6 @@
+-- myapp/schema/migrations/0004_transaction_fulltext.sql
+-- Full-text index for /api/transactions/search. The first FULLTEXT index
+-- on a table adds InnoDB's hidden FTS_DOC_ID column, so this rebuilds
+-- transactions once; expect it to take a while on large tables.
+ALTER TABLE `transactions`
+  ADD FULLTEXT INDEX `ft_transactions_description` (`description`);
@@ -0,0 +1,25 @@
+-- myapp/schema/migrations/0005_transactions_archive.sql
+-- Cold history moved out of `transactions` by `flask archive-transactions`.
+-- MySQL cannot partition tables with foreign keys or FULLTEXT indexes, so
+-- the hot table keeps both and old rows move here instead: compressed,
+-- range-partitioned by month on `date` so date filters prune partitions.
+-- Rows keep their original id. Monthly partitions are split off p_future
+-- by `flask create-partitions`.
+CREATE TABLE IF NOT EXISTS `transactions_archive` (
+  `id` INT NOT NULL,
+  `user_id` INT NOT NULL,
+  `amount` DECIMAL(10,2) NOT NULL,
+  `date` DATE NOT NULL,
+  `description` VARCHAR(255) NOT NULL,
+  `category` VARCHAR(50) DEFAULT NULL,
+  `household_id` INT DEFAULT NULL,
+  `created_at` TIMESTAMP NULL DEFAULT NULL,
+  `archived_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`, `date`),
+  INDEX `idx_transactions_archive_user_date` (`user_id`, `date`, `created_at`, `amount`),
+  INDEX `idx_transactions_archive_household_date` (`household_id`, `date`, `created_at`, `amount`)
+) ENGINE=InnoDB ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8
+  DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+PARTITION BY RANGE COLUMNS (`date`) (
+  PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
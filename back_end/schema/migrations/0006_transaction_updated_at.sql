@@ -0,0 +1,11 @@
+-- myapp/schema/migrations/0006_transaction_updated_at.sql
+-- Change tracking for /api/transactions/changes. updated_at is stamped on
+-- insert and on every update, with microseconds so (updated_at, id) orders
+-- changes finely; existing rows get the migration time and show up as
+-- changed once. Adding a column next to a FULLTEXT index rebuilds the
+-- table, so expect this to take a while on large tables.
+ALTER TABLE `transactions`
+  ADD COLUMN `updated_at` TIMESTAMP(6) NOT NULL
+    DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+  ADD INDEX `idx_transactions_user_updated` (`user_id`, `updated_at`, `id`),
+  ADD INDEX `idx_transactions_household_updated` (`household_id`, `updated_at`, `id`);
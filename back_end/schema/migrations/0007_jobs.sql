@@ -0,0 +1,29 @@
+-- myapp/schema/migrations/0007_jobs.sql
+-- Durable queue for background jobs run by `flask run-workers`. Workers
+-- claim queued rows with FOR UPDATE SKIP LOCKED, so any number of them can
+-- share the table. user_id is NULL for system jobs such as rollup
+-- backfills, which are not subject to the per-user concurrency cap.
+CREATE TABLE IF NOT EXISTS `jobs` (
+  `id` BIGINT NOT NULL AUTO_INCREMENT,
+  `user_id` INT DEFAULT NULL,
+  `kind` VARCHAR(50) NOT NULL,
+  `status` ENUM('queued', 'running', 'succeeded', 'failed') NOT NULL DEFAULT 'queued',
+  `payload` LONGTEXT NOT NULL,
+  `result` MEDIUMTEXT DEFAULT NULL,
+  `error` TEXT DEFAULT NULL,
+  `progress` TINYINT UNSIGNED NOT NULL DEFAULT 0,
+  `progress_message` VARCHAR(255) DEFAULT NULL,
+  `attempts` INT NOT NULL DEFAULT 0,
+  `max_attempts` INT NOT NULL DEFAULT 3,
+  `run_after` DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+  `locked_by` VARCHAR(100) DEFAULT NULL,
+  `heartbeat_at` DATETIME(6) DEFAULT NULL,
+  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  `started_at` DATETIME(6) DEFAULT NULL,
+  `finished_at` DATETIME(6) DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  INDEX `idx_jobs_status_run_after` (`status`, `run_after`),
+  INDEX `idx_jobs_user_status` (`user_id`, `status`),
+  CONSTRAINT `fk_jobs_user` FOREIGN KEY (`user_id`)
+    REFERENCES `users` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
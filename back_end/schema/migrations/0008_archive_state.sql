@@ -0,0 +1,14 @@
+-- myapp/schema/migrations/0008_archive_state.sql
+-- High-water mark of transactions_archive: every archived row is dated
+-- before archived_before (NULL while nothing is archived). Reads skip the
+-- archive for ranges starting at or after it, whatever ARCHIVE_AFTER_DAYS
+-- says today. Seeded from the rows archived so far.
+CREATE TABLE IF NOT EXISTS `archive_state` (
+  `id` TINYINT NOT NULL,
+  `archived_before` DATE DEFAULT NULL,
+  `updated_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT IGNORE INTO `archive_state` (`id`, `archived_before`)
+SELECT 1, DATE_ADD(MAX(`date`), INTERVAL 1 DAY) FROM `transactions_archive`;
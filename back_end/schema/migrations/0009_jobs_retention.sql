@@ -0,0 +1,7 @@
+-- myapp/schema/migrations/0009_jobs_retention.sql
+-- Payloads are cleared once a job succeeds or fails, so an import's rows
+-- are not kept forever, and finished jobs are deleted after
+-- JOB_RETENTION_DAYS by the workers' retention sweep.
+ALTER TABLE `jobs`
+  MODIFY `payload` LONGTEXT DEFAULT NULL,
+  ADD INDEX `idx_jobs_status_finished` (`status`, `finished_at`);
@@ -1,18 +0,0 @@
--- myapp/schema/transactions.sql
-CREATE TABLE IF NOT EXISTS `transactions` (
-  `id` INT NOT NULL AUTO_INCREMENT,
-  `user_id` INT NOT NULL,
-  `amount` DECIMAL(10,2) NOT NULL,
-  `date` DATE NOT NULL,
-  `description` VARCHAR(255) NOT NULL,
-  `category` VARCHAR(50) DEFAULT NULL,
-  `household_id` INT DEFAULT NULL,
-  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-  PRIMARY KEY (`id`),
-  INDEX `idx_user_id` (`user_id`),
-  INDEX `idx_household_id` (`household_id`),
-  CONSTRAINT `fk_transactions_user` FOREIGN KEY (`user_id`) 
-    REFERENCES `users` (`id`) ON DELETE CASCADE,
-  CONSTRAINT `fk_transactions_household` FOREIGN KEY (`household_id`) 
-    REFERENCES `households` (`id`) ON DELETE SET NULL
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
\ No newline at end of file
@@ -1,12 +0,0 @@
--- myapp/schema/users.sql (modified)
-CREATE TABLE IF NOT EXISTS `users` (
-  `id` INT NOT NULL AUTO_INCREMENT,
-  `username` VARCHAR(80) NOT NULL,
-  `email` VARCHAR(120) NOT NULL,
-  `auth0_id` VARCHAR(128) NOT NULL,
-  `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-  PRIMARY KEY (`id`),
-  UNIQUE INDEX `idx_username` (`username`),
-  UNIQUE INDEX `idx_email` (`email`),
-  UNIQUE INDEX `idx_auth0_id` (`auth0_id`)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
\ No newline at end of file
@@ -0,0 +1,122 @@
+# myapp/serve.py
+"""Production server: gunicorn with pre-forked, multi-threaded workers.
+
+    python run.py serve [--workers N] [--threads N] [--bind HOST:PORT] [--no-preload]
+
+Defaults come from the SERVER_* settings. Send SIGHUP to the master for a
+graceful reload: new workers are started and old ones finish their
+in-flight requests before exiting.
+"""
+import argparse
+import logging
+
+from gunicorn.app.base import BaseApplication
+
+from back_end import create_app, database, response_cache
+from back_end.cache import reset_named_caches
+from back_end.config import Config, ProductionConfig
+from back_end.jwks import reset_jwks_caches
+
+logger = logging.getLogger(__name__)
+
+
+def reset_after_fork(app):
+    """Drop per-process state a worker must not share with the master.
+
+    Pooled sockets, cached keys and tokens, the response cache and the log
+    listener thread were all created before the fork when the app is
+    preloaded; each worker starts its own.
+    """
+    database.reset_pool(app)
+    reset_jwks_caches()
+    reset_named_caches()
+    response_cache.init_app(app)
+    Config.init_logging(app.config)
+
+
+def post_fork(server, worker):
+    app = server.app.application
+    if app is not None:
+        reset_after_fork(app)
+
+
+def worker_exit(server, worker):
+    app = server.app.application
+    if app is not None:
+        database.reset_pool(app)
+
+
+class ProductionServer(BaseApplication):
+    """Run the Flask app under gunicorn without a separate config file."""
+
+    def __init__(self, options, app_config, preload=True):
+        self.options = options
+        self.app_config = app_config
+        self.application = create_app(app_config) if preload else None
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        # Without preloading, each worker builds its own app after the fork
+        if self.application is None:
+            self.application = create_app(self.app_config)
+        return self.application
+
+
+def build_options(config, args):
+    """Translate SERVER_* settings and command-line overrides into gunicorn options."""
+    threads = args.threads or config.SERVER_THREADS
+    if config.MYSQL_POOL_SIZE < threads:
+        logger.warning("MYSQL_POOL_SIZE (%s) is smaller than SERVER_THREADS (%s); "
+                       "threads will wait for connections", config.MYSQL_POOL_SIZE, threads)
+
+    return {
+        'bind': args.bind or config.SERVER_BIND,
+        'workers': args.workers or config.SERVER_WORKERS,
+        'worker_class': 'gthread',
+        'threads': threads,
+        'preload_app': not args.no_preload and config.SERVER_PRELOAD,
+        'timeout': config.SERVER_TIMEOUT,
+        'graceful_timeout': config.SERVER_GRACEFUL_TIMEOUT,
+        'keepalive': config.SERVER_KEEPALIVE,
+        'max_requests': config.SERVER_MAX_REQUESTS,
+        'max_requests_jitter': config.SERVER_MAX_REQUESTS // 10,
+        'pidfile': config.SERVER_PIDFILE or None,
+        'accesslog': config.SERVER_ACCESS_LOG or None,
+        'post_fork': post_fork,
+        'worker_exit': worker_exit,
+    }
+
+
+def response_cache_backend(config, workers):
+    """The response cache backend to serve with ``workers`` processes.
+
+    The local backend lives in each worker, so an invalidation only reaches
+    the worker that handled the write and the others would keep serving
+    stale summaries for up to RESPONSE_CACHE_TTL. With more than one worker
+    it is switched off; use the redis backend to keep caching.
+    """
+    if config.RESPONSE_CACHE_BACKEND == 'local' and workers > 1:
+        logger.warning("RESPONSE_CACHE_BACKEND=local is per process; disabling the response "
+                       "cache for %s workers (set RESPONSE_CACHE_BACKEND=redis to cache)", workers)
+        return 'none'
+    return config.RESPONSE_CACHE_BACKEND
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='run.py serve', description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, help='worker processes (SERVER_WORKERS)')
+    parser.add_argument('--threads', type=int, help='threads per worker (SERVER_THREADS)')
+    parser.add_argument('--bind', help='address to listen on (SERVER_BIND)')
+    parser.add_argument('--no-preload', action='store_true',
+                        help='build the app in each worker instead of once in the master')
+    args = parser.parse_args(argv)
+
+    options = build_options(ProductionConfig, args)
+    app_config = ProductionConfig()
+    app_config.RESPONSE_CACHE_BACKEND = response_cache_backend(app_config, options['workers'])
+    ProductionServer(options, app_config, preload=options['preload_app']).run()
@@ -0,0 +1,91 @@
+# myapp/sync.py
+import base64
+import binascii
+import json
+import math
+from datetime import date, datetime
+
+# Changed rows after a (updated_at, id) watermark; owner conditions are appended
+CHANGES_QUERY = """
+    SELECT t.id, t.user_id, t.amount, t.date, t.description,
+           t.category, t.household_id, t.created_at,
+           u.username as user_name, t.updated_at
+    FROM transactions t
+    JOIN users u ON t.user_id = u.id
+    WHERE (t.updated_at > %s OR (t.updated_at = %s AND t.id > %s)) AND
+"""
+
+CHANGES_ORDER = "t.updated_at ASC, t.id ASC"
+
+
+class SyncToken:
+    """Where a client's copy of one owner's transactions is up to.
+
+    ``watermark`` is the (updated_at, id) of the last change the client
+    has. While the initial snapshot is still being paged, ``snapshot``
+    holds the (date, created_at, id) list cursor of its last page.
+    """
+
+    def __init__(self, household_id, watermark, snapshot=None):
+        self.household_id = household_id
+        self.watermark = watermark
+        self.snapshot = snapshot
+
+    def encode(self):
+        updated_at, last_id = self.watermark
+        snapshot = None
+        if self.snapshot:
+            snapshot_date, created_at, snapshot_id = self.snapshot
+            snapshot = [snapshot_date.isoformat(),
+                        created_at.isoformat(sep=' ') if created_at else None, snapshot_id]
+        payload = {
+            'h': self.household_id,
+            'w': [updated_at.isoformat(sep=' '), last_id],
+            's': snapshot,
+        }
+        return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii').rstrip('=')
+
+    @classmethod
+    def decode(cls, token):
+        """Raises ValueError if the token was not produced by encode."""
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            payload = json.loads(raw)
+            updated_at, last_id = payload['w']
+            snapshot = payload.get('s')
+            if snapshot:
+                snapshot_date, created_at, snapshot_id = snapshot
+                snapshot = (
+                    date.fromisoformat(snapshot_date),
+                    datetime.fromisoformat(created_at) if created_at else None,
+                    int(snapshot_id),
+                )
+            return cls(payload['h'], (datetime.fromisoformat(updated_at), int(last_id)), snapshot)
+        except (TypeError, KeyError, ValueError, binascii.Error) as e:
+            raise ValueError("Invalid sync token") from e
+
+
+def next_watermark(rows, limit, watermark, settled_before):
+    """Advance the watermark past a page of changes.
+
+    ``rows`` holds up to ``limit + 1`` changes after ``watermark`` in
+    (updated_at, id) order. Changes stamped at or after ``settled_before``
+    may still have uncommitted neighbours with earlier stamps, so the
+    watermark never moves past it: those rows are sent now and again on
+    the next sync, and clients apply changes as idempotent upserts.
+
+    When a full page is still unsettled (e.g. right after a large import)
+    there is more to fetch, but not yet: ``retry_after`` is the number of
+    seconds until the page's last row settles, and the client should call
+    again from the returned watermark after waiting that long.
+
+    Returns (watermark, has_more, retry_after); retry_after is None unless
+    the client must wait.
+    """
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        if last['updated_at'] < settled_before:
+            return (last['updated_at'], last['id']), True, None
+        wait = (last['updated_at'] - settled_before).total_seconds()
+        return max(watermark, (settled_before, 0)), True, max(1, math.ceil(wait))
+    return max(watermark, (settled_before, 0)), False, None
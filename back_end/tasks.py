@@ -0,0 +1,93 @@
+# myapp/tasks.py
+"""Handlers for the background job kinds run by `flask run-workers`."""
+import gzip
+import os
+
+from flask import current_app
+
+from back_end.archive import transactions_source
+from back_end.database import get_db_stream_cursor
+from back_end.importers import import_transactions
+from back_end.jobs import JobFailed, job_handler
+from back_end.membership import is_household_member
+from back_end.rollups import backfill
+from back_end.transactions import (
+    EXPORT_FORMATS, TRANSACTION_LIST_QUERY, TRANSACTION_ORDER, transaction_filters
+)
+
+
+def export_path(job_id, export_format):
+    """Where the file for export job ``job_id`` is written."""
+    return os.path.join(current_app.config['JOB_RESULTS_DIR'], f'transactions-{job_id}.{export_format}.gz')
+
+
+@job_handler('import_transactions')
+def run_import(context, payload):
+    """Validate and insert a bulk import, exactly once."""
+    user_id = context.job['user_id']
+
+    def succeed(cursor, inserted):
+        context.succeed(cursor, {"inserted": inserted})
+
+    inserted, errors = import_transactions(
+        user_id, payload['rows'], payload.get('default_household_id'),
+        progress=context.progress, before_commit=succeed,
+    )
+    if errors:
+        raise JobFailed("Import contains invalid rows", {"errors": errors})
+    return {"inserted": inserted}
+
+
+@job_handler('export_transactions')
+def run_export(context, payload):
+    """Write the filtered transactions to a gzipped CSV or NDJSON file."""
+    user_id = context.job['user_id']
+    household_id = payload.get('household_id')
+    export_format = payload.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        raise JobFailed(f"Invalid format. Use: {', '.join(EXPORT_FORMATS)}")
+
+    # Membership may have changed since the job was queued
+    if household_id and not is_household_member(user_id, household_id):
+        raise JobFailed("Not a member of the specified household")
+
+    conditions, params = transaction_filters(
+        user_id, household_id, payload.get('start_date'), payload.get('end_date'), payload.get('category')
+    )
+    source, params = transactions_source(conditions, params, payload.get('start_date'))
+    query = TRANSACTION_LIST_QUERY.format(source=source) + f" ORDER BY {TRANSACTION_ORDER}"
+
+    _, encode_rows = EXPORT_FORMATS[export_format]
+    batch_size = current_app.config['TRANSACTIONS_STREAM_BATCH_SIZE']
+
+    path = export_path(context.job['id'], export_format)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = f'{path}.{os.getpid()}.tmp'
+
+    count = 0
+    try:
+        with gzip.open(partial, 'wt', encoding='utf-8', newline='') as f, get_db_stream_cursor() as cursor:
+            cursor.execute(query, params)
+            first = True
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows and not first:
+                    break
+                f.write(encode_rows(rows, header=first))
+                first = False
+                count += len(rows)
+                context.progress(count, message=f"{count} rows written")
+        # Readers only ever see a complete file
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+    return {"rows": count, "format": export_format, "bytes": os.path.getsize(path)}
+
+
+@job_handler('backfill_rollups')
+def run_backfill(context, payload):
+    """Rebuild the daily rollups, as `flask backfill-rollups` does."""
+    return {"rows": backfill()}
@@ -0,0 +1,75 @@
+# myapp/transactions.py
+import csv
+import io
+
+from flask import current_app
+
+# Columns returned by the transaction list and export endpoints
+TRANSACTION_COLUMNS = [
+    'id', 'user_id', 'amount', 'date', 'description',
+    'category', 'household_id', 'created_at', 'user_name',
+]
+
+# {source} is a transactions_source() derived table, which holds the filters
+TRANSACTION_LIST_QUERY = """
+    SELECT t.id, t.user_id, t.amount, t.date, t.description, 
+           t.category, t.household_id, t.created_at,
+           u.username as user_name
+    FROM {source}
+    JOIN users u ON t.user_id = u.id
+"""
+
+TRANSACTION_ORDER = "t.date DESC, t.created_at DESC, t.id DESC"
+
+
+def transaction_filters(user_id, household_id=None, start_date=None, end_date=None, category=None):
+    """Build (conditions, params) for an owner and optional date/category filters.
+
+    Membership must already have been checked.
+    """
+    conditions = []
+    params = []
+
+    if household_id:
+        conditions.append("t.household_id = %s")
+        params.append(household_id)
+    else:
+        conditions.append("t.user_id = %s")
+        params.append(user_id)
+
+    if start_date:
+        conditions.append("t.date >= %s")
+        params.append(start_date)
+
+    if end_date:
+        conditions.append("t.date <= %s")
+        params.append(end_date)
+
+    if category:
+        conditions.append("t.category = %s")
+        params.append(category)
+
+    return conditions, params
+
+
+def csv_rows(rows, header=False):
+    """Encode rows as CSV text, with the header line first if requested."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(TRANSACTION_COLUMNS)
+    writer.writerows([row[column] for column in TRANSACTION_COLUMNS] for row in rows)
+    return buffer.getvalue()
+
+
+def ndjson_rows(rows, header=False):
+    """Encode rows as newline-delimited JSON."""
+    dumps = current_app.json.dumps
+    return ''.join(dumps(row) + '\n' for row in rows)
+
+
+# format -> (mimetype, row encoder)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', csv_rows),
+    'ndjson': ('application/x-ndjson', ndjson_rows),
+}
@@ -0,0 +1,8 @@
+# benchmarks/__init__.py
+"""Local benchmarks for the back end.
+
+Run a module with ``python -m benchmarks.<name>`` from the repository root.
+Nothing here talks to Auth0; tokens are signed by the local stand-in in
+``benchmarks.jwks_server``. Benchmarks and tests that need no MySQL connect
+to the fake server in ``benchmarks.fake_db``.
+"""
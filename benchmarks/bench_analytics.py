@@ -0,0 +1,59 @@
+# benchmarks/bench_analytics.py
+"""Scaling of the vectorized analytics engine with row count.
+
+    python -m benchmarks.bench_analytics --rows 100000 1000000 4000000
+
+Generates synthetic (day, cents, category) tuples shaped like the rows the
+analytics query streams, then times building the column arrays and
+computing the statistics separately. Time per row should stay flat as the
+row count grows.
+"""
+import argparse
+import random
+import time
+
+from back_end.analytics import TransactionColumns, compute_statistics
+
+CATEGORIES = ['Groceries', 'Rent', 'Utilities', 'Dining', 'Transport', 'Travel',
+              'Health', 'Entertainment', 'Shopping', '']
+
+
+def synthetic_batches(count, batch_size, years=5, seed=0):
+    rng = random.Random(seed)
+    first_day = 19000  # 2022-01-08
+    for start in range(0, count, batch_size):
+        size = min(batch_size, count - start)
+        yield [
+            (first_day + rng.randrange(years * 365), rng.randrange(100, 50000),
+             rng.choice(CATEGORIES))
+            for _ in range(size)
+        ]
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000, 4000000])
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--window', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9s} {'load s':>8s} {'load ns/row':>12s} {'stats s':>8s} {'stats ns/row':>13s}"
+          f" {'months':>7s}")
+    for count in args.rows:
+        # Generate up front so only the engine is timed
+        batches = list(synthetic_batches(count, args.batch_size))
+        columns, load_seconds = timed(TransactionColumns.from_rows, batches)
+        stats, stats_seconds = timed(compute_statistics, columns, window=args.window)
+        assert stats['overall']['count'] == count, stats['overall']
+        print(f"{count:9d} {load_seconds:8.3f} {load_seconds / count * 1e9:12.1f}"
+              f" {stats_seconds:8.3f} {stats_seconds / count * 1e9:13.1f} {len(stats['months']):7d}")
+
+
+if __name__ == '__main__':
+    main()
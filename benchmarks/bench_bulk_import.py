@@ -0,0 +1,57 @@
+# benchmarks/bench_bulk_import.py
+"""Import N transactions one POST at a time versus one bulk request.
+
+    python -m benchmarks.bench_bulk_import --rows 5000
+
+Both paths go through the Flask test client against the benchmark database,
+so the numbers include auth, validation, inserts and rollup upserts.
+"""
+import argparse
+import time
+
+from benchmarks.jwks_server import LocalJWKSServer
+from benchmarks.support import create_bench_app, prepare_database, seed_user, synthetic_transactions
+
+
+def payload(rows, seed):
+    return [
+        {
+            'amount': str(amount),
+            'date': day.isoformat(),
+            'description': description,
+            'category': category,
+        }
+        for amount, day, description, category in synthetic_transactions(rows, seed=seed)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    args = parser.parse_args()
+
+    with LocalJWKSServer() as server:
+        app = create_bench_app(server)
+        prepare_database(app)
+        seed_user(app, 'auth0|bench-import')
+        client = app.test_client()
+        headers = {'Authorization': f"Bearer {server.issue_token('auth0|bench-import')}"}
+
+        started = time.perf_counter()
+        for row in payload(args.rows, seed=1):
+            response = client.post('/api/transactions', json=row, headers=headers)
+            assert response.status_code == 201, response.get_json()
+        single = time.perf_counter() - started
+
+        started = time.perf_counter()
+        response = client.post('/api/transactions/bulk', json=payload(args.rows, seed=2), headers=headers)
+        assert response.status_code == 201, response.get_json()
+        bulk = time.perf_counter() - started
+
+    print(f"single inserts: {single:8.2f} s  ({args.rows / single:8.0f} rows/s)")
+    print(f"bulk import:    {bulk:8.2f} s  ({args.rows / bulk:8.0f} rows/s)")
+    print(f"speed-up:       {single / bulk:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
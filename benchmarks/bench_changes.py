@@ -0,0 +1,87 @@
+# benchmarks/bench_changes.py
+"""Delta sync versus re-downloading the full transaction list.
+
+    python -m benchmarks.bench_changes --rows 20000 --changes 10
+
+Seeds one user with ``--rows`` transactions and syncs them once through
+GET /api/transactions/changes the way the frontend does (paging until
+has_more is false). Then inserts ``--changes`` new transactions and
+compares a delta sync from the saved token with a full reload, in requests,
+bytes and time. Also checks the synced copy matches the full list.
+
+Needs migration 0006 (run with --reset or `flask migrate` first).
+"""
+import argparse
+import time
+
+from benchmarks.jwks_server import LocalJWKSServer
+from benchmarks.support import (
+    count_transactions, create_bench_app, prepare_database, seed_transactions, seed_user,
+)
+
+AUTH0_ID = 'auth0|bench-changes'
+
+
+def sync(client, headers, token=None, limit=500):
+    """Follow the change feed from ``token``; returns (rows by id, token, requests, bytes)."""
+    rows, requests, size = {}, 0, 0
+    while True:
+        query = f'limit={limit}' + (f'&since={token}' if token else '')
+        response = client.get(f'/api/transactions/changes?{query}', headers=headers)
+        assert response.status_code == 200, response.get_json()
+        requests += 1
+        size += len(response.data)
+
+        page = response.get_json()
+        rows.update((row['id'], row) for row in page['transactions'])
+        token = page['token']
+        if not page['has_more']:
+            return rows, token, requests, size
+        if page['retry_after']:
+            time.sleep(page['retry_after'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--changes', type=int, default=10)
+    parser.add_argument('--reset', action='store_true', help='drop and recreate the schema first')
+    args = parser.parse_args()
+
+    with LocalJWKSServer() as server:
+        # No settle window: changes are final as soon as this process commits them
+        app = create_bench_app(server, RESPONSE_CACHE_BACKEND='none', SYNC_SETTLE_WINDOW=0)
+        prepare_database(app, reset=args.reset)
+        user_id = seed_user(app, AUTH0_ID)
+        missing = args.rows - count_transactions(app, user_id)
+        if missing > 0:
+            seed_transactions(app, user_id, missing, seed=args.rows)
+
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {server.issue_token(AUTH0_ID)}'}
+
+        started = time.perf_counter()
+        synced, token, requests, size = sync(client, headers)
+        print(f"initial sync: {len(synced)} rows, {requests} requests, {size / 1024:.0f} KiB, "
+              f"{(time.perf_counter() - started) * 1000:.0f} ms")
+
+        seed_transactions(app, user_id, args.changes, seed=time.time_ns())
+
+        started = time.perf_counter()
+        delta, token, requests, size = sync(client, headers, token)
+        delta_ms = (time.perf_counter() - started) * 1000
+        synced.update(delta)
+
+        started = time.perf_counter()
+        response = client.get('/api/transactions', headers=headers)
+        full_ms = (time.perf_counter() - started) * 1000
+        full = response.get_json()
+
+        assert len(delta) >= args.changes, len(delta)
+        assert set(synced) == {row['id'] for row in full}, "synced copy differs from the full list"
+        print(f"delta sync:   {len(delta)} rows, {requests} requests, {size / 1024:.1f} KiB, {delta_ms:.1f} ms")
+        print(f"full reload:  {len(full)} rows, 1 request, {len(response.data) / 1024:.0f} KiB, {full_ms:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
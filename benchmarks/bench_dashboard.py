@@ -0,0 +1,89 @@
+# benchmarks/bench_dashboard.py
+"""Dashboard load latency: three API calls versus GET /api/dashboard.
+
+    python -m benchmarks.bench_dashboard --rows 20000 --iterations 300
+
+Seeds one user with ``--rows`` transactions and a household, rebuilds the
+rollups, then times the dashboard the way the front end used to load it
+(summary, recent transactions, households, one after another) against the
+consolidated endpoint. The response cache is off unless --response-cache
+is given, so both sides hit the database every time.
+"""
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+
+from benchmarks.jwks_server import LocalJWKSServer
+from benchmarks.support import (
+    count_transactions, create_bench_app, prepare_database, seed_household,
+    seed_transactions, seed_user,
+)
+
+AUTH0_ID = 'auth0|bench-dashboard'
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def time_requests(client, headers, paths, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        for path in paths:
+            response = client.get(path, headers=headers)
+            assert response.status_code == 200, (path, response.status_code, response.data[:200])
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--response-cache', action='store_true',
+                        help='leave the summary response cache on')
+    parser.add_argument('--reset', action='store_true', help='drop and recreate the schema first')
+    args = parser.parse_args()
+
+    overrides = {} if args.response_cache else {'RESPONSE_CACHE_BACKEND': 'none'}
+    start_date = (date.today() - timedelta(days=183)).isoformat()
+
+    with LocalJWKSServer() as server:
+        app = create_bench_app(server, **overrides)
+        prepare_database(app, reset=args.reset)
+
+        user_id = seed_user(app, AUTH0_ID)
+        missing = args.rows - count_transactions(app, user_id)
+        if missing > 0:
+            seed_transactions(app, user_id, missing, seed=args.rows)
+            seed_household(app, user_id)
+            with app.app_context():
+                from back_end.rollups import backfill
+                backfill()
+
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {server.issue_token(AUTH0_ID)}'}
+
+        three_calls = [
+            f'/api/transactions/summary?period=monthly&start_date={start_date}',
+            '/api/transactions?limit=5',
+            '/api/households',
+        ]
+        one_call = [f'/api/dashboard?period=monthly&start_date={start_date}&limit=5']
+
+        results = {}
+        for name, paths in (('three calls', three_calls), ('dashboard', one_call)):
+            time_requests(client, headers, paths, 10)  # warm up pool and caches
+            results[name] = time_requests(client, headers, paths, args.iterations)
+
+    for name, samples in results.items():
+        print(f"{name:12s} p50 {percentile(samples, 0.50) * 1000:7.2f} ms  "
+              f"p95 {percentile(samples, 0.95) * 1000:7.2f} ms  "
+              f"mean {statistics.mean(samples) * 1000:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_export.py
+"""Check that GET /api/transactions/export keeps memory flat as rows grow.
+
+    python -m benchmarks.bench_export --sizes 10000 100000 1000000
+
+Each size is exported in a fresh subprocess while the response body is
+consumed chunk by chunk. The run fails if peak RSS growth for the largest
+export exceeds the smallest one by more than --tolerance-mb.
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+
+from benchmarks.jwks_server import LocalJWKSServer
+from benchmarks.support import (
+    count_transactions, create_bench_app, peak_rss_mb, prepare_database,
+    seed_transactions, seed_user,
+)
+
+
+def _auth0_id(size):
+    return f'auth0|bench-export-{size}'
+
+
+def export(size, export_format, gzip, queue):
+    with LocalJWKSServer() as server:
+        app = create_bench_app(server)
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {server.issue_token(_auth0_id(size))}'}
+        if gzip:
+            headers['Accept-Encoding'] = 'gzip'
+        baseline_rss = peak_rss_mb()
+
+        started = time.perf_counter()
+        response = client.get(f'/api/transactions/export?format={export_format}',
+                              headers=headers, buffered=False)
+        received = 0
+        for chunk in response.response:
+            received += len(chunk)
+        response.close()
+
+        queue.put({
+            'rows': size,
+            'format': export_format,
+            'gzip': gzip,
+            'status': response.status_code,
+            'seconds': round(time.perf_counter() - started, 3),
+            'bytes': received,
+            'rss_growth_mb': round(peak_rss_mb() - baseline_rss, 1),
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default='csv')
+    parser.add_argument('--gzip', action='store_true')
+    parser.add_argument('--tolerance-mb', type=float, default=32.0)
+    args = parser.parse_args()
+
+    with LocalJWKSServer() as server:
+        app = create_bench_app(server)
+        prepare_database(app)
+        for size in args.sizes:
+            user_id = seed_user(app, _auth0_id(size))
+            missing = size - count_transactions(app, user_id)
+            if missing > 0:
+                seed_transactions(app, user_id, missing, seed=size)
+
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for size in sorted(args.sizes):
+        queue = context.Queue()
+        process = context.Process(target=export, args=(size, args.format, args.gzip, queue))
+        process.start()
+        results.append(queue.get())
+        process.join()
+        print(json.dumps(results[-1]))
+
+    growth = results[-1]['rss_growth_mb'] - results[0]['rss_growth_mb']
+    if growth > args.tolerance_mb:
+        print(f"FAIL: peak RSS grew {growth:.1f} MiB from {results[0]['rows']} "
+              f"to {results[-1]['rows']} rows")
+        sys.exit(1)
+    print(f"ok: peak RSS growth differs by {growth:.1f} MiB across sizes")
+
+
+if __name__ == '__main__':
+    main()
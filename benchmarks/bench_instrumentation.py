@@ -0,0 +1,46 @@
+# benchmarks/bench_instrumentation.py
+"""Per-query overhead of SQL instrumentation, on and off.
+
+    python -m benchmarks.bench_instrumentation --queries 200000
+
+Runs get_db_cursor() + execute() against benchmarks.fake_db (via
+MYSQL_CONNECTION_FACTORY) inside a request context, so only the
+instrumentation layer is measured.
+"""
+import argparse
+import time
+
+from back_end import create_app
+from back_end.database import get_db_cursor
+from benchmarks.fake_db import FakeDatabase
+from benchmarks.support import BenchConfig
+
+
+def run(queries, enabled):
+    config = BenchConfig()
+    config.MYSQL_CONNECTION_FACTORY = FakeDatabase().connect
+    config.SQL_INSTRUMENTATION = enabled
+    app = create_app(config_object=config)
+
+    with app.test_request_context('/'):
+        app.preprocess_request()
+        started = time.perf_counter()
+        for _ in range(queries):
+            with get_db_cursor() as cursor:
+                cursor.execute("SELECT id FROM users WHERE auth0_id = %s", ('auth0|x',))
+        return (time.perf_counter() - started) / queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--queries', type=int, default=200000)
+    args = parser.parse_args()
+
+    off = run(args.queries, enabled=False)
+    on = run(args.queries, enabled=True)
+    print(f"instrumentation off: {off * 1e6:7.2f} us/query")
+    print(f"instrumentation on:  {on * 1e6:7.2f} us/query  (+{(on - off) * 1e6:.2f} us)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# benchmarks/bench_jobs.py
+"""Background imports: 202 handoff latency, worker throughput and the per-user cap.
+
+    python -m benchmarks.bench_jobs --rows 5000 --users 4 --jobs-per-user 3 --processes 4
+
+Times a synchronous POST /api/transactions/bulk against the same import
+with background=true, which only queues the rows. Then starts ``--processes``
+job workers, queues ``--jobs-per-user`` imports for each of ``--users``
+users and waits for all of them, sampling the jobs table to check no user
+ever has more than JOB_MAX_RUNNING_PER_USER jobs running.
+
+Needs migration 0007 (run with --reset or `flask migrate` first).
+"""
+import argparse
+import multiprocessing
+import time
+
+from benchmarks.bench_bulk_import import payload
+from benchmarks.jwks_server import LocalJWKSServer
+from benchmarks.support import create_bench_app, prepare_database, seed_user
+
+RUNNING_BY_USER_QUERY = """
+    SELECT user_id, COUNT(*) AS running FROM jobs
+    WHERE status = 'running' AND id IN %s
+    GROUP BY user_id
+"""
+
+STATUS_QUERY = "SELECT status, COUNT(*) AS jobs FROM jobs WHERE id IN %s GROUP BY status"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--users', type=int, default=4)
+    parser.add_argument('--jobs-per-user', type=int, default=3)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--reset', action='store_true', help='drop and recreate the schema first')
+    args = parser.parse_args()
+
+    with LocalJWKSServer() as server:
+        app = create_bench_app(server, JOB_POLL_INTERVAL=0.1)
+        prepare_database(app, reset=args.reset)
+        client = app.test_client()
+
+        auth0_ids = [f'auth0|bench-jobs-{index}' for index in range(args.users)]
+        for auth0_id in auth0_ids:
+            seed_user(app, auth0_id)
+        headers = [{'Authorization': f'Bearer {server.issue_token(auth0_id)}'} for auth0_id in auth0_ids]
+
+        started = time.perf_counter()
+        response = client.post('/api/transactions/bulk', json=payload(args.rows, seed=1), headers=headers[0])
+        assert response.status_code == 201, response.get_json()
+        sync_ms = (time.perf_counter() - started) * 1000
+
+        job_ids = []
+        started = time.perf_counter()
+        response = client.post('/api/transactions/bulk?background=true',
+                               json=payload(args.rows, seed=2), headers=headers[0])
+        assert response.status_code == 202, response.get_json()
+        queued_ms = (time.perf_counter() - started) * 1000
+        job_ids.append(response.get_json()['id'])
+
+        print(f"synchronous import: {sync_ms:8.1f} ms")
+        print(f"queued (202):       {queued_ms:8.1f} ms")
+
+        for index, user_headers in enumerate(headers):
+            for job in range(args.jobs_per_user - (1 if index == 0 else 0)):
+                response = client.post('/api/transactions/bulk?background=true',
+                                       json=payload(args.rows, seed=index * 100 + job + 3), headers=user_headers)
+                assert response.status_code == 202, response.get_json()
+                job_ids.append(response.get_json()['id'])
+
+        from back_end.database import get_db_cursor
+        from back_end.jobs import work
+        import back_end.tasks  # noqa: F401
+
+        context = multiprocessing.get_context('fork')
+        stop = context.Event()
+        workers = [context.Process(target=work, args=(app, index, stop)) for index in range(args.processes)]
+
+        started = time.perf_counter()
+        for process in workers:
+            process.start()
+
+        cap = app.config['JOB_MAX_RUNNING_PER_USER']
+        peak = 0
+        try:
+            while True:
+                with app.app_context():
+                    with get_db_cursor(primary=True) as cursor:
+                        cursor.execute(RUNNING_BY_USER_QUERY, (job_ids,))
+                        running = cursor.fetchall()
+                        cursor.execute(STATUS_QUERY, (job_ids,))
+                        statuses = {row['status']: row['jobs'] for row in cursor.fetchall()}
+
+                peak = max([peak] + [row['running'] for row in running])
+                assert peak <= cap, f"a user had {peak} jobs running (cap {cap})"
+                if statuses.get('succeeded', 0) + statuses.get('failed', 0) == len(job_ids):
+                    break
+                time.sleep(0.05)
+        finally:
+            stop.set()
+            for process in workers:
+                process.join()
+        elapsed = time.perf_counter() - started
+
+    assert statuses.get('failed', 0) == 0, statuses
+    print(f"{len(job_ids)} jobs on {args.processes} worker(s): {elapsed:.1f} s, "
+          f"{len(job_ids) * args.rows / elapsed:.0f} rows/s")
+    print(f"peak running jobs per user: {peak} (cap {cap})")
+
+
+if __name__ == '__main__':
+    main()
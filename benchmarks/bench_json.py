@@ -0,0 +1,82 @@
+# benchmarks/bench_json.py
+"""Serialize transaction rows with Flask's default JSON provider versus orjson.
+
+    python -m benchmarks.bench_json --rows 100000
+
+Rows look like DictCursor output from GET /api/transactions (Decimal
+amounts, DATE and TIMESTAMP values). Each provider is timed on dumps() and
+on building the full jsonify() response; no database is needed.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from back_end.json_provider import OrjsonProvider
+from benchmarks.support import synthetic_transactions
+
+
+def transaction_rows(count):
+    rng = random.Random(7)
+    created = datetime(2024, 1, 1, 12, 0, 0)
+    rows = []
+    for index, (amount, day, description, category) in enumerate(synthetic_transactions(count), start=1):
+        rows.append({
+            'id': index,
+            'user_id': 1,
+            'amount': amount.quantize(Decimal('0.01')),
+            'date': day,
+            'description': description,
+            'category': category,
+            'household_id': rng.choice([None, 1, 2]),
+            'created_at': created + timedelta(seconds=index),
+            'user_name': 'bench_user',
+        })
+    return rows
+
+
+def best_of(repeats, fn):
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = transaction_rows(args.rows)
+    app = Flask(__name__)
+
+    providers = {
+        'flask default': DefaultJSONProvider(app),
+        'orjson (string)': OrjsonProvider(app),
+    }
+    app.config['JSON_DECIMAL_MODE'] = 'float'
+    providers['orjson (float)'] = OrjsonProvider(app)
+
+    results = {}
+    with app.app_context():
+        for name, provider in providers.items():
+            dumps_time, body = best_of(args.repeats, lambda: provider.dumps(rows))
+            response_time, _ = best_of(args.repeats, lambda: provider.response(rows))
+            results[name] = (dumps_time, response_time, len(body))
+
+    baseline = results['flask default'][1]
+    for name, (dumps_time, response_time, size) in results.items():
+        print(f"{name:16s} dumps {dumps_time * 1000:8.1f} ms  response {response_time * 1000:8.1f} ms  "
+              f"{size / 1e6:6.1f} MB  {baseline / response_time:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
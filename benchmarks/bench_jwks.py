@@ -0,0 +1,54 @@
+# benchmarks/bench_jwks.py
+"""Compare cold and warm JWKS key lookups against the local stand-in.
+
+    python -m benchmarks.bench_jwks --iterations 2000 --latency 0.05
+
+The cold path fetches and parses the key set for every lookup, which is what
+``requires_auth`` used to do; the warm path is served from ``JWKSCache``.
+"""
+import argparse
+import time
+
+from back_end.jwks import JWKSCache
+from benchmarks.jwks_server import LocalJWKSServer
+
+
+def run(iterations, latency):
+    with LocalJWKSServer(latency=latency) as server:
+        cold = []
+        for _ in range(min(iterations, 200)):
+            cache = JWKSCache(server.url)
+            started = time.perf_counter()
+            assert cache.get_key(server.kid) is not None
+            cold.append(time.perf_counter() - started)
+
+        cache = JWKSCache(server.url)
+        cache.get_key(server.kid)
+        warm = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            cache.get_key(server.kid)
+            warm.append(time.perf_counter() - started)
+
+        return {
+            'cold_mean_ms': 1000 * sum(cold) / len(cold),
+            'warm_mean_ms': 1000 * sum(warm) / len(warm),
+            'jwks_requests': server.requests,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='artificial JWKS response delay in seconds')
+    args = parser.parse_args()
+
+    result = run(args.iterations, args.latency)
+    print(f"cold lookup: {result['cold_mean_ms']:.3f} ms")
+    print(f"warm lookup: {result['warm_mean_ms']:.4f} ms")
+    print(f"JWKS requests served: {result['jwks_requests']}")
+
+
+if __name__ == '__main__':
+    main()
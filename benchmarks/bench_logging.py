@@ -0,0 +1,95 @@
+# benchmarks/bench_logging.py
+"""Requests per second with print() debugging versus the queued logger.
+
+    python -m benchmarks.bench_logging --requests 20000 --threads 8
+
+Two routes each emit ten diagnostics per request, like requires_auth used
+to: one with print() to a line-buffered file (stdout under a process
+manager), one with logger.debug through the same queue, JSON formatter and
+sampling as Config.init_logging. Runs through the Flask test client from
+several threads, no database needed.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from flask import Flask, jsonify
+
+from back_end.log import JsonFormatter, start_queue_logging, stop_queue_logging
+
+MESSAGES = 10
+
+
+def create_bench_app(print_file):
+    app = Flask(__name__)
+    logger = logging.getLogger('back_end.bench')
+
+    @app.route('/print')
+    def print_route():
+        for i in range(MESSAGES):
+            print(f"JWT header: {{'alg': 'RS256', 'kid': 'bench'}} step={i}", file=print_file, flush=True)
+        return jsonify(ok=True)
+
+    @app.route('/log')
+    def log_route():
+        for i in range(MESSAGES):
+            logger.debug("JWT header", extra={'kid': 'bench', 'alg': 'RS256', 'step': i})
+        return jsonify(ok=True)
+
+    return app
+
+
+def run(app, path, requests, threads):
+    per_thread = requests // threads
+
+    def worker():
+        client = app.test_client()
+        for _ in range(per_thread):
+            client.get(path)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return per_thread * threads / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--sample-every', type=int, default=1,
+                        help='LOG_DEBUG_SAMPLE_EVERY for the queued logger')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Same queue, formatter and sampling as Config.init_logging, minus
+        # the stderr handler so both sides only write to a file
+        handler = logging.FileHandler(os.path.join(tmp, 'app.log'))
+        handler.setFormatter(JsonFormatter())
+        logger = logging.getLogger('back_end')
+        logger.setLevel(logging.DEBUG)
+        start_queue_logging(logger, [handler], sample_every=args.sample_every)
+
+        try:
+            with open(os.path.join(tmp, 'stdout.log'), 'w', buffering=1) as print_file:
+                app = create_bench_app(print_file)
+                results = {}
+                for name, path in (('print()', '/print'), ('queued logger', '/log')):
+                    run(app, path, min(args.requests, 500), args.threads)  # warm up
+                    results[name] = run(app, path, args.requests, args.threads)
+        finally:
+            stop_queue_logging()
+
+    for name, rate in results.items():
+        print(f"{name:14s} {rate:9.0f} req/s")
+    print(f"speedup: {results['queued logger'] / results['print()']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
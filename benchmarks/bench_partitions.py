@@ -0,0 +1,105 @@
+# benchmarks/bench_partitions.py
+"""Partition pruning on the date-range filters once old history is archived.
+
+    python -m benchmarks.bench_partitions --rows 1000000 --archive-after-days 365
+
+Seeds one user with ``--rows`` transactions spread over five years, creates
+the archive partitions and archives everything older than
+``--archive-after-days``. Then, for each date range, EXPLAINs the archive
+side of the list query to show which monthly partitions it reads and times
+GET /api/transactions and the raw-table summary end to end.
+
+Needs migration 0005 (run with --reset or `flask migrate` first).
+"""
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+
+from benchmarks.jwks_server import LocalJWKSServer
+from benchmarks.support import (
+    count_transactions, create_bench_app, prepare_database, seed_transactions, seed_user,
+)
+
+AUTH0_ID = 'auth0|bench-partitions'
+
+ARCHIVE_EXPLAIN = """
+    EXPLAIN SELECT t.id FROM transactions_archive t
+    WHERE t.user_id = %s AND t.date >= %s AND t.date <= %s
+"""
+
+
+def median_ms(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def date_ranges(today):
+    """(label, start, end) ranges from inside the hot window back to full history."""
+    return [
+        ('last 30 days', today - timedelta(days=30), today),
+        ('last 6 months', today - timedelta(days=182), today),
+        ('month, 2y ago', today - timedelta(days=730), today - timedelta(days=700)),
+        ('year, 3y ago', today - timedelta(days=1095), today - timedelta(days=730)),
+        ('all history', today - timedelta(days=365 * 6), today),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--archive-after-days', type=int, default=365)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--reset', action='store_true', help='drop and recreate the schema first')
+    args = parser.parse_args()
+
+    with LocalJWKSServer() as server:
+        app = create_bench_app(server, RESPONSE_CACHE_BACKEND='none', SUMMARY_FROM_ROLLUPS=False,
+                               ARCHIVE_AFTER_DAYS=args.archive_after_days)
+        prepare_database(app, reset=args.reset)
+        user_id = seed_user(app, AUTH0_ID)
+        missing = args.rows - count_transactions(app, user_id)
+        if missing > 0:
+            seed_transactions(app, user_id, missing, seed=args.rows)
+
+        from back_end.archive import archive_transactions, ensure_partitions, get_partition_bounds
+        from back_end.database import get_db_cursor
+
+        with app.app_context():
+            ensure_partitions()
+            started = time.perf_counter()
+            moved = archive_transactions()
+            print(f"archived {moved} row(s) in {time.perf_counter() - started:.1f}s, "
+                  f"{len(get_partition_bounds()) + 1} partitions")
+
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {server.issue_token(AUTH0_ID)}'}
+
+        print(f"{'range':14s} {'partitions read':>16s} {'est rows':>9s} {'list ms':>8s} {'summary ms':>11s}")
+        for label, start, end in date_ranges(date.today()):
+            with app.app_context():
+                with get_db_cursor() as cursor:
+                    cursor.execute(ARCHIVE_EXPLAIN, (user_id, start, end))
+                    plan = cursor.fetchone()
+            partitions = plan['partitions'].split(',') if plan['partitions'] else []
+
+            query = f'start_date={start.isoformat()}&end_date={end.isoformat()}'
+
+            def listing():
+                response = client.get(f'/api/transactions?{query}&limit=100', headers=headers)
+                assert response.status_code == 200, response.get_json()
+
+            def summary():
+                response = client.get(f'/api/transactions/summary?{query}', headers=headers)
+                assert response.status_code == 200, response.get_json()
+
+            print(f"{label:14s} {len(partitions):16d} {plan['rows'] or 0:9d} "
+                  f"{median_ms(listing, args.repeats):8.1f} {median_ms(summary, args.repeats):11.1f}")
+
+
+if __name__ == '__main__':
+    main()
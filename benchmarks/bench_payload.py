@@ -0,0 +1,61 @@
+# benchmarks/bench_payload.py
+"""Payload size of transaction lists: row objects vs columnar, identity vs gzip/br.
+
+    python -m benchmarks.bench_payload --rows 100 500 5000
+
+Builds realistic GET /api/transactions pages (the same synthetic rows as
+bench_json) and runs them through the real JSON provider, the columnar
+formatter and the compression middleware's encoder. Also times how long
+the JSON text takes to parse, as a stand-in for client parse time.
+"""
+import argparse
+import json
+import time
+
+from flask import Flask
+
+from back_end.columnar import to_columnar
+from back_end.compression import brotli, compress
+from back_end.config import Config
+from back_end.json_provider import OrjsonProvider
+from back_end.transactions import TRANSACTION_COLUMNS
+from benchmarks.bench_json import transaction_rows
+
+
+def parse_ms(body, repeats=5):
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        json.loads(body)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 500, 5000])
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    provider = OrjsonProvider(app)
+    encodings = ['gzip'] + (['br'] if brotli is not None else [])
+
+    header = f"{'rows':>6s} {'format':9s} {'identity':>10s}" + ''.join(f" {e:>10s}" for e in encodings)
+    print(header + f" {'parse ms':>9s}")
+
+    for count in args.rows:
+        rows = transaction_rows(count)
+        payloads = {
+            'rows': provider.dumps_bytes(rows),
+            'columnar': provider.dumps_bytes(to_columnar(rows, TRANSACTION_COLUMNS)),
+        }
+        for name, body in payloads.items():
+            sizes = [len(compress(body, encoding, app.config)) for encoding in encodings]
+            print(f"{count:6d} {name:9s} {len(body):10d}" + ''.join(f" {size:10d}" for size in sizes)
+                  + f" {parse_ms(body):9.2f}")
+
+
+if __name__ == '__main__':
+    main()
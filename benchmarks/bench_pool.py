@@ -0,0 +1,65 @@
+# benchmarks/bench_pool.py
+"""Measure checkout cost with and without the connection pool.
+
+    python -m benchmarks.bench_pool --threads 16 --handshake 0.005
+
+Uses benchmarks.fake_db connections that sleep for ``--handshake`` seconds
+on connect to stand in for the TCP and MySQL auth round trips. Pass
+``--real`` to connect with pymysql using the MYSQL_* settings instead.
+"""
+import argparse
+import threading
+import time
+
+from back_end.pool import ConnectionPool
+from benchmarks.fake_db import FakeDatabase
+
+
+def drive(checkout, release, threads, per_thread):
+    def worker():
+        for _ in range(per_thread):
+            connection = checkout()
+            release(connection)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for worker_thread in workers:
+        worker_thread.start()
+    for worker_thread in workers:
+        worker_thread.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--per-thread', type=int, default=200)
+    parser.add_argument('--pool-size', type=int, default=5)
+    parser.add_argument('--handshake', type=float, default=0.005)
+    parser.add_argument('--real', action='store_true',
+                        help='connect to MySQL using the MYSQL_* settings')
+    args = parser.parse_args()
+
+    if args.real:
+        import functools
+        from back_end import create_app
+        from back_end.database import get_db_config
+        import pymysql
+        factory = functools.partial(pymysql.connect, **get_db_config(create_app()))
+    else:
+        factory = FakeDatabase(handshake=args.handshake).connect
+
+    total = args.threads * args.per_thread
+
+    elapsed = drive(factory, lambda connection: connection.close(),
+                    args.threads, args.per_thread)
+    print(f"connect per checkout: {total / elapsed:8.0f} checkouts/s")
+
+    pool = ConnectionPool(factory, size=args.pool_size, timeout=30)
+    elapsed = drive(pool.acquire, pool.release, args.threads, args.per_thread)
+    print(f"pooled ({args.pool_size:>2} conns):   {total / elapsed:8.0f} checkouts/s")
+    print(pool.metrics())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_preflight.py
+"""CORS preflight cost: no view, auth or SQL may run for OPTIONS.
+
+    python -m benchmarks.bench_preflight --requests 20000
+
+Uses a fake connection factory (MYSQL_CONNECTION_FACTORY) that counts
+connections and queries, so no MySQL is needed. Sends a preflight to every
+/api route and fails if any of them opened a connection, ran a query or
+came back without the configured CORS headers; then times preflights.
+"""
+import argparse
+import time
+
+from back_end import create_app
+from benchmarks.fake_db import FakeDatabase
+from benchmarks.support import BenchConfig, api_paths, preflight
+
+ORIGIN = 'http://localhost:3000'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    database = FakeDatabase()
+    config = BenchConfig()
+    config.CORS_ENABLED = True
+    config.CORS_ORIGINS = [ORIGIN]
+    config.MYSQL_CONNECTION_FACTORY = database.connect
+    app = create_app(config_object=config)
+    client = app.test_client()
+
+    paths = api_paths(app)
+    for path in paths:
+        response = preflight(client, path, ORIGIN, 'POST')
+        assert response.status_code == 204, (path, response.status_code)
+        assert response.headers['Access-Control-Allow-Origin'] == ORIGIN, (path, dict(response.headers))
+        assert 'Authorization' in response.headers['Access-Control-Allow-Headers'], path
+    assert database.counts() == {'connections': 0, 'queries': 0}, database.counts()
+
+    response = client.options('/api/transactions', headers={
+        'Origin': 'https://evil.example', 'Access-Control-Request-Method': 'GET',
+    })
+    assert 'Access-Control-Allow-Origin' not in response.headers, dict(response.headers)
+    print(f"preflight checks passed for {len(paths)} routes: 0 connections, 0 queries")
+
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        preflight(client, '/api/transactions', ORIGIN)
+    elapsed = time.perf_counter() - started
+    print(f"per preflight: {elapsed / args.requests * 1e6:.1f} us")
+    assert database.counts() == {'connections': 0, 'queries': 0}, database.counts()
+
+
+if __name__ == '__main__':
+    main()
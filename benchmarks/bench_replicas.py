@@ -0,0 +1,109 @@
+# benchmarks/bench_replicas.py
+"""Exercise read/write routing across a primary and two replicas.
+
+    python -m benchmarks.bench_replicas --reads 20000
+
+Uses fake connection factories (MYSQL_CONNECTION_FACTORY and
+MYSQL_REPLICA_CONNECTION_FACTORIES), so no MySQL is needed. Checks that
+reads are spread over the replicas, writes and the writer's follow-up reads
+go to the primary, and a dead replica fails over; then reports how many
+reads each server took and the per-read routing overhead.
+"""
+import argparse
+import time
+from collections import Counter
+
+from flask import g
+
+from back_end import create_app
+from back_end.database import get_db_cursor, get_replicas, reset_pool
+from benchmarks.fake_db import FakeDatabase
+from benchmarks.support import BenchConfig
+
+
+def served(servers):
+    """Queries each server has answered since the last reset_served()."""
+    return Counter({name: server.queries for name, server in servers.items() if server.queries})
+
+
+def reset_served(servers):
+    for server in servers.values():
+        server.reset_counts()
+
+
+def read(app, user_id=None, cookies=None):
+    headers = {'Cookie': '; '.join(f'{k}={v}' for k, v in (cookies or {}).items())}
+    with app.test_request_context('/', headers=headers):
+        g.internal_user_id = user_id
+        with get_db_cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reads', type=int, default=20000)
+    args = parser.parse_args()
+
+    servers = {name: FakeDatabase(name) for name in ('primary', 'replica-1', 'replica-2')}
+    config = BenchConfig()
+    config.MYSQL_CONNECTION_FACTORY = servers['primary'].connect
+    config.MYSQL_REPLICA_CONNECTION_FACTORIES = [servers['replica-1'].connect,
+                                                 servers['replica-2'].connect]
+    config.READ_YOUR_WRITES_WINDOW = 2
+    app = create_app(config_object=config)
+
+    # Reads are spread over the replicas
+    reset_served(servers)
+    for _ in range(100):
+        read(app)
+    counts = served(servers)
+    assert counts['primary'] == 0 and counts['replica-1'] == counts['replica-2'] == 50, counts
+
+    # A write and the writer's next reads go to the primary; other users keep using replicas
+    reset_served(servers)
+    with app.test_request_context('/'):
+        g.internal_user_id = 42
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute("INSERT INTO transactions VALUES (1)")
+        with get_db_cursor() as cursor:
+            cursor.execute("SELECT 1")
+    read(app, user_id=42)
+    read(app, user_id=7)
+    counts = served(servers)
+    assert counts['primary'] == 3 and counts['replica-1'] + counts['replica-2'] == 1, counts
+
+    # The cookie pins a writer whose next request lands on another worker
+    reset_served(servers)
+    read(app, user_id=99, cookies={config.READ_PRIMARY_COOKIE: int(time.time()) + 2})
+    counts = served(servers)
+    assert counts == Counter({'primary': 1}), counts
+
+    # A dead replica is skipped; with none left, reads fail over to the primary
+    reset_served(servers)
+    servers['replica-1'].alive = False
+    for _ in range(10):
+        read(app)
+    counts = served(servers)
+    assert counts == Counter({'replica-2': 10}), counts
+    servers['replica-2'].alive = False
+    for _ in range(10):
+        read(app)
+    counts = served(servers)
+    assert counts['primary'] == 10, counts
+    servers['replica-1'].alive = servers['replica-2'].alive = True
+    print("routing checks passed")
+
+    # Routing overhead per read, replicas healthy again after a reset
+    reset_pool(app)
+    reset_served(servers)
+    started = time.perf_counter()
+    for _ in range(args.reads):
+        read(app)
+    elapsed = time.perf_counter() - started
+    print(f"reads served: {dict(served(servers))}")
+    print(f"per read: {elapsed / args.reads * 1e6:.1f} us")
+    print(f"replica metrics: {get_replicas(app).metrics()['failovers']} failovers")
+
+
+if __name__ == '__main__':
+    main()
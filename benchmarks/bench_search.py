@@ -0,0 +1,105 @@
+# benchmarks/bench_search.py
+"""FULLTEXT search versus a LIKE '%term%' scan over one user's transactions.
+
+    python -m benchmarks.bench_search --rows 1000000
+
+Seeds one user with ``--rows`` synthetic transactions (descriptions like
+"Amazon #1234"), then for each term times:
+
+* ``like``     - description LIKE '%term%' scoped to the user, newest first
+* ``fulltext`` - the MATCH ... AGAINST query behind /api/transactions/search
+* ``endpoint`` - GET /api/transactions/search end to end
+
+Needs migration 0004 (run with --reset or `flask migrate` first).
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.jwks_server import LocalJWKSServer
+from benchmarks.support import (
+    count_transactions, create_bench_app, prepare_database, seed_transactions, seed_user,
+)
+
+AUTH0_ID = 'auth0|bench-search'
+
+LIKE_QUERY = """
+    SELECT t.id, t.amount, t.date, t.description
+    FROM transactions t
+    WHERE t.user_id = %s AND t.description LIKE %s
+    ORDER BY t.date DESC, t.created_at DESC, t.id DESC
+    LIMIT %s
+"""
+
+FULLTEXT_QUERY = """
+    SELECT t.id, t.amount, t.date, t.description,
+           MATCH (t.description) AGAINST (%s IN BOOLEAN MODE) as score
+    FROM transactions t
+    WHERE MATCH (t.description) AGAINST (%s IN BOOLEAN MODE) AND t.user_id = %s
+    ORDER BY score DESC, t.date DESC, t.created_at DESC, t.id DESC
+    LIMIT %s
+"""
+
+
+def median_ms(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--terms', nargs='+', default=['amazon', 'whole foods', 'depot', 'spotify'])
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--reset', action='store_true', help='drop and recreate the schema first')
+    args = parser.parse_args()
+
+    with LocalJWKSServer() as server:
+        app = create_bench_app(server, RESPONSE_CACHE_BACKEND='none')
+        prepare_database(app, reset=args.reset)
+        user_id = seed_user(app, AUTH0_ID)
+        missing = args.rows - count_transactions(app, user_id)
+        if missing > 0:
+            seed_transactions(app, user_id, missing, seed=args.rows)
+
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {server.issue_token(AUTH0_ID)}'}
+
+        from back_end.database import get_db_cursor
+        from back_end.routes.transactions import fulltext_terms
+
+        print(f"{'term':14s} {'like ms':>10s} {'fulltext ms':>12s} {'endpoint ms':>12s} {'speed-up':>9s}")
+        for term in args.terms:
+            with app.test_request_context('/'):
+                boolean_query = fulltext_terms(term)
+
+                def like():
+                    with get_db_cursor() as cursor:
+                        cursor.execute(LIKE_QUERY, (user_id, f'%{term}%', args.limit))
+                        cursor.fetchall()
+
+                def fulltext():
+                    with get_db_cursor() as cursor:
+                        cursor.execute(FULLTEXT_QUERY, (boolean_query, boolean_query, user_id, args.limit))
+                        cursor.fetchall()
+
+                like_ms = median_ms(like, args.repeats)
+                fulltext_ms = median_ms(fulltext, args.repeats)
+
+            def endpoint():
+                response = client.get(f'/api/transactions/search?q={term}&limit={args.limit}',
+                                      headers=headers)
+                assert response.status_code == 200, response.get_json()
+
+            endpoint_ms = median_ms(endpoint, args.repeats)
+            print(f"{term:14s} {like_ms:10.1f} {fulltext_ms:12.1f} {endpoint_ms:12.1f} "
+                  f"{like_ms / fulltext_ms:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
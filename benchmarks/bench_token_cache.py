@@ -0,0 +1,71 @@
+# benchmarks/bench_token_cache.py
+"""Compare verify-per-request with the verified-token cache.
+
+    python -m benchmarks.bench_token_cache --requests 3000
+
+Runs a bare route behind ``requires_auth`` through the Flask test client,
+once with ``TOKEN_CACHE_SIZE = 0`` and once with the cache enabled, reusing
+one token the way the dashboard does. benchmarks.fake_db answers the user id
+lookup, so no MySQL is needed.
+"""
+import argparse
+import time
+
+from flask import g, jsonify
+
+from back_end.auth import get_token_cache, requires_auth
+from back_end.cache import reset_named_caches
+from benchmarks.fake_db import FakeDatabase
+from benchmarks.jwks_server import LocalJWKSServer
+from benchmarks.support import create_bench_app
+
+
+def build_app(server, cache_size):
+    # requires_auth looks up the internal user id; the fake answers that lookup
+    database = FakeDatabase(rows=[{'id': 1}])
+    app = create_bench_app(server, TOKEN_CACHE_SIZE=cache_size,
+                           MYSQL_CONNECTION_FACTORY=database.connect)
+
+    @app.route('/whoami')
+    @requires_auth
+    def whoami():
+        return jsonify({'sub': g.user_id})
+
+    return app
+
+
+def run(requests, cache_size, server, token):
+    reset_named_caches()
+    app = build_app(server, cache_size)
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = client.get('/whoami', headers=headers)
+        assert response.status_code == 200, response.get_json()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        cache = get_token_cache(app.config)
+        stats = cache.stats() if cache is not None else None
+    return elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=3000)
+    args = parser.parse_args()
+
+    with LocalJWKSServer() as server:
+        token = server.issue_token('auth0|bench-user')
+        for label, cache_size in (('verify every request', 0), ('cached', 10000)):
+            elapsed, stats = run(args.requests, cache_size, server, token)
+            line = f"{label:>22}: {args.requests / elapsed:8.0f} req/s"
+            if stats:
+                line += f"  (hits={stats['hits']} misses={stats['misses']})"
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_transactions_list.py
+"""Latency and peak RSS of GET /api/transactions at growing history sizes.
+
+    python -m benchmarks.bench_transactions_list --sizes 10000 100000 1000000
+
+For each size a dedicated user is seeded once, then every mode runs in a
+fresh subprocess so its peak RSS is not polluted by the previous one:
+
+* ``full``   - the unpaginated fetchall response
+* ``page``   - first keyset page (``limit``), then a follow-up page via cursor
+* ``stream`` - the whole list streamed through a server-side cursor
+"""
+import argparse
+import json
+import multiprocessing
+import time
+
+from benchmarks.jwks_server import LocalJWKSServer
+from benchmarks.support import (
+    count_transactions, create_bench_app, peak_rss_mb, prepare_database,
+    seed_transactions, seed_user,
+)
+
+MODES = ('full', 'page', 'stream')
+
+
+def _auth0_id(size):
+    return f'auth0|bench-list-{size}'
+
+
+def measure(mode, size, page_size, queue):
+    with LocalJWKSServer() as server:
+        app = create_bench_app(server)
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {server.issue_token(_auth0_id(size))}'}
+        baseline_rss = peak_rss_mb()
+
+        started = time.perf_counter()
+        if mode == 'full':
+            response = client.get('/api/transactions', headers=headers)
+            received = len(response.data)
+        elif mode == 'page':
+            response = client.get(f'/api/transactions?limit={page_size}', headers=headers)
+            next_cursor = response.headers.get('X-Next-Cursor')
+            received = len(response.data)
+            if next_cursor:
+                response = client.get(
+                    f'/api/transactions?limit={page_size}&cursor={next_cursor}',
+                    headers=headers
+                )
+                received += len(response.data)
+        else:
+            response = client.get('/api/transactions?stream=true', headers=headers,
+                                  buffered=False)
+            received = sum(len(chunk) for chunk in response.response)
+        elapsed = time.perf_counter() - started
+
+        queue.put({
+            'mode': mode,
+            'rows': size,
+            'status': response.status_code,
+            'seconds': round(elapsed, 4),
+            'bytes': received,
+            'rss_growth_mb': round(peak_rss_mb() - baseline_rss, 1),
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--reset', action='store_true', help='drop and recreate the schema first')
+    args = parser.parse_args()
+
+    with LocalJWKSServer() as server:
+        app = create_bench_app(server)
+        prepare_database(app, reset=args.reset)
+        for size in args.sizes:
+            user_id = seed_user(app, _auth0_id(size))
+            missing = size - count_transactions(app, user_id)
+            if missing > 0:
+                seed_transactions(app, user_id, missing, seed=size)
+
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for size in args.sizes:
+        for mode in MODES:
+            queue = context.Queue()
+            process = context.Process(target=measure, args=(mode, size, args.page_size, queue))
+            process.start()
+            results.append(queue.get())
+            process.join()
+            print(json.dumps(results[-1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/fake_db.py
+"""A stand-in MySQL server for MYSQL_CONNECTION_FACTORY and the pool.
+
+``FakeDatabase.connect`` returns connections whose cursors answer every
+query with ``rows`` and count what they ran, so the routing, pooling and
+preflight checks in benchmarks and tests need no MySQL. Setting ``alive``
+to False makes connects, pings and new cursors fail the way a lost server
+does.
+"""
+import time
+
+import pymysql
+
+
+class FakeCursor:
+    rowcount = 1
+    lastrowid = 1
+
+    def __init__(self, database):
+        self.database = database
+
+    def execute(self, query, args=None):
+        self.database.queries += 1
+        return self.rowcount
+
+    def executemany(self, query, args):
+        self.database.queries += 1
+        return len(args)
+
+    def fetchone(self):
+        return dict(self.database.rows[0]) if self.database.rows else None
+
+    def fetchall(self):
+        return [dict(row) for row in self.database.rows]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, database):
+        self.database = database
+
+    def cursor(self, cursorclass=None):
+        if not self.database.alive:
+            raise pymysql.err.OperationalError(2013, f"Lost connection to {self.database.name}")
+        return FakeCursor(self.database)
+
+    def ping(self, reconnect=False):
+        if not self.database.alive:
+            raise pymysql.err.OperationalError(2006, f"{self.database.name} has gone away")
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeDatabase:
+    """Counts connections and queries; ``handshake`` seconds are slept per connect."""
+
+    def __init__(self, name='primary', rows=(), handshake=0):
+        self.name = name
+        self.rows = list(rows)
+        self.handshake = handshake
+        self.alive = True
+        self.connections = 0
+        self.queries = 0
+
+    def connect(self):
+        if not self.alive:
+            raise pymysql.err.OperationalError(2003, f"Can't connect to {self.name}")
+        if self.handshake:
+            time.sleep(self.handshake)
+        self.connections += 1
+        return FakeConnection(self)
+
+    def counts(self):
+        return {'connections': self.connections, 'queries': self.queries}
+
+    def reset_counts(self):
+        self.connections = 0
+        self.queries = 0
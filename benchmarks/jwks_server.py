@@ -0,0 +1,113 @@
+# benchmarks/jwks_server.py
+"""Local stand-in for the Auth0 JWKS endpoint.
+
+Generates an RSA key pair, serves its public half at
+``/.well-known/jwks.json`` on a loopback port and signs tokens the way Auth0
+would, so ``requires_auth`` can be exercised without a network.
+"""
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+
+def _b64_uint(value):
+    """Encode an integer as unpadded base64url, as JWKs expect."""
+    raw = value.to_bytes((value.bit_length() + 7) // 8, byteorder='big')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+class LocalJWKSServer:
+    """Serve a JWKS document and sign tokens with the matching private key."""
+
+    def __init__(self, domain='bench.local', audience='bench-api', kid='bench-key',
+                 latency=0.0):
+        self.domain = domain
+        self.audience = audience
+        self.kid = kid
+        self.latency = latency
+        self.requests = 0
+        self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._server = None
+        self._thread = None
+
+    @property
+    def jwks(self):
+        numbers = self._private_key.public_key().public_numbers()
+        return {
+            'keys': [{
+                'kty': 'RSA',
+                'use': 'sig',
+                'alg': 'RS256',
+                'kid': self.kid,
+                'n': _b64_uint(numbers.n),
+                'e': _b64_uint(numbers.e),
+            }]
+        }
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}/.well-known/jwks.json'
+
+    def config(self):
+        """App config overrides pointing the auth layer at this server."""
+        return {
+            'AUTH0_DOMAIN': self.domain,
+            'AUTH0_API_AUDIENCE': self.audience,
+            'AUTH0_ALGORITHMS': ['RS256'],
+            'AUTH0_JWKS_URL': self.url,
+        }
+
+    def issue_token(self, sub, lifetime=3600, **claims):
+        """Sign an access token for ``sub`` accepted by ``requires_auth``."""
+        now = int(time.time())
+        payload = {
+            'sub': sub,
+            'aud': self.audience,
+            'iss': f'https://{self.domain}/',
+            'iat': now,
+            'exp': now + lifetime,
+        }
+        payload.update(claims)
+        return jwt.encode(payload, self._private_key, algorithm='RS256',
+                          headers={'kid': self.kid})
+
+    def start(self):
+        body = json.dumps(self.jwks).encode('utf-8')
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests += 1
+                if stand_in.latency:
+                    time.sleep(stand_in.latency)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,515 @@
+# benchmarks/loadtest.py
+"""Concurrent load test of every API blueprint with JSON results.
+
+    python -m benchmarks.loadtest run --users 20 --transactions 2000 \\
+        --concurrency 8 --requests 400 --output before.json
+    python -m benchmarks.loadtest run --output after.json --baseline before.json
+    python -m benchmarks.loadtest compare before.json after.json --threshold 0.15
+
+``run`` seeds a synthetic dataset (users paired into households, each with
+``--transactions`` rows), then drives every scenario through the Flask test
+client from ``--concurrency`` threads, authenticating with tokens signed by
+the local JWKS stand-in. SQL instrumentation is on, so queries per request
+come from the Server-Timing header. Every /api route must have a scenario;
+the run fails before seeding when one has none.
+
+Each scenario reports p50/p95/p99 latency, throughput, error count and DB
+queries per request. With ``--baseline`` (or the ``compare`` command) the
+run fails when p95 latency or throughput is worse than the baseline by more
+than ``--threshold``, or when a scenario issues more queries per request.
+"""
+import argparse
+import json
+import platform
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from benchmarks.jwks_server import LocalJWKSServer
+from benchmarks.support import (
+    CATEGORIES, MERCHANTS, count_transactions, create_bench_app, prepare_database,
+    seed_household, seed_transactions, seed_user, synthetic_transactions,
+)
+
+QUERIES_RE = re.compile(r'\bdb;[^,]*desc="(\d+) queries"')
+
+SCENARIOS = []
+
+
+def scenario(name, endpoint, write=False, setup=None, prepare=None):
+    """Register ``fn(client, user, rng, *prepared)`` as a load-test scenario.
+
+    ``endpoint`` is the Flask endpoint it drives. Write scenarios change the
+    dataset and only run with --include-writes. ``setup(app, client, users)``
+    runs once before the scenario's warmup, and ``prepare(client, user, rng)``
+    runs untimed before each request, returning the extra arguments for ``fn``.
+    """
+    def register(fn):
+        SCENARIOS.append({'name': name, 'endpoint': endpoint, 'fn': fn, 'write': write,
+                          'setup': setup, 'prepare': prepare})
+        return fn
+    return register
+
+
+def uncovered_endpoints(app):
+    """The /api endpoints that no scenario drives."""
+    endpoints = {rule.endpoint for rule in app.url_map.iter_rules() if rule.rule.startswith('/api/')}
+    return sorted(endpoints - {entry['endpoint'] for entry in SCENARIOS})
+
+
+def _since(days):
+    return (date.today() - timedelta(days=days)).isoformat()
+
+
+def new_identity(client, user, rng):
+    """Headers for a fresh Auth0 identity that has not registered yet."""
+    auth0_id = f'auth0|load-new-{uuid.uuid4().hex[:16]}'
+    return {'Authorization': f"Bearer {user['issue_token'](auth0_id)}"}, auth0_id
+
+
+def registered_identity(client, user, rng):
+    """Headers for a fresh, registered user who belongs to no household."""
+    headers, auth0_id = new_identity(client, user, rng)
+    response = _register(client, headers, auth0_id)
+    assert response.status_code == 201, response.get_json()
+    return (headers,)
+
+
+def _register(client, headers, auth0_id):
+    username = auth0_id.replace('|', '_')
+    return client.post('/api/auth/register', headers=headers,
+                       json={'username': username, 'email': f'{username}@load.local'})
+
+
+def create_invites(app, client, users):
+    """Give every user an invite code to their household."""
+    codes = {}
+    for user in users:
+        if user['household_id'] not in codes:
+            response = client.post(f"/api/households/{user['household_id']}/invites",
+                                   headers=user['households_creator_headers'], json={})
+            assert response.status_code == 201, response.get_json()
+            codes[user['household_id']] = response.get_json()['invite_code']
+        user['invite_code'] = codes[user['household_id']]
+
+
+def catch_up_sync(app, client, users):
+    """Give every user a sync token past their snapshot, like a client that has synced."""
+    for user in users:
+        query = {}
+        while True:
+            response = client.get('/api/transactions/changes', query_string=query, headers=user['headers'])
+            assert response.status_code == 200, response.get_json()
+            body = response.get_json()
+            query = {'since': body['token']}
+            if not body['has_more']:
+                break
+            if body['retry_after']:
+                time.sleep(body['retry_after'])
+        user['sync_token'] = body['token']
+
+
+def run_export_jobs(app, client, users):
+    """Give every user a finished export job, run in this process."""
+    if all('export_job_id' in user for user in users):
+        return
+
+    import back_end.tasks  # noqa: F401  (registers the job handlers)
+    from back_end.jobs import claim_job, run_job
+
+    for user in users:
+        response = client.post('/api/transactions/export', headers=user['headers'],
+                               json={'format': 'csv', 'start_date': _since(30)})
+        assert response.status_code == 202, response.get_json()
+        user['export_job_id'] = response.get_json()['id']
+
+    with app.app_context():
+        while True:
+            job = claim_job('loadtest')
+            if job is None:
+                break
+            run_job(app, job, 'loadtest')
+
+
+@scenario('auth.me', 'auth.me')
+def auth_me(client, user, rng):
+    return client.get('/api/auth/me', headers=user['headers'])
+
+
+@scenario('households.list', 'households.get_households')
+def households_list(client, user, rng):
+    return client.get('/api/households', headers=user['headers'])
+
+
+@scenario('dashboard', 'dashboard.get_dashboard')
+def dashboard(client, user, rng):
+    return client.get(f'/api/dashboard?period=monthly&start_date={_since(183)}&limit=5',
+                      headers=user['headers'])
+
+
+@scenario('transactions.page', 'transactions.get_transactions')
+def transactions_page(client, user, rng):
+    return client.get('/api/transactions?limit=50', headers=user['headers'])
+
+
+@scenario('transactions.household_page', 'transactions.get_transactions')
+def transactions_household_page(client, user, rng):
+    return client.get(f"/api/transactions?limit=50&household_id={user['household_id']}",
+                      headers=user['headers'])
+
+
+@scenario('transactions.filtered', 'transactions.get_transactions')
+def transactions_filtered(client, user, rng):
+    return client.get(
+        f'/api/transactions?start_date={_since(90)}&category={rng.choice(CATEGORIES)}',
+        headers=user['headers']
+    )
+
+
+@scenario('transactions.summary', 'transactions.get_summary')
+def transactions_summary(client, user, rng):
+    period = rng.choice(['daily', 'weekly', 'monthly', 'yearly'])
+    return client.get(f'/api/transactions/summary?period={period}&start_date={_since(365)}',
+                      headers=user['headers'])
+
+
+@scenario('transactions.categories', 'transactions.get_categories')
+def transactions_categories(client, user, rng):
+    return client.get(f"/api/transactions/categories?household_id={user['household_id']}",
+                      headers=user['headers'])
+
+
+@scenario('transactions.export', 'transactions.export_transactions')
+def transactions_export(client, user, rng):
+    return client.get(f'/api/transactions/export?format=ndjson&start_date={_since(30)}',
+                      headers=user['headers'])
+
+
+@scenario('transactions.search', 'transactions.search_transactions')
+def transactions_search(client, user, rng):
+    return client.get('/api/transactions/search', query_string={'q': rng.choice(MERCHANTS).split()[0]},
+                      headers=user['headers'])
+
+
+@scenario('transactions.analytics', 'transactions.get_analytics')
+def transactions_analytics(client, user, rng):
+    return client.get(f'/api/transactions/analytics?start_date={_since(365)}', headers=user['headers'])
+
+
+@scenario('transactions.changes', 'transactions.get_changes', setup=catch_up_sync)
+def transactions_changes(client, user, rng):
+    return client.get('/api/transactions/changes', query_string={'since': user['sync_token']},
+                      headers=user['headers'])
+
+
+@scenario('jobs.list', 'jobs.get_jobs', setup=run_export_jobs)
+def jobs_list(client, user, rng):
+    return client.get('/api/jobs', headers=user['headers'])
+
+
+@scenario('jobs.status', 'jobs.get_job_status', setup=run_export_jobs)
+def jobs_status(client, user, rng):
+    return client.get(f"/api/jobs/{user['export_job_id']}", headers=user['headers'])
+
+
+@scenario('jobs.download', 'jobs.download_job_result', setup=run_export_jobs)
+def jobs_download(client, user, rng):
+    return client.get(f"/api/jobs/{user['export_job_id']}/download", headers=user['headers'])
+
+
+@scenario('transactions.create', 'transactions.create_transaction', write=True)
+def transactions_create(client, user, rng):
+    amount, day, description, category = next(synthetic_transactions(1, seed=rng.random()))
+    return client.post('/api/transactions', headers=user['headers'], json={
+        'amount': str(amount),
+        'date': day.isoformat(),
+        'description': description,
+        'category': category,
+        'household_id': user['household_id'],
+    })
+
+
+@scenario('transactions.bulk', 'transactions.bulk_create_transactions', write=True)
+def transactions_bulk(client, user, rng):
+    rows = [
+        {'amount': str(amount), 'date': day.isoformat(), 'description': description,
+         'category': category}
+        for amount, day, description, category in synthetic_transactions(50, seed=rng.random())
+    ]
+    return client.post('/api/transactions/bulk', headers=user['headers'], json=rows)
+
+
+@scenario('households.create_invite', 'households.create_invite', write=True)
+def households_create_invite(client, user, rng):
+    return client.post(f"/api/households/{user['household_id']}/invites",
+                       headers=user['households_creator_headers'], json={'expires_in_days': 1})
+
+
+@scenario('transactions.export_queue', 'transactions.queue_export', write=True)
+def transactions_export_queue(client, user, rng):
+    return client.post('/api/transactions/export', headers=user['headers'],
+                       json={'format': 'ndjson', 'start_date': _since(30)})
+
+
+@scenario('households.create', 'households.create_household', write=True)
+def households_create(client, user, rng):
+    return client.post('/api/households', headers=user['headers'],
+                       json={'name': f'Load household {rng.randrange(10 ** 6)}'})
+
+
+@scenario('households.join', 'households.join_household', write=True,
+          setup=create_invites, prepare=registered_identity)
+def households_join(client, user, rng, headers):
+    return client.post(f"/api/households/join/{user['invite_code']}", headers=headers)
+
+
+@scenario('auth.register', 'auth.register', write=True, prepare=new_identity)
+def auth_register(client, user, rng, headers, auth0_id):
+    return _register(client, headers, auth0_id)
+
+
+def seed_dataset(app, server, users, transactions, household_size):
+    """Seed (or reuse) the load-test users and return their request contexts."""
+    contexts = []
+    fresh = False
+    for index in range(users):
+        auth0_id = f'auth0|load-{index}'
+        user_id = seed_user(app, auth0_id)
+        contexts.append({
+            'auth0_id': auth0_id,
+            'user_id': user_id,
+            'headers': {'Authorization': f'Bearer {server.issue_token(auth0_id)}'},
+            'issue_token': server.issue_token,
+        })
+
+    for start in range(0, users, household_size):
+        group = contexts[start:start + household_size]
+        creator = group[0]
+        household_id = _existing_household(app, creator['user_id'])
+        if household_id is None:
+            household_id = seed_household(app, creator['user_id'], [u['user_id'] for u in group],
+                                          name=f'Load household {start // household_size}')
+        for user in group:
+            user['household_id'] = household_id
+            user['households_creator_headers'] = creator['headers']
+
+    for index, user in enumerate(contexts):
+        missing = transactions - count_transactions(app, user['user_id'])
+        if missing > 0:
+            fresh = True
+            # Half of each user's rows belong to their household
+            seed_transactions(app, user['user_id'], missing // 2, seed=index)
+            seed_transactions(app, user['user_id'], missing - missing // 2,
+                              household_id=user['household_id'], seed=users + index)
+
+    if fresh:
+        with app.app_context():
+            from back_end.rollups import backfill
+            backfill()
+
+    return contexts
+
+
+def _existing_household(app, creator_id):
+    from back_end.database import get_db_cursor
+
+    with app.app_context():
+        with get_db_cursor() as cursor:
+            cursor.execute(
+                "SELECT id FROM households WHERE creator_id = %s ORDER BY id LIMIT 1",
+                (creator_id,)
+            )
+            row = cursor.fetchone()
+            return row['id'] if row else None
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_scenario(app, users, entry, requests, concurrency, seed):
+    """Issue ``requests`` calls of one scenario from ``concurrency`` threads."""
+    latencies = []
+    queries = []
+    errors = []
+    lock = threading.Lock()
+    per_thread = [requests // concurrency + (1 if i < requests % concurrency else 0)
+                  for i in range(concurrency)]
+
+    def worker(index, count):
+        client = app.test_client()
+        rng = random.Random(seed * 1000 + index)
+        local_latencies, local_queries, local_errors = [], [], []
+        for _ in range(count):
+            user = rng.choice(users)
+            prepared = entry['prepare'](client, user, rng) if entry['prepare'] else ()
+            started = time.perf_counter()
+            response = entry['fn'](client, user, rng, *prepared)
+            local_latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                local_errors.append(response.status_code)
+            match = QUERIES_RE.search(response.headers.get('Server-Timing', ''))
+            if match:
+                local_queries.append(int(match.group(1)))
+        with lock:
+            latencies.extend(local_latencies)
+            queries.extend(local_queries)
+            errors.extend(local_errors)
+
+    threads = [threading.Thread(target=worker, args=(i, count)) for i, count in enumerate(per_thread)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'error_statuses': sorted(set(errors)),
+        'p50_ms': ms(percentile(latencies, 0.50)),
+        'p95_ms': ms(percentile(latencies, 0.95)),
+        'p99_ms': ms(percentile(latencies, 0.99)),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def compare(baseline, current, threshold):
+    """Return a list of human-readable regressions of ``current`` against ``baseline``."""
+    regressions = []
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        if before['p95_ms'] and now['p95_ms'] > before['p95_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p95 {before['p95_ms']} ms -> {now['p95_ms']} ms")
+        if before['throughput_rps'] and now['throughput_rps'] < before['throughput_rps'] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {before['throughput_rps']} -> {now['throughput_rps']} req/s"
+            )
+        if (before['queries_per_request'] is not None and now['queries_per_request'] is not None
+                and now['queries_per_request'] > before['queries_per_request']):
+            regressions.append(
+                f"{name}: queries/request {before['queries_per_request']} -> {now['queries_per_request']}"
+            )
+        if now['errors'] > before['errors']:
+            regressions.append(f"{name}: errors {before['errors']} -> {now['errors']}")
+    return regressions
+
+
+def print_results(results):
+    print(f"{'scenario':32s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'req/s':>9s} {'q/req':>6s} {'err':>4s}")
+    for name, r in results.items():
+        print(f"{name:32s} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {r['p99_ms']:9.2f} "
+              f"{r['throughput_rps']:9.1f} {r['queries_per_request'] or 0:6.2f} {r['errors']:4d}")
+
+
+def report_regressions(regressions):
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def command_run(args):
+    selected = [s for s in SCENARIOS
+                if (args.include_writes or not s['write'])
+                and (not args.scenario or s['name'] in args.scenario)]
+
+    with LocalJWKSServer() as server:
+        app = create_bench_app(server, SQL_INSTRUMENTATION=True,
+                               MYSQL_POOL_SIZE=max(args.concurrency, 1))
+        missing = uncovered_endpoints(app)
+        if missing:
+            print(f"no scenario drives: {', '.join(missing)}", file=sys.stderr)
+            return 1
+
+        prepare_database(app, reset=args.reset)
+        users = seed_dataset(app, server, args.users, args.transactions, args.household_size)
+
+        results = {}
+        for index, entry in enumerate(selected):
+            if entry['setup']:
+                entry['setup'](app, app.test_client(), users)
+            run_scenario(app, users, entry, args.warmup, args.concurrency, args.seed + index)
+            results[entry['name']] = run_scenario(app, users, entry, args.requests,
+                                                  args.concurrency, args.seed + index)
+
+    report = {
+        'meta': {
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'users': args.users,
+            'transactions_per_user': args.transactions,
+            'household_size': args.household_size,
+            'concurrency': args.concurrency,
+            'requests_per_scenario': args.requests,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return report_regressions(compare(baseline, report, args.threshold))
+    return 0
+
+
+def command_compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    return report_regressions(compare(baseline, current, args.threshold))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='seed the dataset and run the scenarios')
+    run.add_argument('--users', type=int, default=20)
+    run.add_argument('--transactions', type=int, default=2000, help='rows per user')
+    run.add_argument('--household-size', type=int, default=4)
+    run.add_argument('--concurrency', type=int, default=8)
+    run.add_argument('--requests', type=int, default=400, help='measured requests per scenario')
+    run.add_argument('--warmup', type=int, default=40, help='unmeasured requests per scenario')
+    run.add_argument('--seed', type=int, default=1)
+    run.add_argument('--scenario', action='append', help='run only this scenario (repeatable)')
+    run.add_argument('--include-writes', action='store_true', help='also run scenarios that insert data')
+    run.add_argument('--reset', action='store_true', help='drop and recreate the schema first')
+    run.add_argument('--output', help='write the results as JSON to this file')
+    run.add_argument('--baseline', help='fail on regressions against this earlier JSON result')
+    run.add_argument('--threshold', type=float, default=0.15,
+                     help='allowed relative p95/throughput regression')
+    run.set_defaults(handler=command_run)
+
+    diff = commands.add_parser('compare', help='compare two JSON results')
+    diff.add_argument('baseline')
+    diff.add_argument('current')
+    diff.add_argument('--threshold', type=float, default=0.15)
+    diff.set_defaults(handler=command_compare)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+# benchmarks/support.py
+"""Shared helpers for benchmarks that need the real app and a MySQL database.
+
+Benchmarks run against the database named by BENCH_MYSQL_DB (default
+``spending_tracker_bench``) using the usual MYSQL_* connection settings, and
+authenticate through the local JWKS stand-in.
+"""
+import os
+import random
+import re
+import resource
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+
+from back_end import create_app
+from back_end.config import Config
+
+CATEGORIES = [
+    "Groceries", "Dining", "Entertainment", "Transportation", "Housing",
+    "Utilities", "Healthcare", "Shopping", "Travel", "Income",
+]
+
+MERCHANTS = [
+    "Amazon", "Walmart", "Shell", "Starbucks", "Netflix", "Uber", "Target",
+    "Costco", "Whole Foods", "Delta", "CVS", "Home Depot", "Spotify",
+]
+
+
+class BenchConfig(Config):
+    """Configuration used by every benchmark."""
+    TESTING = True
+    CORS_ENABLED = False
+    MYSQL_DB = os.getenv('BENCH_MYSQL_DB', 'spending_tracker_bench')
+    MYSQL_POOL_SIZE = int(os.getenv('BENCH_MYSQL_POOL_SIZE', 16))
+
+
+def create_bench_app(server, **overrides):
+    """Build the app with BenchConfig, authenticating against ``server``."""
+    config = BenchConfig()
+    for key, value in {**server.config(), **overrides}.items():
+        setattr(config, key, value)
+    return create_app(config_object=config)
+
+
+def api_paths(app):
+    """One concrete URL per /api route, with 1 for every path parameter."""
+    return sorted({
+        re.sub(r'<[^>]+>', '1', rule.rule)
+        for rule in app.url_map.iter_rules()
+        if rule.rule.startswith('/api/')
+    })
+
+
+def preflight(client, path, origin, method='GET'):
+    """Send a CORS preflight for ``method`` on ``path`` from ``origin``."""
+    return client.options(path, headers={
+        'Origin': origin,
+        'Access-Control-Request-Method': method,
+        'Access-Control-Request-Headers': 'authorization,content-type',
+    })
+
+
+def prepare_database(app, reset=False):
+    """Create (or recreate) the benchmark schema."""
+    from back_end import database
+
+    with app.app_context():
+        if reset:
+            database.drop_all_tables()
+        database.create_schema()
+
+
+def seed_user(app, auth0_id, username=None):
+    """Insert a user if missing and return its internal id."""
+    from back_end.database import get_db_cursor
+
+    username = username or auth0_id.replace('|', '_')
+    with app.app_context():
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(
+                "INSERT IGNORE INTO users (username, email, auth0_id) VALUES (%s, %s, %s)",
+                (username, f"{username}@bench.local", auth0_id)
+            )
+            cursor.execute("SELECT id FROM users WHERE auth0_id = %s", (auth0_id,))
+            return cursor.fetchone()['id']
+
+
+def seed_household(app, creator_id, member_ids=(), name='Bench household'):
+    """Create a household with ``creator_id`` and ``member_ids`` as members."""
+    from back_end.database import get_db_cursor
+
+    with app.app_context():
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(
+                "INSERT INTO households (name, creator_id) VALUES (%s, %s)",
+                (name, creator_id)
+            )
+            household_id = cursor.lastrowid
+            cursor.executemany(
+                "INSERT IGNORE INTO household_members (household_id, user_id) VALUES (%s, %s)",
+                [(household_id, user_id) for user_id in {creator_id, *member_ids}]
+            )
+            return household_id
+
+
+def synthetic_transactions(count, seed=42, years=5):
+    """Yield ``count`` plausible (amount, date, description, category) tuples."""
+    rng = random.Random(seed)
+    today = date.today()
+    for _ in range(count):
+        category = rng.choice(CATEGORIES)
+        amount = Decimal(rng.randint(100, 25000)) / 100
+        if category == "Income":
+            amount *= 20
+        day = today - timedelta(days=rng.randint(0, 365 * years))
+        description = f"{rng.choice(MERCHANTS)} #{rng.randint(1000, 9999)}"
+        yield amount, day, description, category
+
+
+def seed_transactions(app, user_id, count, household_id=None, seed=42, chunk_size=5000):
+    """Bulk insert ``count`` synthetic transactions for ``user_id``."""
+    from back_end.database import get_db_cursor
+
+    rows = []
+    with app.app_context():
+        for amount, day, description, category in synthetic_transactions(count, seed):
+            rows.append((user_id, amount, day, description, category, household_id))
+            if len(rows) >= chunk_size:
+                _insert_transactions(get_db_cursor, rows)
+                rows = []
+        if rows:
+            _insert_transactions(get_db_cursor, rows)
+
+
+def _insert_transactions(get_db_cursor, rows):
+    with get_db_cursor(commit=True) as cursor:
+        cursor.executemany(
+            """
+            INSERT INTO transactions
+            (user_id, amount, date, description, category, household_id)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            """,
+            rows
+        )
+
+
+def count_transactions(app, user_id):
+    from back_end.database import get_db_cursor
+
+    with app.app_context():
+        with get_db_cursor() as cursor:
+            cursor.execute(
+                "SELECT (SELECT COUNT(*) FROM transactions WHERE user_id = %s)"
+                " + (SELECT COUNT(*) FROM transactions_archive WHERE user_id = %s) AS n",
+                (user_id, user_id)
+            )
+            return cursor.fetchone()['n']
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import api from '../../services/api';
+import { fromColumnar } from '../../utils/formatUtils';
 import TransactionSummary from './TransactionSummary';
 import TransactionList from './TransactionList';
 import HouseholdList from './HouseholdList';
@@ -19,26 +20,23 @@ function Dashboard() {
       setError(null);
       
       try {
-        // Fetch transaction summary
-        const summaryResponse = await api.get('/api/transactions/summary', {
+        // Summary, recent transactions and households in one request
+        const response = await api.get('/api/dashboard', {
           params: {
             period: 'monthly',
             // Last 6 months
-            start_date: new Date(new Date().setMonth(new Date().getMonth() - 6)).toISOString().split('T')[0]
+            start_date: new Date(new Date().setMonth(new Date().getMonth() - 6)).toISOString().split('T')[0],
+            // 5 most recent transactions
+            limit: 5,
+            // Column names once instead of on every row
+            format: 'columnar'
           }
         });
         
-        // Fetch recent transactions (5 most recent)
-        const transactionsResponse = await api.get('/api/transactions', {
-          params: { limit: 5 }
-        });
-        
-        // Fetch households
-        const householdsResponse = await api.get('/api/households');
-        
-        setSummaryData(summaryResponse.data);
-        setTransactions(transactionsResponse.data);
-        setHouseholds(householdsResponse.data || []);
+        const { summary, transactions: recent } = response.data;
+        setSummaryData({ ...summary, summary: fromColumnar(summary.summary) });
+        setTransactions(fromColumnar(recent));
+        setHouseholds(response.data.households || []);
       } catch (err) {
         console.error('Error fetching dashboard data:', err);
         setError('Failed to load dashboard data. Please try again later.');
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { format } from 'date-fns';
-import api from '../../services/api';
+import { syncTransactions } from '../../services/transactionSync';
 import TransactionFilters from '../transactions/TransactionFilters';
 import '../../styles/Transactions.css';
 
@@ -12,6 +12,7 @@ function TransactionsList({
   showHousehold = false
 }) {
   const [transactions, setTransactions] = useState(initialTransactions || []);
+  const [allTransactions, setAllTransactions] = useState([]);
   const [isLoading, setIsLoading] = useState(initialTransactions === null);
   const [error, setError] = useState(null);
   const [filters, setFilters] = useState({
@@ -26,34 +27,36 @@ function TransactionsList({
   const [totalPages, setTotalPages] = useState(1);
   const pageSize = 10;
 
-  // Fetch transactions from API if not provided
+  // Sync the local copy if transactions were not provided; after the first
+  // load only the rows changed since the last sync are downloaded
   useEffect(() => {
     if (initialTransactions === null) {
       fetchTransactions();
     }
-  }, [initialTransactions, filters, currentPage]);
+  }, [initialTransactions, filters.household_id]);
+
+  // Filter and page the local copy without another request
+  useEffect(() => {
+    if (initialTransactions !== null) {
+      return;
+    }
+    
+    const matching = allTransactions.filter(transaction => (
+      (!filters.start_date || transaction.date >= filters.start_date) &&
+      (!filters.end_date || transaction.date <= filters.end_date) &&
+      (!filters.category || transaction.category === filters.category)
+    ));
+    
+    setTotalPages(Math.max(1, Math.ceil(matching.length / pageSize)));
+    setTransactions(matching.slice((currentPage - 1) * pageSize, currentPage * pageSize));
+  }, [initialTransactions, allTransactions, filters, currentPage]);
 
   const fetchTransactions = async () => {
     setIsLoading(true);
     setError(null);
     
     try {
-      // Build query params
-      const params = { ...filters, page: currentPage, limit: pageSize };
-      
-      // Remove empty values
-      Object.keys(params).forEach(key => {
-        if (!params[key]) delete params[key];
-      });
-      
-      const response = await api.get('/api/transactions', { params });
-      
-      setTransactions(response.data.transactions || response.data || []);
-      
-      // Set pagination info if available
-      if (response.data.pagination) {
-        setTotalPages(response.data.pagination.total_pages);
-      }
+      setAllTransactions(await syncTransactions(filters.household_id || null));
     } catch (err) {
       console.error('Error fetching transactions:', err);
       setError('Failed to load transactions. Please try again later.');
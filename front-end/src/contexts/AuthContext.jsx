@@ -1,6 +1,7 @@
 import React, { createContext, useContext, useState, useEffect } from 'react';
 import { useAuth0 } from '@auth0/auth0-react';
 import api from '../services/api';
+import { clearTransactionCache } from '../services/transactionSync';
 
 const AuthContext = createContext();
 
@@ -113,6 +114,7 @@ export function AuthProvider({ children }) {
     });
     setUserData(null);
     api.clearAuthToken();
+    clearTransactionCache();
   };
 
   const value = {
@@ -1,5 +1,8 @@
 import axios from 'axios';
 
+// Request/token diagnostics only in development builds
+const debug = import.meta.env.DEV ? (...args) => console.debug(...args) : () => {};
+
 // Create an axios instance
 const api = axios.create({
   baseURL: import.meta.env.VITE_API_URL || 'http://127.0.0.1:5000',
@@ -15,10 +18,9 @@ api.interceptors.request.use(
     const token = localStorage.getItem('auth_token');
     if (token) {
       config.headers.Authorization = `Bearer ${token}`;
-      console.log('Adding token to request:', config.url);
-      console.log('Token starts with:', token.substring(0, 20) + '...');
+      debug('Adding token to request:', config.url);
     } else {
-      console.warn('No auth token found for request:', config.url);
+      debug('No auth token found for request:', config.url);
     }
     return config;
   },
@@ -54,15 +56,15 @@ api.interceptors.response.use(
 const apiService = {
   setAuthToken: (token) => {
     if (token) {
-      console.log('Setting auth token in localStorage');
+      debug('Setting auth token in localStorage');
       localStorage.setItem('auth_token', token);
     } else {
-      console.warn('Attempted to set null/undefined auth token');
+      debug('Attempted to set null/undefined auth token');
     }
   },
   
   clearAuthToken: () => {
-    console.log('Clearing auth token from localStorage');
+    debug('Clearing auth token from localStorage');
     localStorage.removeItem('auth_token');
   },
   
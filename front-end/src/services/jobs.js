@@ -0,0 +1,53 @@
+import api from './api';
+
+const FINISHED = ['succeeded', 'failed'];
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+const jobsService = {
+  // Get the current user's most recent background jobs
+  listJobs: async () => {
+    const response = await api.get('/api/jobs');
+    return response.data;
+  },
+  
+  // Get one job's status, progress and result
+  getJob: async (id) => {
+    const response = await api.get(`/api/jobs/${id}`);
+    return response.data;
+  },
+  
+  // Queue an import in the background; resolves to the queued job
+  importTransactionsInBackground: async (rows) => {
+    const response = await api.post('/api/transactions/bulk', rows, { params: { background: true } });
+    return response.data;
+  },
+  
+  // Queue a gzipped CSV/NDJSON export with the usual transaction filters
+  createExportJob: async (filters = {}, format = 'csv') => {
+    const response = await api.post('/api/transactions/export', { ...filters, format });
+    return response.data;
+  },
+  
+  // Download a finished export as a Blob
+  downloadJobResult: async (id) => {
+    const response = await api.get(`/api/jobs/${id}/download`, { responseType: 'blob' });
+    return response.data;
+  },
+  
+  // Poll a job until it succeeds or fails; onProgress gets every update
+  waitForJob: async (id, { interval = 1000, onProgress = null } = {}) => {
+    for (;;) {
+      const job = await jobsService.getJob(id);
+      if (onProgress) {
+        onProgress(job);
+      }
+      if (FINISHED.includes(job.status)) {
+        return job;
+      }
+      await sleep(interval);
+    }
+  }
+};
+
+export default jobsService;
@@ -0,0 +1,64 @@
+import transactionsService from './transactions';
+
+// Per-scope local copies of the transaction list: { token, byId }
+// Kept in memory only, so nothing outlives the page or the signed-in user
+const caches = new Map();
+
+// Requests for the same scope share one sync instead of racing
+const inFlight = new Map();
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+const scopeKey = (householdId) => (householdId ? `household:${householdId}` : 'personal');
+
+// Newest first, the same order as GET /api/transactions
+const compareTransactions = (a, b) => (
+  (b.date || '').localeCompare(a.date || '') ||
+  (b.created_at || '').localeCompare(a.created_at || '') ||
+  b.id - a.id
+);
+
+const applyChanges = async (householdId) => {
+  const key = scopeKey(householdId);
+  let cache = caches.get(key) || { token: null, byId: new Map() };
+  
+  let hasMore = true;
+  while (hasMore) {
+    const page = await transactionsService.getChanges(cache.token, { household_id: householdId });
+    
+    if (page.reset) {
+      cache = { token: null, byId: new Map() };
+    }
+    
+    // Changes can be re-sent; applying one twice is harmless
+    page.transactions.forEach(transaction => cache.byId.set(transaction.id, transaction));
+    cache.token = page.token;
+    hasMore = page.has_more;
+    
+    // A full page of changes that have not settled yet: fetch the rest once they have
+    if (hasMore && page.retry_after) {
+      await sleep(page.retry_after * 1000);
+    }
+  }
+  
+  caches.set(key, cache);
+  return Array.from(cache.byId.values()).sort(compareTransactions);
+};
+
+// Bring the local copy up to date and return every transaction, newest first.
+// The first call downloads everything; later calls only fetch what changed.
+export const syncTransactions = (householdId = null) => {
+  const key = scopeKey(householdId);
+  
+  if (!inFlight.has(key)) {
+    const sync = applyChanges(householdId).finally(() => inFlight.delete(key));
+    inFlight.set(key, sync);
+  }
+  
+  return inFlight.get(key);
+};
+
+// Drop every local copy, e.g. on logout
+export const clearTransactionCache = () => {
+  caches.clear();
+};
@@ -26,6 +26,52 @@ const transactionsService = {
     return response.data;
   },
   
+  // Get one page of transactions; pass the returned nextCursor to fetch the next page
+  getTransactionPage: async (filters = {}, { limit = 100, cursor = null } = {}) => {
+    const params = { ...filters, limit };
+    
+    if (cursor) {
+      params.cursor = cursor;
+    }
+    
+    const response = await api.get('/api/transactions', { params });
+    return {
+      transactions: response.data,
+      nextCursor: response.headers['x-next-cursor'] || null
+    };
+  },
+  
+  // Full-text search over descriptions, best matches first
+  searchTransactions: async (q, filters = {}, { limit = 50, cursor = null } = {}) => {
+    const params = { ...filters, q, limit };
+    
+    if (cursor) {
+      params.cursor = cursor;
+    }
+    
+    const response = await api.get('/api/transactions/search', { params });
+    return {
+      transactions: response.data,
+      nextCursor: response.headers['x-next-cursor'] || null
+    };
+  },
+  
+  // Get the transactions changed since a sync token (omit since for a full snapshot)
+  getChanges: async (since = null, { household_id = null, limit = 500 } = {}) => {
+    const params = { limit };
+    
+    if (since) {
+      params.since = since;
+    }
+    
+    if (household_id) {
+      params.household_id = household_id;
+    }
+    
+    const response = await api.get('/api/transactions/changes', { params });
+    return response.data;
+  },
+  
   // Get a single transaction by ID
   getTransaction: async (id) => {
     const response = await api.get(`/api/transactions/${id}`);
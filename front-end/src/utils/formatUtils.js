@@ -64,4 +64,21 @@ export const formatCurrency = (amount, currency = 'USD') => {
     // Convert to hex color
     const hue = Math.abs(hash % 360);
     return `hsl(${hue}, 70%, 50%)`;
-  };
\ No newline at end of file
+  };
+  /**
+   * Expand a columnar API payload ({ columns, values }) back into row objects
+   * @param {Object} data - Columnar payload from a `format=columnar` request
+   * @returns {Array<Object>} One object per row
+   */
+  export const fromColumnar = ({ columns, values }) => {
+    const count = values.length ? values[0].length : 0;
+    const rows = new Array(count);
+    for (let i = 0; i < count; i++) {
+      const row = {};
+      for (let c = 0; c < columns.length; c++) {
+        row[columns[c]] = values[c][i];
+      }
+      rows[i] = row;
+    }
+    return rows;
+  };
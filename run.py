@@ -1,5 +1,14 @@
+import sys
 from back_end import create_app
+
+if __name__ == '__main__' and sys.argv[1:2] == ['serve']:
+    # Production: gunicorn workers running ProductionConfig
+    from back_end.serve import main
+    main(sys.argv[2:])
+    sys.exit()
+
 app = create_app()
 
 if __name__ == '__main__':
+    # Development server with the reloader and debugger; never deploy this
     app.run(debug=True)
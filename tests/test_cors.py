@@ -0,0 +1,71 @@
+# tests/test_cors.py
+"""CORS preflights are answered before any view, auth or SQL runs.
+
+Uses benchmarks.fake_db as MYSQL_CONNECTION_FACTORY to count connections
+and queries, so no MySQL is needed.
+"""
+import pytest
+
+from back_end import create_app
+from back_end.config import Config
+from benchmarks.fake_db import FakeDatabase
+from benchmarks.support import api_paths, preflight
+
+ORIGIN = 'http://localhost:3000'
+ORIGIN_PATTERN = r'https://.*\.example\.com'
+
+
+@pytest.fixture
+def database():
+    return FakeDatabase()
+
+
+@pytest.fixture
+def app(database):
+    class TestConfig(Config):
+        TESTING = True
+        CORS_ENABLED = True
+        CORS_ORIGINS = [ORIGIN, ORIGIN_PATTERN]
+        MYSQL_CONNECTION_FACTORY = staticmethod(database.connect)
+        RESPONSE_CACHE_BACKEND = 'none'
+        LOG_FILE = None
+
+    return create_app(config_object=TestConfig())
+
+
+def test_preflights_run_no_queries(app, database):
+    client = app.test_client()
+    paths = api_paths(app)
+    assert paths
+
+    for path in paths:
+        response = preflight(client, path, ORIGIN, 'POST')
+        assert response.status_code == 204, path
+        assert response.headers['Access-Control-Allow-Origin'] == ORIGIN, path
+        assert 'Authorization' in response.headers['Access-Control-Allow-Headers'], path
+
+    assert database.counts() == {'connections': 0, 'queries': 0}
+
+
+def test_disallowed_origin_gets_no_allow_origin(app, database):
+    response = preflight(app.test_client(), '/api/transactions', 'https://evil.test')
+
+    assert response.status_code == 204
+    assert 'Access-Control-Allow-Origin' not in response.headers
+    assert database.counts() == {'connections': 0, 'queries': 0}
+
+
+@pytest.mark.parametrize('origin, allowed', [
+    ('https://app.example.com', True),
+    ('https://example.com.evil.test', False),
+    ('https://app.example.com.evil.test', False),
+])
+def test_regex_origins_match_like_actual_requests(app, origin, allowed):
+    client = app.test_client()
+
+    preflight_response = preflight(client, '/api/transactions', origin)
+    # Unauthenticated, so it stops at auth, after Flask-CORS has decided
+    actual_response = client.get('/api/transactions', headers={'Origin': origin})
+
+    assert ('Access-Control-Allow-Origin' in preflight_response.headers) is allowed
+    assert ('Access-Control-Allow-Origin' in actual_response.headers) is allowed